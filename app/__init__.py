@@ -4,11 +4,11 @@ from flask_sock import Sock
 import logging
 import sys
 import warnings
-from cryptography.utils import CryptographyDeprecationWarning
 
-# Filter out specific cryptography deprecation warnings
-warnings.filterwarnings('ignore', category=CryptographyDeprecationWarning,
-                       message='.*TripleDES.*')
+# Filter out the TripleDES deprecation warnings cryptography emits when
+# paramiko is imported; matched on the message alone so cryptography itself
+# is not imported at startup
+warnings.filterwarnings('ignore', message='.*TripleDES.*')
 
 sock = Sock()
 
@@ -43,6 +43,9 @@ def create_app():
         app.register_blueprint(main)
         sock.init_app(app)
 
+        from app.bulk_import import import_vms_command
+        app.cli.add_command(import_vms_command)
+
         return app
 
     except Exception as e:
@@ -0,0 +1,270 @@
+"""Bulk VM import from a CSV file or a multi-document YAML file.
+
+Every row is validated through ``VMConfigSchema`` first and errors are
+reported per row; the valid rows are then rendered through the templates
+and written as a single commit and push, instead of one transaction per VM.
+
+CSV columns are the ``VMConfigSchema`` fields. ``tags`` holds
+``key=value`` pairs and ``service_ports`` holds ``name:port[:targetPort][/protocol]``
+entries, both separated by semicolons, e.g.::
+
+    vm_name,cpu_cores,memory,storage_size,image_url,tags,service_ports
+    web-1,2,4,20,https://example.com/debian.qcow2,team=web;env=prod,ssh:22;http:80:8080
+
+YAML documents are mappings of the same fields; ``tags`` may be a mapping
+or a list of ``{key, value}`` and ``service_ports`` a list of mappings.
+"""
+
+import csv
+import io
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import click
+import yaml
+from flask.cli import with_appcontext
+from pydantic import ValidationError
+
+from config import Config
+from app.constants import GIT_COMMIT_MESSAGE_CREATE, GIT_COMMIT_MESSAGE_IMPORT, YAML_EXTENSION
+from app.template_manager import YAML_LOADER
+from app.utils import get_git_manager, render_vm_config, validate_and_prepare_config
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'yaml')
+LIST_SEPARATOR = ';'
+
+# Row number (CSV line or YAML document, from 1), the vm_name as written and
+# the spec, or the reason it could not be read
+ParsedRow = Tuple[int, Optional[str], Union[Dict[str, Any], str]]
+
+
+@dataclass
+class ImportResult:
+    """Outcome of an import; nothing is committed while errors is non-empty unless partial."""
+    imported: List[str] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    commit: Optional[str] = None
+    dry_run: bool = False
+
+    def add_error(self, row: int, vm_name: Optional[str], error: str):
+        self.errors.append({'row': row, 'vm_name': vm_name, 'error': error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'imported': len(self.imported),
+            'vm_names': self.imported,
+            'errors': self.errors,
+            'commit': self.commit,
+            'dry_run': self.dry_run,
+        }
+
+
+def detect_format(filename: Optional[str] = None, content_type: Optional[str] = None) -> str:
+    """Pick 'csv' or 'yaml' from a file name or content type (YAML unless it says CSV)."""
+    if filename and Path(filename).suffix.lower() == '.csv':
+        return 'csv'
+    if content_type and 'csv' in content_type.lower():
+        return 'csv'
+    return 'yaml'
+
+
+def _parse_tags(value: str) -> List[Dict[str, str]]:
+    tags = []
+    for item in filter(None, (part.strip() for part in value.split(LIST_SEPARATOR))):
+        key, sep, tag_value = item.partition('=')
+        if not sep:
+            raise ValueError(f"tag '{item}' is not key=value")
+        tags.append({'key': key.strip(), 'value': tag_value.strip()})
+    return tags
+
+
+def _parse_ports(value: str) -> List[Dict[str, Any]]:
+    ports = []
+    for item in filter(None, (part.strip() for part in value.split(LIST_SEPARATOR))):
+        spec, _, protocol = item.partition('/')
+        parts = spec.split(':')
+        if len(parts) not in (2, 3):
+            raise ValueError(f"service port '{item}' is not name:port[:targetPort][/protocol]")
+        try:
+            port = int(parts[1])
+            target_port = int(parts[2]) if len(parts) == 3 else port
+        except ValueError:
+            raise ValueError(f"service port '{item}' has a non-numeric port") from None
+        ports.append({'port_name': parts[0].strip(), 'port': port,
+                      'targetPort': target_port, 'protocol': protocol.strip() or 'TCP'})
+    return ports
+
+
+def parse_csv(text: str) -> List[ParsedRow]:
+    """Parse CSV rows into spec dicts; empty cells fall back to the schema defaults."""
+    reader = csv.DictReader(io.StringIO(text))
+    rows = []
+    for spec in reader:
+        row = reader.line_num
+        if None in spec:
+            rows.append((row, spec.get('vm_name'), "more cells than header columns"))
+            continue
+        spec = {key.strip(): value.strip() for key, value in spec.items()
+                if key and value is not None and value.strip()}
+        if not spec:
+            continue
+        vm_name = spec.get('vm_name')
+        try:
+            if 'tags' in spec:
+                spec['tags'] = _parse_tags(spec['tags'])
+            if 'service_ports' in spec:
+                spec['service_ports'] = _parse_ports(spec['service_ports'])
+        except ValueError as e:
+            rows.append((row, vm_name, str(e)))
+            continue
+        rows.append((row, vm_name, spec))
+    return rows
+
+
+def parse_yaml(text: str) -> List[ParsedRow]:
+    """
+    Parse YAML documents into spec dicts.
+
+    Raises:
+        ValueError: If the file is not valid YAML
+    """
+    try:
+        docs = list(yaml.load_all(text, Loader=YAML_LOADER))
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML: {e}")
+    rows = []
+    for row, doc in enumerate(docs, start=1):
+        if doc is None:
+            continue
+        if not isinstance(doc, dict):
+            rows.append((row, None, "document is not a mapping"))
+            continue
+        spec = dict(doc)
+        if isinstance(spec.get('tags'), dict):
+            spec['tags'] = [{'key': str(key), 'value': str(value)} for key, value in spec['tags'].items()]
+        rows.append((row, spec.get('vm_name'), spec))
+    return rows
+
+
+def _validation_message(error: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'config'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def import_vms(
+    text: str,
+    config: Config,
+    fmt: str = 'yaml',
+    dry_run: bool = False,
+    partial: bool = False,
+    overwrite: bool = False
+) -> ImportResult:
+    """
+    Validate, render and commit a batch of VM specs.
+
+    Args:
+        text: CSV or YAML file content
+        config: Application configuration
+        fmt: 'csv' or 'yaml'
+        dry_run: Validate and render only; commit nothing
+        partial: Commit the valid rows even if other rows have errors
+        overwrite: Replace VMs that already exist instead of reporting them
+
+    Returns:
+        ImportResult with the imported VM names, per-row errors and the commit SHA
+
+    Raises:
+        ValueError: If the format is unknown or the file cannot be parsed
+        GitOperationError: If the commit or push fails
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {', '.join(FORMATS)}")
+    rows = parse_csv(text) if fmt == 'csv' else parse_yaml(text)
+    result = ImportResult(dry_run=dry_run)
+
+    existing = set()
+    if not overwrite:
+        snapshot = get_git_manager(config).snapshot()
+        existing = {Path(name).stem for name in snapshot.list_files(config.YAML_SUBDIRECTORY, YAML_EXTENSION)}
+
+    # Validate every row before rendering anything
+    valid = []
+    seen: Dict[str, int] = {}
+    for row, vm_name, spec in rows:
+        if isinstance(spec, str):
+            result.add_error(row, vm_name, spec)
+            continue
+        try:
+            vm_config = validate_and_prepare_config(spec)
+        except ValidationError as e:
+            result.add_error(row, vm_name, _validation_message(e))
+            continue
+        if vm_config.vm_name in seen:
+            result.add_error(row, vm_name, f"duplicate vm_name (also row {seen[vm_config.vm_name]})")
+            continue
+        seen[vm_config.vm_name] = row
+        if vm_config.vm_name in existing:
+            result.add_error(row, vm_name, "VM already exists")
+            continue
+        valid.append((row, vm_config))
+
+    if result.errors and not partial:
+        logger.warning(f"Import rejected: {len(result.errors)} of {len(rows)} rows invalid")
+        return result
+
+    # Rendering is CPU-bound template work; done in order, it costs about a
+    # millisecond per VM
+    changes = []
+    for row, vm_config in valid:
+        try:
+            content = render_vm_config(vm_config, config)
+        except Exception as e:
+            result.add_error(row, vm_config.vm_name, f"Rendering failed: {e}")
+            continue
+        file_name = f"{vm_config.vm_name}{YAML_EXTENSION}"
+        path = str(Path(config.YAML_SUBDIRECTORY) / file_name) if config.YAML_SUBDIRECTORY else file_name
+        changes.append((path, content))
+        result.imported.append(vm_config.vm_name)
+
+    if result.errors and not partial:
+        result.imported = []
+        return result
+    if dry_run or not changes:
+        return result
+
+    message = GIT_COMMIT_MESSAGE_IMPORT.format(count=len(changes)) + "\n\n" + '\n'.join(
+        f"- {GIT_COMMIT_MESSAGE_CREATE.format(vm_name=name)}" for name in result.imported
+    )
+    result.commit = get_git_manager(config).apply_changes(changes, message)
+    logger.info(f"Imported {len(changes)} VMs in commit {result.commit}")
+    return result
+
+
+@click.command('import-vms')
+@click.argument('file', type=click.File('r'))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), help='Input format (default: from the file name)')
+@click.option('--dry-run', is_flag=True, help='Validate and render only; commit nothing')
+@click.option('--partial', is_flag=True, help='Commit the valid rows even if some rows have errors')
+@click.option('--overwrite', is_flag=True, help='Replace VMs that already exist')
+@with_appcontext
+def import_vms_command(file, fmt, dry_run, partial, overwrite):
+    """Import VM configurations from a CSV or multi-document YAML FILE ('-' for stdin)."""
+    fmt = fmt or detect_format(file.name)
+    try:
+        result = import_vms(file.read(), Config(), fmt, dry_run=dry_run, partial=partial, overwrite=overwrite)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for error in result.errors:
+        click.echo(f"row {error['row']} ({error['vm_name'] or '?'}): {error['error']}", err=True)
+    if result.commit:
+        click.echo(f"Imported {len(result.imported)} VMs in commit {result.commit}")
+    elif dry_run and result.imported:
+        click.echo(f"Dry run: {len(result.imported)} VMs would be imported")
+    if result.errors and not partial:
+        raise click.ClickException(f"{len(result.errors)} rows invalid; nothing imported")
@@ -2,6 +2,8 @@
 
 # Kubernetes Labels
 LABEL_KUBEVIRT_VM = "kubevirt.io/vm"
+LABEL_MANAGED_BY = "app.kubernetes.io/managed-by"
+MANAGED_BY_PORTAL = "kubevirt-portal"
 
 # Annotations
 ANNOTATION_METALLB_ADDRESS_POOL = "metallb.universe.tf/address-pool"
@@ -49,6 +51,7 @@ MAX_PORT = 65535
 GIT_COMMIT_MESSAGE_CREATE = "Add VM configuration for {vm_name}"
 GIT_COMMIT_MESSAGE_UPDATE = "Update VM configuration for {vm_name}"
 GIT_COMMIT_MESSAGE_DELETE = "Delete VM configuration for {vm_name}"
+GIT_COMMIT_MESSAGE_IMPORT = "Import {count} VM configurations"
 
 # File Extensions
 YAML_EXTENSION = ".yaml"
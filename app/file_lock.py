@@ -0,0 +1,70 @@
+"""Locks shared between the threads of a worker and across worker processes.
+
+Gunicorn runs several worker processes against the same Git clone. A
+``threading`` lock only orders the threads of one process, so the Git
+manager pairs it with an advisory ``flock(2)`` on a file next to the clone.
+"""
+
+import fcntl
+import os
+import threading
+
+
+class FileLock:
+    """
+    Reentrant exclusive lock held by at most one thread in one process.
+
+    The thread lock is taken first, so only the outermost acquire per
+    process touches the lock file. The kernel drops the flock when the
+    holder exits, so a crashed worker never leaves the lock behind.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Lock file; created (with its directory) on first acquire
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock; with blocking=False return False instead of waiting."""
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError:
+                self._thread_lock.release()
+                raise
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                self._thread_lock.release()
+                return False
+            except BaseException:
+                os.close(fd)
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -1,27 +1,183 @@
 """Thread-safe Git operations manager with transaction support."""
 
+import functools
 import os
-import git
+import json
 import logging
+import random
 import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from config import Config
+from app.file_lock import FileLock
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _git():
+    """Return the GitPython module, imported on first use to keep worker boot light."""
+    import git
+    return git
+
+# Paths passed to one git add/rm invocation
+GIT_PATHS_PER_CALL = 1000
+
+# Remote rejections caused by a concurrent update of the branch rather than
+# by a hook or permissions; these are retried like a non-fast-forward
+RETRYABLE_PUSH_ERRORS = ('failed to update ref', 'cannot lock ref', 'incorrect old value')
+
+
 class GitOperationError(Exception):
     """Custom exception for Git operation failures."""
     pass
 
 
+class GitChangeError(GitOperationError):
+    """One change cannot be applied (e.g. deleting a missing file); the others in its commit could be."""
+    pass
+
+
+class RepositorySnapshot:
+    """
+    Read-only view of the repository at one commit.
+
+    Files are read from the tree and blob objects of that commit through the
+    object database (a persistent ``git cat-file --batch`` process), never
+    the working tree, so reads need no lock and are unaffected by a write or
+    rollback in progress.
+    """
+
+    def __init__(self, repo, commit_sha: str):
+        """
+        Args:
+            repo: git.Repo owned by the calling thread
+            commit_sha: Commit to read from
+        """
+        self.repo = repo
+        self.commit_sha = commit_sha
+        self._commit = repo.commit(commit_sha)
+
+    def _tree(self, subdirectory: Optional[str] = None):
+        tree = self._commit.tree
+        subdirectory = (subdirectory or '').strip('/')
+        if not subdirectory:
+            return tree
+        try:
+            return tree / subdirectory
+        except KeyError:
+            return None
+
+    def list_blobs(self, subdirectory: Optional[str] = None, extension: Optional[str] = None) -> list:
+        """
+        List (file name, blob SHA) of the files directly in subdirectory,
+        sorted by name. The blob SHA identifies the file content.
+        """
+        tree = self._tree(subdirectory)
+        if tree is None or tree.type != 'tree':
+            logger.warning(f"Directory does not exist at {self.commit_sha[:12]}: {subdirectory}")
+            return []
+        return sorted(
+            (blob.name, blob.hexsha) for blob in tree.blobs
+            if extension is None or Path(blob.name).suffix == extension
+        )
+
+    def list_files(self, subdirectory: Optional[str] = None, extension: Optional[str] = None) -> list:
+        """List file names directly in subdirectory, like GitOperationManager.list_files."""
+        return [name for name, _ in self.list_blobs(subdirectory, extension)]
+
+    def read_blob(self, blob_sha: str) -> str:
+        """Return the content of a blob as text."""
+        return self.repo.odb.stream(bytes.fromhex(blob_sha)).read().decode('utf-8')
+
+    def blob_sha(self, file_path: str, subdirectory: Optional[str] = None) -> str:
+        """
+        Return the blob SHA of a file at this commit.
+
+        Raises:
+            GitOperationError: If the file does not exist
+        """
+        path = str(Path(subdirectory) / file_path) if subdirectory else file_path
+        try:
+            blob = self._commit.tree / path
+        except KeyError:
+            raise GitOperationError(f"File not found: {file_path}")
+        if blob.type != 'blob':
+            raise GitOperationError(f"File not found: {file_path}")
+        return blob.hexsha
+
+    def read_file(self, file_path: str, subdirectory: Optional[str] = None) -> str:
+        """
+        Read a file at this commit.
+
+        Raises:
+            GitOperationError: If the file does not exist
+        """
+        return self.read_blob(self.blob_sha(file_path, subdirectory))
+
+    def iter_files(self, subdirectory: Optional[str] = None, extension: Optional[str] = None):
+        """Yield (file name, blob SHA, content) for the files directly in subdirectory."""
+        for name, blob_sha in self.list_blobs(subdirectory, extension):
+            yield name, blob_sha, self.read_blob(blob_sha)
+
+    def changed_blobs(self, since_sha: str, subdirectory: Optional[str] = None,
+                      extension: Optional[str] = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """
+        Compare the files directly in subdirectory between since_sha and this
+        commit, like ``git diff --name-status`` but with the new blob SHAs.
+
+        Only the two trees are compared (``git diff-tree``), so the cost
+        follows the number of changed files, not the size of the directory.
+
+        Returns:
+            ([(file name, blob SHA)] added or modified, [file name] deleted)
+
+        Raises:
+            GitOperationError: If either commit cannot be read
+        """
+        prefix = (subdirectory or '').strip('/')
+        prefix = f"{prefix}/" if prefix else ''
+        try:
+            output = self.repo.git.diff_tree(
+                '-r', '-z', '--no-renames', '--no-abbrev', since_sha, self.commit_sha,
+                '--', prefix or '.'
+            )
+        except _git().GitCommandError as e:
+            raise GitOperationError(f"Cannot diff {since_sha[:12]}..{self.commit_sha[:12]}: {e}")
+
+        changed, deleted = [], []
+        fields = output.split('\0')
+        # -z records: ":<old mode> <new mode> <old sha> <new sha> <status>" NUL <path> NUL
+        for meta, path in zip(fields[0::2], fields[1::2]):
+            if not path.startswith(prefix):
+                continue
+            name = path[len(prefix):]
+            if '/' in name or (extension is not None and Path(name).suffix != extension):
+                continue
+            _, new_mode, _, new_sha, status = meta.lstrip(':').split(' ')
+            # A submodule (gitlink) in place of a file is not a manifest
+            if status == 'D' or new_mode == '160000':
+                deleted.append(name)
+            else:
+                changed.append((name, new_sha))
+        return changed, deleted
+
+
 class GitOperationManager:
     """
     Thread-safe Git operations manager with transaction support.
     
     Provides atomic git operations with automatic rollback on failure.
+
+    Every gunicorn worker has its own manager on the same clone, so the
+    locks are file locks in GIT_CLONE_DIR that also exclude the other
+    workers: ``lock`` is held to change the clone (clone, fast-forward,
+    commit and push), one writer at a time across all workers. Readers take
+    no lock; snapshots read committed objects only. One worker, holding
+    ``syncer.lock``, runs the background fetches for all of them; the sync
+    state is kept in ``sync-state.json`` so every worker reports it.
     """
 
     def __init__(self, config: Config):
@@ -32,20 +188,44 @@ class GitOperationManager:
             config: Application configuration
         """
         self.config = config
-        self.lock = threading.RLock()  # Reentrant lock for nested calls
+        clone_dir = config.GIT_CLONE_DIR
+        self.lock = FileLock(os.path.join(clone_dir, 'repo.lock'))  # Reentrant lock for nested calls
         self._repo = None
         self._repo_path = None
-        
+        # Background sync state; _sync_lock serializes fetches and is always
+        # taken before self.lock
+        self._sync_lock = FileLock(os.path.join(clone_dir, 'sync.lock'))
+        self._syncer_leader_lock = FileLock(os.path.join(clone_dir, 'syncer.lock'))
+        self._designated_syncer = False
+        self._sync_state_path = os.path.join(clone_dir, 'sync-state.json')
+        self._syncer_lock = threading.Lock()
+        self._syncer: Optional[threading.Thread] = None
+        self._stop_syncer = threading.Event()
+        self._sync_listeners: List[Callable[[], None]] = []
+        # Pushes rejected because the remote moved on, and how they were resolved
+        self._push_stats = {
+            'pushes': 0, 'rejected': 0, 'rebased': 0, 'conflicts': 0,
+            'reapplied': 0, 'retries': 0, 'failed': 0,
+        }
+        # git.Repo objects (and their cat-file processes) are not thread-safe;
+        # snapshots use one per thread
+        self._local = threading.local()
+
         logger.info("GitOperationManager initialized")
 
     def _get_auth_url(self) -> str:
         """
         Construct authenticated Git URL.
         
+        Local repositories (file:// URLs or absolute paths, e.g. a mirror or
+        the benchmarks' bare repositories) are used as-is.
+
         Returns:
             Git URL with authentication credentials
         """
         repo_url = self.config.GIT_REPO_URL.rstrip('/')
+        if repo_url.startswith(('file://', '/')):
+            return repo_url
         
         # Remove existing protocol
         if repo_url.startswith('https://'):
@@ -59,74 +239,313 @@ class GitOperationManager:
 
     def ensure_repository(self) -> Path:
         """
-        Ensure repository is cloned and up to date.
-        
+        Ensure the repository is cloned, without network I/O once it is.
+
+        The clone is kept up to date by the background syncer (started on
+        first use, every GIT_SYNC_INTERVAL seconds) and before each write;
+        reads are served from the local clone as of the last sync.
+
         Returns:
             Path to repository directory
-            
+
         Raises:
             GitOperationError: If repository operations fail
         """
-        with self.lock:
+        if self._repo_path is not None:
+            return self._repo_path
+        repo_path = Path(self.config.GIT_CLONE_DIR) / 'repo'
+        try:
+            if (repo_path / '.git').exists():
+                # Readers only need committed objects, so an existing clone is
+                # opened without the writer lock; another worker's in-flight
+                # push does not hold up the first read
+                repo = self._open_repository(repo_path)
+                logger.debug("Repository exists, using local clone")
+                needs_sync = True
+            else:
+                with self.lock:
+                    if (repo_path / '.git').exists():
+                        # Another worker cloned it while we waited
+                        repo = self._open_repository(repo_path)
+                        needs_sync = False
+                    else:
+                        repo = self._clone_repository(repo_path)
+                        needs_sync = False
+        except _git().GitCommandError as e:
+            logger.error(f"Git command error: {e}")
+            raise GitOperationError(f"Git operation failed: {e}")
+        except GitOperationError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error ensuring repository: {e}")
+            raise GitOperationError(f"Failed to ensure repository: {e}")
+
+        self._repo = repo
+        self._repo_path = repo_path
+        logger.info(f"Repository ready at {repo_path}, active branch: {repo.active_branch.name}")
+        if needs_sync:
+            # The clone may be arbitrarily old; bring it up to date without
+            # making this request wait for the lock and a fetch
+            threading.Thread(target=self._initial_sync, name='git-initial-sync', daemon=True).start()
+        self.start_syncer()
+        return repo_path
+
+    def _open_repository(self, repo_path: Path):
+        """Open the existing local clone."""
+        repo = _git().Repo(repo_path)
+        if not repo.heads:
+            raise GitOperationError("Repository cloned but has no branches")
+        return repo
+
+    def _clone_repository(self, repo_path: Path):
+        """Clone the repository into repo_path; called with self.lock held."""
+        os.makedirs(self.config.GIT_CLONE_DIR, exist_ok=True)
+        clone_options = self._clone_options()
+        logger.info(f"Cloning repository {clone_options or ''}".rstrip())
+        start = time.monotonic()
+        try:
+            # Try to clone with main branch first
+            repo = _git().Repo.clone_from(
+                self._get_auth_url(),
+                repo_path,
+                branch='main',
+                **clone_options
+            )
+        except _git().GitCommandError as e:
+            # If main doesn't exist, try master or default branch
+            logger.warning(f"Failed to clone 'main' branch: {e}")
+            logger.info("Trying to clone default branch")
+            repo = _git().Repo.clone_from(
+                self._get_auth_url(),
+                repo_path,
+                **clone_options
+            )
+        self._configure_sparse_checkout(repo)
+        self._record_sync(time.monotonic() - start)
+
+        # Verify repository was cloned successfully
+        if not repo.heads:
+            raise GitOperationError("Repository cloned but has no branches")
+        return repo
+
+    def _initial_sync(self):
+        """Apply configuration changes to an existing clone and sync it, in the background."""
+        try:
+            with self.lock:
+                repo = _git().Repo(self._repo_path)
+                # Verify remote URL matches configuration
+                remote = repo.remotes.origin
+                if remote.url != self._get_auth_url():
+                    logger.info("Remote URL changed, updating...")
+                    remote.set_url(self._get_auth_url())
+                self._configure_sparse_checkout(repo)
+            # Skipped if another worker synced within GIT_SYNC_INTERVAL
+            self.sync()
+        except GitOperationError as e:
+            # Serve the existing clone; the syncer retries
+            logger.warning(f"Initial sync failed, serving local clone: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error in initial repository sync: {e}")
+
+    def _sparse_directory(self) -> Optional[str]:
+        """The directory to check out when GIT_SPARSE_CHECKOUT is on, else None."""
+        if not self.config.GIT_SPARSE_CHECKOUT:
+            return None
+        directory = (self.config.YAML_SUBDIRECTORY or '').strip('/')
+        if not directory:
+            logger.warning("GIT_SPARSE_CHECKOUT needs a YAML_SUBDIRECTORY; checking out everything")
+            return None
+        return directory
+
+    def _clone_options(self) -> Dict[str, Any]:
+        """
+        git clone options from GIT_CLONE_DEPTH, GIT_CLONE_FILTER and
+        GIT_SPARSE_CHECKOUT. They only shape a new clone; an existing clone
+        keeps its history and objects (delete it to re-clone).
+        """
+        options: Dict[str, Any] = {}
+        if self.config.GIT_CLONE_DEPTH > 0:
+            options['depth'] = self.config.GIT_CLONE_DEPTH
+        if self.config.GIT_CLONE_FILTER:
+            options['filter'] = self.config.GIT_CLONE_FILTER
+        if self._sparse_directory():
+            # Check out only the top-level files; the directory follows below
+            options['sparse'] = True
+        return options
+
+    def _configure_sparse_checkout(self, repo):
+        """
+        Limit the working tree to YAML_SUBDIRECTORY (cone mode), or restore
+        the full checkout after GIT_SPARSE_CHECKOUT was turned off. With a
+        blob filter, checking the directory out fetches just its blobs.
+        """
+        directory = self._sparse_directory()
+        if directory:
+            repo.git.sparse_checkout('set', '--cone', directory)
+            return
+        try:
+            # git keeps this in config.worktree, which GitPython does not read
+            sparse = repo.git.config('--bool', 'core.sparseCheckout') == 'true'
+        except _git().GitCommandError:  # not set
+            sparse = False
+        if sparse:
+            logger.info("Sparse checkout disabled, checking out the whole tree")
+            repo.git.sparse_checkout('disable')
+
+    def sync(self, force: bool = False) -> bool:
+        """
+        Fetch from origin and fast-forward the local clone.
+
+        The fetch runs outside the manager lock so reads are not blocked on
+        the network; only updating the working tree takes the lock.
+
+        Args:
+            force: Sync even if the last sync is younger than GIT_SYNC_INTERVAL
+
+        Returns:
+            True if a sync ran, False if skipped as fresh enough
+
+        Raises:
+            GitOperationError: If fetching or updating fails
+        """
+        repo_path = self.ensure_repository() if self._repo_path is None else self._repo_path
+        with self._sync_lock:
+            age = self.sync_age()
+            if not force and age is not None and age < self.config.GIT_SYNC_INTERVAL:
+                return False
+            start = time.monotonic()
             try:
-                # Create storage directory
-                os.makedirs(self.config.GIT_CLONE_DIR, exist_ok=True)
-                repo_path = Path(self.config.GIT_CLONE_DIR) / 'repo'
-                
-                if (repo_path / '.git').exists():
-                    logger.debug("Repository exists, pulling latest changes")
-                    repo = git.Repo(repo_path)
-                    
-                    # Verify remote URL matches configuration
-                    remote = repo.remotes.origin
-                    if remote.url != self._get_auth_url():
-                        logger.info("Remote URL changed, updating...")
-                        remote.set_url(self._get_auth_url())
-                    
-                    # Pull latest changes
-                    try:
-                        repo.remotes.origin.pull()
-                    except git.GitCommandError as e:
-                        logger.warning(f"Pull failed, attempting reset: {e}")
-                        # If pull fails, try to reset to origin
-                        repo.git.reset('--hard', 'origin/main')
-                else:
-                    logger.info("Cloning repository")
+                repo = _git().Repo(repo_path)
+                tracking = repo.active_branch.tracking_branch()
+                upstream = tracking.name if tracking else f"origin/{repo.active_branch.name}"
+                # Remember what the remote looked like before the fetch so a rewritten
+                # upstream history does not make already-pushed commits look local.
+                previous_upstream = repo.git.rev_parse('--verify', '--quiet', upstream, with_exceptions=False)
+                repo.remotes.origin.fetch()
+                with self.lock:
                     try:
-                        # Try to clone with main branch first
-                        repo = git.Repo.clone_from(
-                            self._get_auth_url(),
-                            repo_path,
-                            branch='main'
-                        )
-                    except git.GitCommandError as e:
-                        # If main doesn't exist, try master or default branch
-                        logger.warning(f"Failed to clone 'main' branch: {e}")
-                        logger.info("Trying to clone default branch")
-                        repo = git.Repo.clone_from(
-                            self._get_auth_url(),
-                            repo_path
-                        )
-                
-                self._repo = repo
-                self._repo_path = repo_path
-                
-                # Verify repository was cloned successfully
-                if not repo.heads:
-                    raise GitOperationError("Repository cloned but has no branches")
-                
-                logger.info(f"Repository ready at {repo_path}, active branch: {repo.active_branch.name if repo.heads else 'none'}")
-                return repo_path
-                
-            except git.GitCommandError as e:
-                logger.error(f"Git command error: {e}")
-                raise GitOperationError(f"Git operation failed: {e}")
+                        repo.git.merge('--ff-only', upstream)
+                    except _git().GitCommandError as e:
+                        exclude = [upstream] + ([previous_upstream] if previous_upstream else [])
+                        unpushed = int(repo.git.rev_list('--count', 'HEAD', '--not', *exclude))
+                        if unpushed:
+                            message = (f"Fast-forward to {upstream} failed and HEAD has {unpushed} "
+                                       f"unpushed commit(s); not resetting: {e}")
+                            self._record_sync_error(message)
+                            logger.error(message)
+                            raise GitOperationError(f"Sync failed: {message}")
+                        logger.warning(f"Fast-forward failed, resetting to {upstream}: {e}")
+                        repo.git.reset('--hard', upstream)
+            except _git().GitCommandError as e:
+                self._record_sync_error(str(e))
+                logger.error(f"Repository sync failed: {e}")
+                raise GitOperationError(f"Sync failed: {e}")
+            duration = time.monotonic() - start
+            self._record_sync(duration)
+            logger.debug(f"Repository synced in {duration * 1000:.0f} ms")
+        self._notify_sync_listeners()
+        return True
+
+    def add_sync_listener(self, callback: Callable[[], None]):
+        """
+        Call callback (with no arguments) after every successful sync, in the
+        syncing thread and outside the manager locks, e.g. to bring derived
+        state up to date with the new HEAD before the next request needs it.
+        """
+        self._sync_listeners.append(callback)
+
+    def _notify_sync_listeners(self):
+        for callback in self._sync_listeners:
+            try:
+                callback()
             except Exception as e:
-                logger.error(f"Unexpected error ensuring repository: {e}")
-                raise GitOperationError(f"Failed to ensure repository: {e}")
+                logger.error(f"Sync listener {callback!r} failed: {e}")
+
+    def _read_sync_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._sync_state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_sync_state(self, state: Dict[str, Any]):
+        # Written under _sync_lock (or self.lock while cloning) and replaced
+        # atomically, so other workers never read a partial file
+        temp_path = f"{self._sync_state_path}.{os.getpid()}"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self._sync_state_path)
+
+    def _record_sync(self, duration: float):
+        state = self._read_sync_state()
+        self._write_sync_state({
+            'time': time.time(),
+            'duration': duration,
+            'error': None,
+            'count': state.get('count', 0) + 1,
+        })
+
+    def _record_sync_error(self, error: str):
+        self._write_sync_state(dict(self._read_sync_state(), error=error))
+
+    def sync_age(self) -> Optional[float]:
+        """Seconds since the last successful sync by any worker, or None before the first."""
+        last_sync = self._read_sync_state().get('time')
+        if last_sync is None:
+            return None
+        return max(0.0, time.time() - last_sync)
+
+    def sync_status(self) -> Dict[str, Any]:
+        """Report last-sync age and duration for monitoring."""
+        state = self._read_sync_state()
+        age = max(0.0, time.time() - state['time']) if state.get('time') is not None else None
+        return {
+            'interval_seconds': self.config.GIT_SYNC_INTERVAL,
+            'syncer_running': self._syncer is not None and self._syncer.is_alive(),
+            'designated_syncer': self._designated_syncer,
+            'last_sync_age_seconds': round(age, 1) if age is not None else None,
+            'last_sync_duration_ms': round(state['duration'] * 1000) if state.get('duration') is not None else None,
+            'last_sync_error': state.get('error'),
+            'syncs': state.get('count', 0),
+            'push': dict(self._push_stats),
+        }
+
+    def start_syncer(self):
+        """Start the background fetch loop unless disabled (GIT_SYNC_INTERVAL <= 0) or running."""
+        if self.config.GIT_SYNC_INTERVAL <= 0:
+            return
+        with self._syncer_lock:
+            if self._syncer is not None and self._syncer.is_alive():
+                return
+            self._stop_syncer.clear()
+            self._syncer = threading.Thread(target=self._sync_loop, name='git-syncer', daemon=True)
+            self._syncer.start()
+
+    def stop_syncer(self):
+        """Stop the background fetch loop."""
+        self._stop_syncer.set()
+
+    def _sync_loop(self):
+        while not self._stop_syncer.wait(self.config.GIT_SYNC_INTERVAL):
+            # Only the designated worker fetches; the others see its updates
+            # through the shared clone. The flock is released when that
+            # worker exits, and the next loop iteration elsewhere takes over.
+            if not self._designated_syncer:
+                if not self._syncer_leader_lock.acquire(blocking=False):
+                    continue
+                self._designated_syncer = True
+                logger.info(f"Worker {os.getpid()} is the designated Git syncer")
+            try:
+                self.sync()
+            except GitOperationError:
+                # Already logged; keep serving the last good clone
+                pass
+            except Exception as e:
+                logger.error(f"Unexpected error in repository syncer: {e}")
 
     @contextmanager
-    def transaction(self, operation_name: str = "operation"):
+    def transaction(self, operation_name: str = "operation",
+                    reapply: Optional[Callable[[Any], Any]] = None):
         """
         Context manager for atomic Git operations with automatic rollback.
         
@@ -134,9 +553,18 @@ class GitOperationManager:
             with git_manager.transaction("create VM") as repo:
                 # Make changes
                 repo.index.add([file_path])
+            pushed_sha = repo.pushed_commit
                 
+        If someone else pushed first, the new commits are rebased onto the
+        fetched remote head and the push is retried (see _push). After a
+        successful exit ``repo.pushed_commit`` holds the SHA of HEAD as
+        pushed, which differs from the local commit when it was rebased.
+
         Args:
             operation_name: Description of the operation for logging
+            reapply: Optional callable that redoes the changes on a clean
+                checkout of the remote head (given the repo), used when the
+                rebase conflicts
             
         Yields:
             git.Repo: Repository instance
@@ -144,9 +572,13 @@ class GitOperationManager:
         Raises:
             GitOperationError: If operation fails
         """
+        # Bring the clone up to date before writing so the push fast-forwards;
+        # done before taking self.lock to keep the lock order
+        self.ensure_repository()
+        self.sync(force=True)
         with self.lock:
             repo_path = self.ensure_repository()
-            repo = git.Repo(repo_path)
+            repo = _git().Repo(repo_path)
             
             # Store original state
             original_head = None
@@ -173,17 +605,10 @@ class GitOperationManager:
                 # Push if we have new commits OR uncommitted changes
                 if has_new_commits or repo.is_dirty() or repo.untracked_files:
                     logger.info(f"Pushing changes for: {operation_name}")
-                    push_info = repo.remote().push()
-                    
-                    # Check push result
-                    for info in push_info:
-                        if info.flags & info.ERROR:
-                            raise GitOperationError(
-                                f"Push failed: {info.summary}"
-                            )
-                        logger.info(f"Push successful: {info.summary}")
+                    self._push(repo, reapply)
                 else:
                     logger.info("No changes to push (repository clean and no new commits)")
+                repo.pushed_commit = repo.head.commit.hexsha if repo.heads else None
                     
             except Exception as e:
                 logger.error(f"Transaction failed for {operation_name}: {e}")
@@ -203,6 +628,170 @@ class GitOperationManager:
                 else:
                     raise GitOperationError(f"Transaction failed: {e}")
 
+    def _push(self, repo, reapply: Optional[Callable[[Any], Any]] = None):
+        """
+        Push HEAD, retrying with bounded, jittered exponential backoff while
+        the remote rejects it as not a fast-forward.
+
+        After each rejection the remote is fetched and the local commits are
+        rebased onto it. If the rebase conflicts, reapply (when given) redoes
+        the change on the remote head instead; a file-level change then
+        wins over the remote's edit of the same file.
+
+        Raises:
+            GitOperationError: If the push fails for another reason, the
+                rebase conflicts without reapply, or retries run out
+        """
+        stats = self._push_stats
+        retries = max(0, self.config.GIT_PUSH_RETRIES)
+        for attempt in range(retries + 1):
+            stats['pushes'] += 1
+            try:
+                push_info = repo.remote().push()
+            except _git().GitCommandError as e:
+                stats['failed'] += 1
+                raise GitOperationError(f"Push failed: {e}")
+            rejected = False
+            for info in push_info:
+                # A remote that lost the race to update the ref (e.g. a
+                # concurrent push held its lock) is retried the same way
+                if info.flags & info.REJECTED or (
+                        info.flags & info.REMOTE_REJECTED
+                        and any(reason in info.summary for reason in RETRYABLE_PUSH_ERRORS)):
+                    rejected = True
+                elif info.flags & info.ERROR:
+                    stats['failed'] += 1
+                    raise GitOperationError(f"Push failed: {info.summary}")
+            if not push_info:
+                stats['failed'] += 1
+                raise GitOperationError("Push failed: no result from remote")
+            if not rejected:
+                for info in push_info:
+                    logger.info(f"Push successful: {info.summary}")
+                return
+
+            stats['rejected'] += 1
+            if attempt == retries:
+                break
+            stats['retries'] += 1
+            # Exponential backoff with jitter so competing writers spread out
+            delay = min(self.config.GIT_PUSH_BACKOFF_MAX, self.config.GIT_PUSH_BACKOFF * 2 ** attempt)
+            delay = random.uniform(delay / 2, delay)
+            logger.warning(f"Push rejected (remote has new commits), retrying in {delay:.2f}s "
+                           f"({attempt + 1}/{retries})")
+            time.sleep(delay)
+            try:
+                repo.remotes.origin.fetch()
+                tracking = repo.active_branch.tracking_branch()
+                upstream = tracking.name if tracking else f"origin/{repo.active_branch.name}"
+            except _git().GitCommandError as e:
+                stats['failed'] += 1
+                raise GitOperationError(f"Fetch after rejected push failed: {e}")
+            # Keep the original committer; the clone may have no identity configured
+            committer = repo.head.commit.committer
+            env = {'GIT_COMMITTER_NAME': committer.name, 'GIT_COMMITTER_EMAIL': committer.email}
+            try:
+                repo.git.rebase(upstream, env=env)
+                stats['rebased'] += 1
+            except _git().GitCommandError as e:
+                stats['conflicts'] += 1
+                try:
+                    repo.git.rebase('--abort')
+                except _git().GitCommandError:
+                    pass
+                if reapply is None:
+                    stats['failed'] += 1
+                    raise GitOperationError(f"Push rejected and rebase onto {upstream} conflicts: {e}")
+                logger.warning(f"Rebase onto {upstream} conflicts, re-applying the change")
+                repo.git.reset('--hard', upstream)
+                reapply(repo)
+                stats['reapplied'] += 1
+
+        stats['failed'] += 1
+        raise GitOperationError(f"Push rejected after {retries + 1} attempt(s); the remote keeps moving")
+
+    def apply_changes(
+        self,
+        changes: List[Tuple[str, Optional[str]]],
+        commit_message: str
+    ) -> str:
+        """
+        Write and delete files as one commit, pushed in one transaction.
+
+        Changes are applied in order, so a later change to the same path
+        wins; this is what the write queue relies on to coalesce edits.
+
+        Args:
+            changes: (path relative to the repository root, content) pairs;
+                content None deletes the file
+            commit_message: Commit message
+
+        Returns:
+            SHA of the pushed commit holding the changes (the current HEAD
+            if nothing changed)
+
+        Raises:
+            GitChangeError: If a file to delete does not exist or a file
+                cannot be written (the clone is rolled back)
+            GitOperationError: If the commit or push fails (the clone is
+                rolled back)
+        """
+        logger.info(f"Applying {len(changes)} change(s): {commit_message.splitlines()[0] if commit_message else ''}")
+
+        def write(repo):
+            return self._write_changes(repo, changes, commit_message)
+
+        with self.transaction(f"apply {len(changes)} change(s)", reapply=write) as repo:
+            write(repo)
+        return repo.pushed_commit
+
+    def _write_changes(self, repo, changes: List[Tuple[str, Optional[str]]], commit_message: str) -> str:
+        """Write, stage and commit changes in the working tree; see apply_changes."""
+        repo_path = Path(repo.working_dir)
+        tracked = repo.index.entries
+        paths = []
+        for relative_path, content in changes:
+            full_path = repo_path / relative_path
+            try:
+                if content is None:
+                    # Outside a sparse checkout a tracked file has no working copy
+                    if not full_path.exists() and (relative_path, 0) not in tracked:
+                        logger.warning(f"File does not exist: {full_path}")
+                        raise GitChangeError(f"File not found: {Path(relative_path).name}")
+                    logger.debug(f"Removing file: {full_path}")
+                    full_path.unlink(missing_ok=True)
+                else:
+                    full_path.parent.mkdir(parents=True, exist_ok=True)
+                    full_path.write_text(content)
+                    logger.debug(f"Wrote {full_path}, {len(content)} bytes")
+            except OSError as e:
+                raise GitChangeError(f"Cannot write {relative_path}: {e}")
+            if relative_path not in paths:
+                paths.append(relative_path)
+
+        # Stage the final state of each path; a file created and deleted
+        # within the same batch was never tracked and needs nothing
+        added = [path for path in paths if (repo_path / path).exists()]
+        removed = [path for path in paths if path not in added and (path, 0) in tracked]
+        # With a sparse checkout, git refuses paths outside the cone (e.g. a
+        # VM created in another subdirectory) unless told otherwise
+        sparse = ('--sparse',) if self._sparse_directory() else ()
+        # git add hashes the files natively, much faster than IndexFile.add
+        # for large batches; chunked to stay under the argument size limit
+        for start in range(0, len(added), GIT_PATHS_PER_CALL):
+            repo.git.add(*sparse, '--', *added[start:start + GIT_PATHS_PER_CALL])
+        for start in range(0, len(removed), GIT_PATHS_PER_CALL):
+            repo.git.rm(*sparse, '--cached', '--quiet', '--', *removed[start:start + GIT_PATHS_PER_CALL])
+
+        if repo.index.diff('HEAD'):
+            commit = repo.index.commit(commit_message)
+            logger.info(f"Created commit: {commit.hexsha}")
+            return commit.hexsha
+        logger.warning("No changes to commit (files might already have this content)")
+        if repo.head.is_valid():
+            return repo.head.commit.hexsha
+        raise GitOperationError("No changes to commit and no HEAD commit exists")
+
     def commit_file(
         self, 
         file_path: str, 
@@ -225,45 +814,8 @@ class GitOperationManager:
         Raises:
             GitOperationError: If commit fails
         """
-        logger.info(f"Starting commit_file for: {file_path} in subdirectory: {subdirectory}")
-        
-        with self.transaction(f"commit {file_path}") as repo:
-            repo_path = Path(repo.working_dir)
-            logger.debug(f"Repository path: {repo_path}")
-            logger.debug(f"Repository is valid: {repo.git_dir}")
-            
-            # Determine full file path
-            if subdirectory:
-                target_dir = repo_path / subdirectory
-                target_dir.mkdir(parents=True, exist_ok=True)
-                full_path = target_dir / file_path
-                relative_path = str(Path(subdirectory) / file_path)
-            else:
-                full_path = repo_path / file_path
-                relative_path = file_path
-            
-            # Write file
-            logger.info(f"Writing file to: {full_path}")
-            full_path.write_text(content)
-            logger.info(f"File written successfully, size: {len(content)} bytes")
-            
-            # Stage and commit
-            logger.info(f"Staging file: {relative_path}")
-            repo.index.add([relative_path])
-            
-            # Check if there are changes to commit
-            logger.debug("Checking for changes to commit")
-            if repo.index.diff('HEAD'):
-                logger.info("Changes detected, creating commit")
-                commit = repo.index.commit(commit_message)
-                logger.info(f"Created commit: {commit.hexsha}")
-                return commit.hexsha
-            else:
-                logger.warning("No changes to commit (file might already exist with same content)")
-                if repo.head.is_valid():
-                    return repo.head.commit.hexsha
-                else:
-                    raise GitOperationError("No changes to commit and no HEAD commit exists")
+        relative_path = str(Path(subdirectory) / file_path) if subdirectory else file_path
+        return self.apply_changes([(relative_path, content)], commit_message)
 
     def delete_file(
         self, 
@@ -285,31 +837,32 @@ class GitOperationManager:
         Raises:
             GitOperationError: If deletion fails
         """
-        with self.transaction(f"delete {file_path}") as repo:
-            repo_path = Path(repo.working_dir)
-            
-            # Determine full file path
-            if subdirectory:
-                full_path = repo_path / subdirectory / file_path
-                relative_path = str(Path(subdirectory) / file_path)
-            else:
-                full_path = repo_path / file_path
-                relative_path = file_path
-            
-            # Check if file exists
-            if not full_path.exists():
-                logger.warning(f"File does not exist: {full_path}")
-                raise GitOperationError(f"File not found: {file_path}")
-            
-            # Remove file
-            logger.debug(f"Removing file: {full_path}")
-            full_path.unlink()
-            repo.index.remove([relative_path])
-            
-            # Commit
-            commit = repo.index.commit(commit_message)
-            logger.info(f"Deleted file, commit: {commit.hexsha}")
-            return commit.hexsha
+        relative_path = str(Path(subdirectory) / file_path) if subdirectory else file_path
+        return self.apply_changes([(relative_path, None)], commit_message)
+
+    def _thread_repo(self):
+        """Return this thread's git.Repo for the local clone."""
+        repo_path = self.ensure_repository()
+        repo = getattr(self._local, 'repo', None)
+        if repo is None or Path(repo.working_dir) != repo_path:
+            repo = self._local.repo = _git().Repo(repo_path)
+        return repo
+
+    def snapshot(self, ref: str = 'HEAD') -> RepositorySnapshot:
+        """
+        Pin ref (HEAD by default) to its current commit and return a
+        lock-free read view of it.
+
+        Raises:
+            GitOperationError: If the repository is unavailable or ref is invalid
+        """
+        try:
+            repo = self._thread_repo()
+            return RepositorySnapshot(repo, repo.rev_parse(ref).hexsha)
+        except GitOperationError:
+            raise
+        except (_git().GitCommandError, _git().BadName, ValueError) as e:
+            raise GitOperationError(f"Cannot resolve {ref}: {e}")
 
     def read_file(
         self, 
@@ -317,7 +870,7 @@ class GitOperationManager:
         subdirectory: Optional[str] = None
     ) -> str:
         """
-        Read a file from the repository.
+        Read a file as of the current HEAD commit.
         
         Args:
             file_path: Name of the file
@@ -329,19 +882,7 @@ class GitOperationManager:
         Raises:
             GitOperationError: If file doesn't exist
         """
-        with self.lock:
-            repo_path = self.ensure_repository()
-            
-            # Determine full file path
-            if subdirectory:
-                full_path = repo_path / subdirectory / file_path
-            else:
-                full_path = repo_path / file_path
-            
-            if not full_path.exists():
-                raise GitOperationError(f"File not found: {file_path}")
-            
-            return full_path.read_text()
+        return self.snapshot().read_file(file_path, subdirectory)
 
     def list_files(
         self, 
@@ -349,7 +890,7 @@ class GitOperationManager:
         extension: Optional[str] = None
     ) -> list:
         """
-        List files in the repository.
+        List files as of the current HEAD commit.
         
         Args:
             subdirectory: Optional subdirectory to list
@@ -358,27 +899,7 @@ class GitOperationManager:
         Returns:
             List of file paths
         """
-        with self.lock:
-            repo_path = self.ensure_repository()
-            
-            # Determine directory to list
-            if subdirectory:
-                target_dir = repo_path / subdirectory
-            else:
-                target_dir = repo_path
-            
-            if not target_dir.exists():
-                logger.warning(f"Directory does not exist: {target_dir}")
-                return []
-            
-            # List files
-            files = []
-            for file_path in target_dir.iterdir():
-                if file_path.is_file():
-                    if extension is None or file_path.suffix == extension:
-                        files.append(file_path.name)
-            
-            return sorted(files)
+        return self.snapshot().list_files(subdirectory, extension)
 
     def get_repository_status(self) -> Dict[str, Any]:
         """
@@ -390,14 +911,15 @@ class GitOperationManager:
         with self.lock:
             try:
                 repo_path = self.ensure_repository()
-                repo = git.Repo(repo_path)
+                repo = _git().Repo(repo_path)
                 
                 return {
                     'is_dirty': repo.is_dirty(),
                     'untracked_files': repo.untracked_files,
                     'active_branch': repo.active_branch.name if repo.heads else None,
                     'latest_commit': repo.head.commit.hexsha if repo.heads else None,
-                    'remote_url': repo.remotes.origin.url if repo.remotes else None
+                    'remote_url': repo.remotes.origin.url if repo.remotes else None,
+                    'sync': self.sync_status()
                 }
             except Exception as e:
                 logger.error(f"Error getting repository status: {e}")
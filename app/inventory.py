@@ -0,0 +1,130 @@
+"""VM inventory kept in step with the Git repository commit by commit.
+
+The index page lists every manifest in YAML_SUBDIRECTORY. Instead of walking
+the whole directory tree on each new commit, ``VMInventory`` remembers the
+commit it last indexed and applies only the files that changed since then
+(``git diff-tree`` between the two commits), so a refresh costs in proportion
+to the size of the change rather than the size of the repository.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.git_manager import GitOperationError, RepositorySnapshot
+
+logger = logging.getLogger(__name__)
+
+# (file name, blob SHA, snapshot) -> VM info, or None to leave the file out
+Loader = Callable[[str, str, RepositorySnapshot], Optional[Dict[str, Any]]]
+
+
+class VMInventory:
+    """
+    VM information per manifest file as of one indexed commit.
+
+    The first refresh, or one whose diff cannot be computed, indexes every
+    file; later refreshes apply the added, modified and deleted files
+    between the indexed commit and the snapshot's.
+    """
+
+    def __init__(self, subdirectory: str, extension: str, load: Loader):
+        """
+        Args:
+            subdirectory: Repository directory holding the manifests
+            extension: Manifest file extension, e.g. '.yaml'
+            load: Returns the VM info for one manifest blob
+        """
+        self.subdirectory = subdirectory
+        self.extension = extension
+        self._load = load
+        self._lock = threading.Lock()
+        self.commit_sha: Optional[str] = None
+        # file name -> (blob SHA, VM info or None), and the names in order
+        self._entries: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        self._names: List[str] = []
+        # The VM list as of commit_sha; None until rebuilt after a change
+        self._vms: Optional[List[Dict[str, Any]]] = []
+        self.full_refreshes = 0
+        self.incremental_refreshes = 0
+        self.last_refresh: Dict[str, Any] = {}
+
+    def vms(self, snapshot: RepositorySnapshot) -> List[Dict[str, Any]]:
+        """Bring the inventory up to snapshot's commit and return its VMs, sorted by file name."""
+        with self._lock:
+            if snapshot.commit_sha != self.commit_sha:
+                self._refresh(snapshot)
+            if self._vms is None:
+                entries = self._entries
+                self._vms = [info for info in (entries[name][1] for name in self._names) if info is not None]
+            return list(self._vms)
+
+    def refresh(self, snapshot: RepositorySnapshot):
+        """Bring the inventory up to snapshot's commit, e.g. right after a sync."""
+        with self._lock:
+            if snapshot.commit_sha != self.commit_sha:
+                self._refresh(snapshot)
+
+    def reset(self):
+        """Forget the indexed commit so the next refresh indexes every file."""
+        with self._lock:
+            self.commit_sha = None
+            self._entries = {}
+            self._names = []
+            self._vms = []
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'commit': self.commit_sha,
+            'files': len(self._entries),
+            'full_refreshes': self.full_refreshes,
+            'incremental_refreshes': self.incremental_refreshes,
+            'last_refresh': self.last_refresh,
+        }
+
+    def _refresh(self, snapshot: RepositorySnapshot):
+        start = time.monotonic()
+        changes = None
+        if self.commit_sha is not None:
+            try:
+                changes = snapshot.changed_blobs(self.commit_sha, self.subdirectory, self.extension)
+            except GitOperationError as e:
+                # e.g. the indexed commit was garbage-collected after a force push
+                logger.warning(f"Re-indexing all manifests: {e}")
+
+        if changes is None:
+            changed = snapshot.list_blobs(self.subdirectory, self.extension)
+            deleted = []
+            self._entries = {}
+            self._names = [name for name, _ in changed]
+            self.full_refreshes += 1
+        else:
+            changed, deleted = changes
+            self.incremental_refreshes += 1
+
+        for name in deleted:
+            if self._entries.pop(name, None) is not None:
+                del self._names[bisect.bisect_left(self._names, name)]
+        for name, blob_sha in changed:
+            if changes is not None and name not in self._entries:
+                bisect.insort(self._names, name)
+            try:
+                self._entries[name] = (blob_sha, self._load(name, blob_sha, snapshot))
+            except Exception as e:
+                logger.error(f"Error processing {name}: {e}")
+                self._entries[name] = (blob_sha, None)
+
+        if changes is None or changed or deleted:
+            self._vms = None
+        self.last_refresh = {
+            'mode': 'full' if changes is None else 'incremental',
+            'from': self.commit_sha,
+            'to': snapshot.commit_sha,
+            'changed': len(changed),
+            'deleted': len(deleted),
+            'duration_ms': round((time.monotonic() - start) * 1000, 1),
+        }
+        logger.debug(f"Inventory refresh: {self.last_refresh}")
+        self.commit_sha = snapshot.commit_sha
@@ -0,0 +1,707 @@
+"""Watch-backed informer cache for KubeVirt and Service resources."""
+
+import functools
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from kubernetes import watch
+from kubernetes.client import CoreV1Api, CustomObjectsApi
+from kubernetes.client.rest import ApiException
+
+from app.constants import (
+    KUBEVIRT_API_GROUP,
+    KUBEVIRT_API_VERSION,
+    LABEL_KUBEVIRT_VM,
+    RESOURCE_VIRTUAL_MACHINES,
+    RESOURCE_VIRTUAL_MACHINE_INSTANCES,
+)
+
+logger = logging.getLogger(__name__)
+
+HTTP_STATUS_GONE = 410
+
+# An index function result: one value, several values or None
+IndexValue = Union[str, Iterable[str], None]
+
+
+def get_field(obj: Any, *path: str) -> Any:
+    """Read a nested field from either a plain dict or a kubernetes model."""
+    for attr in path:
+        if obj is None:
+            return None
+        if isinstance(obj, dict):
+            obj = obj.get(attr)
+        else:
+            obj = getattr(obj, _model_attribute(type(obj), attr), None)
+    return obj
+
+
+@functools.lru_cache(maxsize=None)
+def _model_attribute(model_class: type, name: str) -> str:
+    """Translate a camelCase API field name to the model attribute name."""
+    for attribute, json_name in (getattr(model_class, 'attribute_map', None) or {}).items():
+        if json_name == name:
+            return attribute
+    return ''.join(f"_{c.lower()}" if c.isupper() else c for c in name)
+
+
+def object_key(obj: Any) -> str:
+    """Return the ``namespace/name`` store key of an API object."""
+    namespace = get_field(obj, 'metadata', 'namespace') or 'default'
+    name = get_field(obj, 'metadata', 'name')
+    return f"{namespace}/{name}"
+
+
+def service_vm_key(obj: Any) -> Optional[str]:
+    """Index function mapping a Service to the ``namespace/vm`` it selects."""
+    selector = get_field(obj, 'spec', 'selector') or {}
+    vm_name = selector.get(LABEL_KUBEVIRT_VM)
+    if not vm_name:
+        return None
+    namespace = get_field(obj, 'metadata', 'namespace') or 'default'
+    return f"{namespace}/{vm_name}"
+
+
+def vm_phase_key(obj: Any) -> Optional[str]:
+    """Index function mapping a VM to its lower-cased printableStatus."""
+    status = get_field(obj, 'status', 'printableStatus')
+    return status.lower() if status else None
+
+
+def vmi_node_key(obj: Any) -> Optional[str]:
+    """Index function mapping a VMI to the node it runs on."""
+    return get_field(obj, 'status', 'nodeName')
+
+
+# Metadata the cache readers use; managedFields in particular is often the
+# largest part of an object and is never read
+CACHED_METADATA_FIELDS = ('name', 'namespace', 'labels', 'annotations', 'resourceVersion', 'creationTimestamp')
+
+
+def _pick(obj: Optional[Dict[str, Any]], fields: Iterable[str]) -> Dict[str, Any]:
+    obj = obj or {}
+    return {field: obj[field] for field in fields if field in obj}
+
+
+def strip_vm(obj: Any) -> Any:
+    """
+    Informer transform keeping what the VM readers use: metadata, status,
+    the run state and the domain CPU and memory shown in the list view.
+    """
+    spec = obj.get('spec') or {}
+    stripped_spec = _pick(spec, ('running', 'runStrategy'))
+    domain = _pick(get_field(spec, 'template', 'spec', 'domain'), ('cpu', 'resources'))
+    if domain:
+        stripped_spec['template'] = {'spec': {'domain': domain}}
+    return {
+        'metadata': _pick(obj.get('metadata'), CACHED_METADATA_FIELDS),
+        'spec': stripped_spec,
+        'status': obj.get('status') or {},
+    }
+
+
+def strip_vmi(obj: Any) -> Any:
+    """Informer transform for VMIs: metadata and status (the spec is a copy of the VM template)."""
+    return {'metadata': _pick(obj.get('metadata'), CACHED_METADATA_FIELDS), 'status': obj.get('status') or {}}
+
+
+def strip_service(obj: Any) -> Any:
+    """
+    Informer transform for Services, given as plain dicts (raw_services) or
+    kubernetes models; models only lose their managed fields.
+    """
+    if not isinstance(obj, dict):
+        if obj.metadata is not None:
+            obj.metadata.managed_fields = None
+        return obj
+    return {
+        'metadata': _pick(obj.get('metadata'), CACHED_METADATA_FIELDS),
+        'spec': _pick(obj.get('spec'), ('selector', 'ports', 'type', 'clusterIP')),
+        'status': obj.get('status') or {},
+    }
+
+
+def label_values(obj: Any) -> List[str]:
+    """
+    Multi-valued index function: ``key=value`` for every label, plus the
+    bare ``key`` for existence checks (label keys cannot contain ``=``).
+    """
+    labels = get_field(obj, 'metadata', 'labels') or {}
+    return [f"{key}={value}" for key, value in labels.items()] + list(labels)
+
+
+def parse_label_selector(selector: Optional[str]) -> List[tuple]:
+    """
+    Parse an equality-based label selector (``a=b,c!=d,e,!f``) into
+    ``(key, operator, value)`` requirements; operator is one of
+    ``=``, ``!=``, ``exists`` and ``!exists``. Raises ValueError on
+    set-based syntax, which is not supported.
+    """
+    requirements = []
+    for term in (selector or '').split(','):
+        term = term.strip()
+        if not term:
+            continue
+        if '(' in term or ' in ' in term or ' notin ' in term:
+            raise ValueError(f"Unsupported label selector term: {term}")
+        if '!=' in term:
+            key, _, value = term.partition('!=')
+            requirements.append((key.strip(), '!=', value.strip()))
+        elif '=' in term:
+            key, _, value = term.partition('==' if '==' in term else '=')
+            requirements.append((key.strip(), '=', value.strip()))
+        elif term.startswith('!'):
+            requirements.append((term[1:].strip(), '!exists', None))
+        else:
+            requirements.append((term, 'exists', None))
+    return requirements
+
+
+def labels_match(labels: Optional[Dict[str, str]], requirements: List[tuple]) -> bool:
+    """Check a label map against parsed ``parse_label_selector`` requirements."""
+    labels = labels or {}
+    for key, operator, value in requirements:
+        if operator == '=' and labels.get(key) != value:
+            return False
+        if operator == '!=' and labels.get(key) == value:
+            return False
+        if operator == 'exists' and key not in labels:
+            return False
+        if operator == '!exists' and key in labels:
+            return False
+    return True
+
+
+def _index_values(index_func: Callable[[Any], IndexValue], obj: Any) -> Iterable[str]:
+    """Normalize an index function result to an iterable of values."""
+    value = index_func(obj)
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return value
+
+
+def _continue_token(result: Any) -> Optional[str]:
+    """Return the list continue token (``_continue`` on kubernetes models)."""
+    metadata = get_field(result, 'metadata')
+    if metadata is None:
+        return None
+    if isinstance(metadata, dict):
+        return metadata.get('continue')
+    return getattr(metadata, '_continue', None)
+
+
+def raw_json(api_func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap an API call to skip kubernetes model deserialization.
+
+    The response body is decoded straight into plain dicts with camelCase
+    keys, as the API server sent them. Watch calls are passed through; the
+    wrapper has no docstring, so ``Watch.stream`` yields plain dicts too.
+    """
+    def call(*args, **kwargs):
+        if kwargs.get('watch'):
+            return api_func(*args, **kwargs)
+        response = api_func(*args, _preload_content=False, **kwargs)
+        return json.loads(response.data)
+    return call
+
+
+def list_pages(list_func: Callable[..., Any], page_size: int = 0, **kwargs) -> Iterator[Any]:
+    """
+    Yield successive list responses using ``limit``/``continue`` chunking.
+
+    Args:
+        list_func: API list function
+        page_size: Objects per page; 0 fetches everything in one response
+        **kwargs: Extra arguments passed to every list call
+
+    Yields:
+        Raw list responses (dict or kubernetes model), one per page
+    """
+    token = None
+    while True:
+        page_kwargs = dict(kwargs)
+        if page_size:
+            page_kwargs['limit'] = page_size
+        if token:
+            page_kwargs['_continue'] = token
+        result = list_func(**page_kwargs)
+        token = _continue_token(result)
+        yield result
+        # Release the page before the next one is fetched
+        del result
+        if not page_size or not token:
+            break
+
+
+def iter_items(list_func: Callable[..., Any], page_size: int = 0, **kwargs) -> Iterator[Any]:
+    """Yield individual objects from a paginated list call."""
+    for page in list_pages(list_func, page_size, **kwargs):
+        yield from (get_field(page, 'items') or [])
+
+
+class ResourceInformer:
+    """
+    Keeps an in-memory copy of one resource type in sync with the API server.
+
+    The informer lists the resource once, then follows a watch starting at the
+    list's resourceVersion. Objects are stored by ``namespace/name``; optional
+    secondary indexes map an index value to the set of keys that produce it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        list_func: Callable[..., Any],
+        watch_timeout: int = 300,
+        page_size: int = 0,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Initialize the informer.
+
+        Args:
+            name: Resource name used in log messages
+            list_func: API list function accepting ``resource_version``,
+                ``watch`` and ``timeout_seconds`` keyword arguments
+            watch_timeout: Server-side timeout for a single watch request
+            page_size: Objects per page for the initial list (0 = unpaged)
+            transform: Applied to every listed or watched object before it
+                is stored, e.g. to drop fields no reader uses
+        """
+        self.name = name
+        self._list_func = list_func
+        self._watch_timeout = watch_timeout
+        self._page_size = page_size
+        self._transform = transform or (lambda obj: obj)
+        self._lock = threading.RLock()
+        self._store: Dict[str, Any] = {}
+        self._indexers: Dict[str, Callable[[Any], Optional[str]]] = {}
+        self._indices: Dict[str, Dict[str, set]] = {}
+        self._resource_version: Optional[str] = None
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._watch: Optional[watch.Watch] = None
+        self._handlers: List[Callable[[str, Any], None]] = []
+
+    def add_index(self, index_name: str, index_func: Callable[[Any], IndexValue]):
+        """
+        Register a secondary index; ``index_func`` returns a value, a list of
+        values (multi-valued index, e.g. one per label) or None.
+        """
+        with self._lock:
+            self._indexers[index_name] = index_func
+            self._indices[index_name] = {}
+            for key, obj in self._store.items():
+                self._index_add(index_name, key, obj)
+
+    def add_handler(self, handler: Callable[[str, Any], None]):
+        """
+        Register a callback invoked as ``handler(event_type, obj)`` after the
+        store has been updated. A relist reports every listed object as
+        ``SYNC`` and every object that disappeared since the last list or
+        watch event as ``DELETED``.
+        """
+        with self._lock:
+            self._handlers.append(handler)
+
+    def _notify(self, event_type: str, obj: Any):
+        for handler in list(self._handlers):
+            try:
+                handler(event_type, obj)
+            except Exception as e:
+                logger.warning(f"Informer {self.name}: event handler failed: {e}")
+
+    def start(self):
+        """Start the list/watch loop in a daemon thread."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=f"informer-{self.name}", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the list/watch loop."""
+        self._stop.set()
+        if self._watch:
+            self._watch.stop()
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        """Block until the initial list has been loaded."""
+        return self._synced.wait(timeout)
+
+    @property
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    @property
+    def resource_version(self) -> Optional[str]:
+        return self._resource_version
+
+    def get(self, namespace: str, name: str) -> Optional[Any]:
+        """Return the cached object for ``namespace/name`` or None."""
+        return self._store.get(f"{namespace}/{name}")
+
+    def get_by_key(self, key: str) -> Optional[Any]:
+        return self._store.get(key)
+
+    def mapping(self, index_name: Optional[str] = None) -> '_StoreView':
+        """Return a read-only ``.get(key)`` view over the store or an index."""
+        return _StoreView(self, index_name)
+
+    def list(self) -> List[Any]:
+        """Return a point-in-time list of all cached objects."""
+        with self._lock:
+            return list(self._store.values())
+
+    def by_index(self, index_name: str, value: str) -> List[Any]:
+        """Return cached objects whose index value equals ``value``."""
+        with self._lock:
+            keys = self._indices.get(index_name, {}).get(value, ())
+            return [self._store[k] for k in keys if k in self._store]
+
+    def index_keys(self, index_name: str, value: str) -> Set[str]:
+        """Return the store keys whose index value equals ``value``."""
+        with self._lock:
+            return set(self._indices.get(index_name, {}).get(value, ()))
+
+    def keys(self) -> Set[str]:
+        """Return a point-in-time set of all store keys."""
+        with self._lock:
+            return set(self._store)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    # Store maintenance
+
+    def _index_add(self, index_name: str, key: str, obj: Any):
+        for value in _index_values(self._indexers[index_name], obj):
+            self._indices[index_name].setdefault(value, set()).add(key)
+
+    def _index_remove(self, index_name: str, key: str, obj: Any):
+        for value in _index_values(self._indexers[index_name], obj):
+            keys = self._indices[index_name].get(value)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._indices[index_name][value]
+
+    def _upsert(self, obj: Any):
+        key = object_key(obj)
+        with self._lock:
+            old = self._store.get(key)
+            for index_name in self._indexers:
+                if old is not None:
+                    self._index_remove(index_name, key, old)
+                self._index_add(index_name, key, obj)
+            self._store[key] = obj
+
+    def _delete(self, obj: Any):
+        key = object_key(obj)
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None:
+                for index_name in self._indexers:
+                    self._index_remove(index_name, key, old)
+
+    def _replace(self, store: Dict[str, Any], resource_version: Optional[str]) -> List[Any]:
+        """Swap in a freshly listed store; returns the objects no longer present."""
+        with self._lock:
+            removed = [obj for key, obj in self._store.items() if key not in store]
+            indices = {name: {} for name in self._indexers}
+            for key, obj in store.items():
+                for index_name, index_func in self._indexers.items():
+                    for value in _index_values(index_func, obj):
+                        indices[index_name].setdefault(value, set()).add(key)
+            self._store = store
+            self._indices = indices
+            self._resource_version = resource_version
+        return removed
+
+    # List/watch loop
+
+    def _list(self):
+        # Build the new store aside, page by page, so readers never observe a
+        # half-filled one and only one raw page is held at a time
+        store: Dict[str, Any] = {}
+        resource_version = None
+        for page in list_pages(self._list_func, self._page_size):
+            for obj in get_field(page, 'items') or []:
+                store[object_key(obj)] = self._transform(obj)
+            resource_version = get_field(page, 'metadata', 'resourceVersion')
+            # Drop the raw page before the next one is fetched
+            del page
+        removed = self._replace(store, resource_version)
+        # Deletions that happened while the watch was down get no event
+        for obj in removed:
+            self._notify('DELETED', obj)
+        for obj in store.values():
+            self._notify('SYNC', obj)
+        logger.info(f"Informer {self.name}: listed {len(store)} objects at resourceVersion {resource_version}")
+
+    def _watch_once(self):
+        self._watch = watch.Watch()
+        for event in self._watch.stream(
+            self._list_func,
+            resource_version=self._resource_version,
+            timeout_seconds=self._watch_timeout,
+        ):
+            if self._stop.is_set():
+                break
+            event_type = event.get('type')
+            obj = event.get('object')
+            if event_type in ('ADDED', 'MODIFIED', 'DELETED'):
+                obj = self._transform(obj)
+            if event_type in ('ADDED', 'MODIFIED'):
+                self._upsert(obj)
+                self._notify(event_type, obj)
+            elif event_type == 'DELETED':
+                self._delete(obj)
+                self._notify(event_type, obj)
+            version = get_field(obj, 'metadata', 'resourceVersion')
+            if version:
+                self._resource_version = version
+
+    def _run(self):
+        backoff = 1.0
+        need_list = True
+        while not self._stop.is_set():
+            try:
+                if need_list:
+                    self._list()
+                    self._synced.set()
+                    need_list = False
+                self._watch_once()
+                backoff = 1.0
+            except ApiException as e:
+                if e.status == HTTP_STATUS_GONE:
+                    logger.info(f"Informer {self.name}: resourceVersion expired, relisting")
+                    need_list = True
+                    continue
+                logger.warning(f"Informer {self.name}: API error {e.status}: {e.reason}")
+                need_list = True
+                self._stop.wait(backoff + random.uniform(0, backoff / 2))
+                backoff = min(backoff * 2, 60.0)
+            except Exception as e:
+                logger.warning(f"Informer {self.name}: watch failed: {e}")
+                self._stop.wait(backoff + random.uniform(0, backoff / 2))
+                backoff = min(backoff * 2, 60.0)
+
+
+class _StoreView:
+    """Dict-like ``get`` access used where callers expect a key mapping."""
+
+    def __init__(self, informer: Union[ResourceInformer, 'ShardedInformer'], index_name: Optional[str] = None):
+        self._informer = informer
+        self._index_name = index_name
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._index_name is None:
+            return self._informer.get_by_key(key) or default
+        matches = self._informer.by_index(self._index_name, key)
+        return matches[0] if matches else default
+
+
+class ShardedInformer:
+    """
+    One ResourceInformer per namespace behind the ResourceInformer read API.
+
+    Lookups by ``namespace/name`` go to the owning shard; lists and index
+    queries are merged across shards.
+    """
+
+    def __init__(self, name: str, shards: Dict[str, ResourceInformer]):
+        self.name = name
+        self.shards = shards
+
+    def add_index(self, index_name: str, index_func: Callable[[Any], IndexValue]):
+        for shard in self.shards.values():
+            shard.add_index(index_name, index_func)
+
+    def add_handler(self, handler: Callable[[str, Any], None]):
+        for shard in self.shards.values():
+            shard.add_handler(handler)
+
+    def start(self):
+        for shard in self.shards.values():
+            shard.start()
+
+    def stop(self):
+        for shard in self.shards.values():
+            shard.stop()
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for shard in self.shards.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not shard.wait_for_sync(remaining):
+                return False
+        return True
+
+    @property
+    def has_synced(self) -> bool:
+        return all(shard.has_synced for shard in self.shards.values())
+
+    def get(self, namespace: str, name: str) -> Optional[Any]:
+        shard = self.shards.get(namespace)
+        return shard.get(namespace, name) if shard else None
+
+    def get_by_key(self, key: str) -> Optional[Any]:
+        namespace, _, name = key.partition('/')
+        return self.get(namespace, name)
+
+    def mapping(self, index_name: Optional[str] = None) -> '_StoreView':
+        return _StoreView(self, index_name)
+
+    def list(self) -> List[Any]:
+        return [obj for shard in self.shards.values() for obj in shard.list()]
+
+    def by_index(self, index_name: str, value: str) -> List[Any]:
+        return [obj for shard in self.shards.values() for obj in shard.by_index(index_name, value)]
+
+    def index_keys(self, index_name: str, value: str) -> Set[str]:
+        return set().union(*(shard.index_keys(index_name, value) for shard in self.shards.values()))
+
+    def keys(self) -> Set[str]:
+        return set().union(*(shard.keys() for shard in self.shards.values()))
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards.values())
+
+
+class ClusterCache:
+    """
+    Shared informers for VirtualMachines, VirtualMachineInstances and Services.
+
+    Objects are stored stripped to the fields the cluster view and status
+    endpoints read (see strip_vm, strip_vmi and strip_service); full objects
+    are fetched from the API server on demand.
+
+    One instance per worker process serves the cluster view and the status
+    endpoints without issuing a LIST or GET per request. With a namespace
+    list each resource is sharded into namespaced informers, so no
+    cluster-scoped LIST or watch (or RBAC) is needed.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], tuple],
+        watch_timeout: int = 300,
+        page_size: int = 0,
+        service_label_selector: Optional[str] = None,
+        raw_services: bool = False,
+        namespaces: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the informers (not started).
+
+        Args:
+            client_factory: Returns the current (CoreV1Api, CustomObjectsApi)
+                pair; called per list/watch so rotated credentials are used
+            watch_timeout: Server-side timeout for a single watch request
+            page_size: Objects per page for the initial lists
+            service_label_selector: Optional label selector for Services
+            raw_services: Keep Services as plain dicts instead of
+                kubernetes models (see ``raw_json``)
+            namespaces: Watch only these namespaces, one informer shard per
+                namespace; None or empty watches the whole cluster
+        """
+        def custom_lister(plural, namespace):
+            def list_func(**kwargs):
+                _, custom_api = client_factory()
+                if namespace:
+                    return custom_api.list_namespaced_custom_object(
+                        KUBEVIRT_API_GROUP, KUBEVIRT_API_VERSION, namespace, plural, **kwargs
+                    )
+                return custom_api.list_cluster_custom_object(
+                    KUBEVIRT_API_GROUP, KUBEVIRT_API_VERSION, plural, **kwargs
+                )
+            # Watch.stream inspects the docstring to pick the watch argument
+            list_func.__doc__ = CustomObjectsApi.list_cluster_custom_object.__doc__
+            return list_func
+
+        def service_lister(namespace):
+            def list_func(**kwargs):
+                core_v1, _ = client_factory()
+                if service_label_selector:
+                    kwargs['label_selector'] = service_label_selector
+                if namespace:
+                    call = functools.partial(core_v1.list_namespaced_service, namespace)
+                else:
+                    call = core_v1.list_service_for_all_namespaces
+                if raw_services:
+                    call = raw_json(call)
+                return call(**kwargs)
+            if not raw_services:
+                list_func.__doc__ = CoreV1Api.list_service_for_all_namespaces.__doc__
+            return list_func
+
+        def informer(name, lister, transform):
+            if not namespaces:
+                return ResourceInformer(name, lister(None), watch_timeout, page_size, transform)
+            return ShardedInformer(name, {
+                namespace: ResourceInformer(
+                    f"{name}/{namespace}", lister(namespace), watch_timeout, page_size, transform
+                )
+                for namespace in namespaces
+            })
+
+        self.namespaces = list(namespaces or [])
+        self.vms = informer(
+            RESOURCE_VIRTUAL_MACHINES,
+            functools.partial(custom_lister, RESOURCE_VIRTUAL_MACHINES),
+            strip_vm
+        )
+        self.vmis = informer(
+            RESOURCE_VIRTUAL_MACHINE_INSTANCES,
+            functools.partial(custom_lister, RESOURCE_VIRTUAL_MACHINE_INSTANCES),
+            strip_vmi
+        )
+        self.services = informer('services', service_lister, strip_service)
+        self.services.add_index('vm', service_vm_key)
+        # Secondary indexes for the cluster view's server-side filters
+        self.vms.add_index('phase', vm_phase_key)
+        self.vms.add_index('label', label_values)
+        self.vmis.add_index('node', vmi_node_key)
+
+    @property
+    def informers(self) -> List[Union[ResourceInformer, 'ShardedInformer']]:
+        return [self.vms, self.vmis, self.services]
+
+    def start(self):
+        for informer in self.informers:
+            informer.start()
+
+    def stop(self):
+        for informer in self.informers:
+            informer.stop()
+
+    def wait_for_sync(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for all informers to finish listing."""
+        deadline = time.monotonic() + timeout
+        for informer in self.informers:
+            if not informer.wait_for_sync(max(0.0, deadline - time.monotonic())):
+                return False
+        return True
+
+    @property
+    def has_synced(self) -> bool:
+        return all(informer.has_synced for informer in self.informers)
+
+    def covers(self, namespace: str) -> bool:
+        """Whether objects in namespace are watched (always, without a namespace list)."""
+        return not self.namespaces or namespace in self.namespaces
+
+    def service_for_vm(self, namespace: str, vm_name: str) -> Optional[Any]:
+        return self.services.mapping('vm').get(f"{namespace}/{vm_name}")
@@ -1,69 +1,688 @@
-from kubernetes import client, config
+from kubernetes import client, config, watch
+from kubernetes.client.rest import ApiException
+from kubernetes.config.incluster_config import SERVICE_TOKEN_FILENAME
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import functools
 import logging
+import os
+import threading
+import time
+from config import Config
+from app.constants import (
+    ANNOTATION_EXTERNAL_DNS_HOSTNAME,
+    KUBEVIRT_API_GROUP,
+    KUBEVIRT_API_VERSION,
+    RESOURCE_VIRTUAL_MACHINES,
+    RESOURCE_VIRTUAL_MACHINE_INSTANCES,
+)
+from app.k8s_cache import (
+    HTTP_STATUS_GONE,
+    ClusterCache,
+    get_field,
+    iter_items,
+    labels_match,
+    list_pages,
+    parse_label_selector,
+    raw_json,
+    service_vm_key,
+)
+from app.quantity import ResourceTable, try_parse_quantity
+from app.vm_summary import (
+    ANNOTATION_METALLB_ALLOCATED_POOL,
+    PortSummary,
+    ServiceSummary,
+    VMSummary,
+)
 
 logger = logging.getLogger(__name__)
 
-def get_kubernetes_client():
+_cluster_cache = None
+_cluster_cache_lock = threading.Lock()
+
+# Bounded pool for fanning out the cluster-wide LIST calls
+_list_executor = ThreadPoolExecutor(
+    max_workers=Config.K8S_LIST_WORKERS,
+    thread_name_prefix='k8s-list'
+)
+
+# Bounded pool for bulk power operations
+_power_executor = ThreadPoolExecutor(
+    max_workers=Config.K8S_POWER_WORKERS,
+    thread_name_prefix='k8s-power'
+)
+
+# Last legacy Service full scan: the unmatched VM keys it covered, the
+# Services it found and when. The scan reruns when a VM outside that set
+# lacks a labelled Service, or once it is older than K8S_WATCH_TIMEOUT (the
+# informers' relist horizon) so added and removed Services show up, not on
+# every listing
+_legacy_services = {'vm_keys': frozenset(), 'mapping': {}, 'scanned_at': 0.0}
+_legacy_services_lock = threading.Lock()
+
+# Pseudo-phase for a VM without a running VMI (absent, Succeeded or Failed)
+PHASE_STOPPED = 'Stopped'
+
+# Observed VMI phase transitions: "From->To" -> count/total/max milliseconds
+_transition_stats = {}
+_transition_stats_lock = threading.Lock()
+
+class KubernetesClientManager:
     """
-    Initialize and return a Kubernetes client
-    Tries to load config from default locations or in-cluster config
+    Process-wide Kubernetes API client pool.
+
+    Loads the kubeconfig or in-cluster configuration once and shares a single
+    ApiClient (and so a single urllib3 connection pool) across all requests.
+    The credential file is re-checked periodically and the client is rebuilt
+    when it changes, e.g. when the projected service account token rotates.
     """
-    try:
-        # Try to load from kubeconfig file
-        config.load_kube_config()
-    except config.ConfigException:
+
+    def __init__(self, pool_size, credential_check_interval=30):
+        """
+        Initialize the client manager (configuration is loaded lazily).
+
+        Args:
+            pool_size: Maximum number of pooled connections to the API server
+            credential_check_interval: Seconds between credential file checks
+        """
+        self.pool_size = pool_size
+        self.credential_check_interval = credential_check_interval
+        self._lock = threading.Lock()
+        self._api_client = None
+        self._core_v1 = None
+        self._custom_api = None
+        self._credential_file = None
+        self._credential_mtime = None
+        self._last_check = 0.0
+        self._stats = {'requests': 0, 'hits': 0, 'reloads': 0}
+
+    def _credential_stat(self):
         try:
-            # If not found, try in-cluster config
-            config.load_incluster_config()
+            return os.stat(self._credential_file).st_mtime if self._credential_file else None
+        except OSError:
+            return None
+
+    def _load(self):
+        configuration = client.Configuration()
+        try:
+            # Try to load from kubeconfig file
+            config.load_kube_config(client_configuration=configuration)
+            self._credential_file = os.path.expanduser(
+                os.environ.get('KUBECONFIG', config.KUBE_CONFIG_DEFAULT_LOCATION).split(os.pathsep)[0]
+            )
         except config.ConfigException:
-            logger.error("Could not load Kubernetes configuration")
-            raise
+            try:
+                # If not found, try in-cluster config
+                config.load_incluster_config(client_configuration=configuration)
+                self._credential_file = SERVICE_TOKEN_FILENAME
+            except config.ConfigException:
+                logger.error("Could not load Kubernetes configuration")
+                raise
+
+        configuration.connection_pool_maxsize = self.pool_size
+        previous = self._api_client
+        self._api_client = client.ApiClient(configuration)
+        self._core_v1 = client.CoreV1Api(self._api_client)
+        self._custom_api = client.CustomObjectsApi(self._api_client)
+        self._credential_mtime = self._credential_stat()
+        self._stats['reloads'] += 1
+        logger.info(f"Loaded Kubernetes configuration for {configuration.host} (pool size {self.pool_size})")
+        if previous is not None:
+            self._close(previous)
+
+    @staticmethod
+    def _close(api_client):
+        """Release a replaced ApiClient's thread pool and idle connections."""
+        try:
+            api_client.close()
+            # close() leaves the urllib3 pools open; connections still in use
+            # by a running request are closed when they are returned
+            api_client.rest_client.pool_manager.clear()
+        except Exception as e:
+            logger.warning(f"Error closing the previous Kubernetes client: {e}")
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if self._api_client is None:
+            self._load()
+            self._last_check = now
+            return False
+        if now - self._last_check >= self.credential_check_interval:
+            self._last_check = now
+            if self._credential_stat() != self._credential_mtime:
+                logger.info("Kubernetes credentials changed, reloading client")
+                self._load()
+                return False
+        return True
+
+    def get_api_client(self):
+        """Return the shared ApiClient, reloading it if credentials rotated."""
+        with self._lock:
+            self._stats['requests'] += 1
+            if self._ensure_current():
+                self._stats['hits'] += 1
+            return self._api_client
+
+    def get_clients(self):
+        """Return the shared (CoreV1Api, CustomObjectsApi) pair."""
+        with self._lock:
+            self._stats['requests'] += 1
+            if self._ensure_current():
+                self._stats['hits'] += 1
+            return self._core_v1, self._custom_api
+
+    def stats(self):
+        """
+        Report client reuse and urllib3 connection reuse.
+        ``connections_reused`` is the number of HTTP requests that did not
+        need a new TCP/TLS connection.
+        """
+        with self._lock:
+            pools = []
+            if self._api_client is not None:
+                pool_manager = self._api_client.rest_client.pool_manager
+                for key in list(pool_manager.pools.keys()):
+                    pool = pool_manager.pools.get(key)
+                    if pool is None:
+                        continue
+                    pools.append({
+                        'host': f"{pool.scheme}://{pool.host}:{pool.port}",
+                        'maxsize': pool.pool.maxsize if pool.pool else self.pool_size,
+                        'connections_opened': pool.num_connections,
+                        'requests': pool.num_requests,
+                        'connections_reused': max(pool.num_requests - pool.num_connections, 0),
+                    })
+            return {
+                'pool_size': self.pool_size,
+                'client_requests': self._stats['requests'],
+                'client_pool_hits': self._stats['hits'],
+                'client_reloads': self._stats['reloads'],
+                'connection_pools': pools,
+            }
+
+
+_client_manager = KubernetesClientManager(
+    Config.K8S_CONNECTION_POOL_SIZE,
+    Config.K8S_CREDENTIAL_CHECK_INTERVAL
+)
+
+def get_client_manager():
+    """Return the process-wide Kubernetes client manager."""
+    return _client_manager
+
+def get_kubernetes_client():
+    """
+    Return the shared Kubernetes clients
+    Loads config from default locations or in-cluster config on first use
+    """
+    return _client_manager.get_clients()
+
+def get_api_client():
+    """Return the shared Kubernetes ApiClient (used by the WebSocket proxies)"""
+    return _client_manager.get_api_client()
+
+def get_cluster_cache():
+    """
+    Return the process-wide informer cache once it has synced.
+    Starts the informers on first use and waits up to K8S_CACHE_SYNC_TIMEOUT
+    for the initial list; later calls only check, without blocking. Returns
+    None when the cache is disabled or not synced, in which case callers
+    should fall back to direct API calls.
+    """
+    global _cluster_cache
+    if not Config.K8S_CACHE_ENABLED:
+        return None
+    started = False
+    with _cluster_cache_lock:
+        if _cluster_cache is None:
+            # Without the legacy fallback only portal-labelled Services
+            # need to be watched
+            service_selector = None if Config.SERVICE_LEGACY_FALLBACK else Config.SERVICE_LABEL_SELECTOR
+            _cluster_cache = ClusterCache(
+                get_kubernetes_client,
+                Config.K8S_WATCH_TIMEOUT,
+                Config.K8S_LIST_PAGE_SIZE,
+                service_selector,
+                Config.K8S_RAW_SERVICES,
+                Config.VM_NAMESPACES
+            )
+            _cluster_cache.start()
+            started = True
+            logger.info("Started Kubernetes informer cache")
+    # Only the starting call blocks: if the informers cannot sync (no
+    # list/watch RBAC, API down), later requests fall back immediately
+    # instead of stalling for the sync timeout each time
+    if started:
+        if _cluster_cache.wait_for_sync(Config.K8S_CACHE_SYNC_TIMEOUT):
+            return _cluster_cache
+        logger.warning("Informer cache not synced yet, falling back to direct API calls")
+        return None
+    return _cluster_cache if _cluster_cache.has_synced else None
+
+def get_kubevirt_object(plural, namespace, name, full=False):
+    """
+    Get a KubeVirt object (VM or VMI) from the informer cache, or from the
+    API server when the cache is unavailable or does not watch namespace
+    (outside VM_NAMESPACES). Cached objects are stripped to the status
+    fields (see k8s_cache.strip_vm); full=True always reads the complete
+    object from the API server. Raises ApiException (404) when the object
+    does not exist.
+    """
+    cache = None if full else get_cluster_cache()
+    if cache is not None and cache.covers(namespace):
+        informer = cache.vms if plural == RESOURCE_VIRTUAL_MACHINES else cache.vmis
+        obj = informer.get(namespace, name)
+        if obj is None:
+            raise ApiException(status=404, reason=f"{plural} {namespace}/{name} not found")
+        return obj
+
+    _, custom_api = get_kubernetes_client()
+    return custom_api.get_namespaced_custom_object(
+        group=KUBEVIRT_API_GROUP,
+        version=KUBEVIRT_API_VERSION,
+        namespace=namespace,
+        plural=plural,
+        name=name
+    )
+
+def get_service_manifest(namespace, name):
+    """
+    Read a Service as a plain dict with canonical camelCase keys. With
+    K8S_RAW_SERVICES the response JSON is decoded directly; otherwise it goes
+    through the kubernetes models and is serialized back.
+    """
+    core_v1, _ = get_kubernetes_client()
+    if Config.K8S_RAW_SERVICES:
+        return raw_json(core_v1.read_namespaced_service)(name=name, namespace=namespace)
+    service = core_v1.read_namespaced_service(name=name, namespace=namespace)
+    return core_v1.api_client.sanitize_for_serialization(service)
+
+def get_vm_status_objects(vm_keys):
+    """
+    Fetch VMs and VMIs for many (namespace, name) keys at once.
+    Returns {(namespace, name): (vm or None, vmi or None)}, read from the
+    informer cache or, for namespaces it does not watch, from one VM and one
+    VMI LIST per namespace.
+    """
+    cached = {}
+    cache = get_cluster_cache()
+    if cache is not None:
+        cached = {
+            (namespace, name): (cache.vms.get(namespace, name), cache.vmis.get(namespace, name))
+            for namespace, name in vm_keys if cache.covers(namespace)
+        }
+        vm_keys = [key for key in vm_keys if key not in cached]
+        if not vm_keys:
+            return cached
+
+    _, custom_api = get_kubernetes_client()
+    wanted = set(vm_keys)
+    found = {key: [None, None] for key in wanted}
+    plurals = (RESOURCE_VIRTUAL_MACHINES, RESOURCE_VIRTUAL_MACHINE_INSTANCES)
+
+    def list_objects(namespace, plural):
+        return list(iter_items(_custom_lister(custom_api, plural, namespace), Config.K8S_LIST_PAGE_SIZE))
+
+    # One LIST per namespace and plural, issued concurrently
+    futures = {
+        (namespace, index): _list_executor.submit(list_objects, namespace, plural)
+        for namespace in {namespace for namespace, _ in wanted}
+        for index, plural in enumerate(plurals)
+    }
+    for (namespace, index), future in futures.items():
+        for obj in future.result():
+            key = (namespace, obj['metadata']['name'])
+            if key in found:
+                found[key][index] = obj
+    cached.update((key, tuple(value)) for key, value in found.items())
+    return cached
+
+def build_vmi_status(vm_name, namespace, vm, vmi):
+    """Build the status payload used by the UI from a VM and its VMI (either may be None)"""
+    # VM spec.running
+    spec_running = bool(vm.get('spec', {}).get('running')) if vm else None
+
+    # VMI phase and details
+    vmi_phase = None
+    node = None
+    ip_addresses = []
+    ready = None
+    primary_ip = None
+    if vmi:
+        vmi_phase = vmi.get('status', {}).get('phase')
+        node = vmi.get('status', {}).get('nodeName')
+        interfaces = vmi.get('status', {}).get('interfaces', [])
+        # Collect IP + IPs fields from interfaces
+        for itf in interfaces:
+            if 'ip' in itf and itf['ip']:
+                ip_addresses.append(itf['ip'])
+                if not primary_ip:
+                    primary_ip = itf['ip']
+            if 'ips' in itf and isinstance(itf['ips'], list):
+                ip_addresses.extend([ip for ip in itf['ips'] if ip])
+        # Ready condition
+        conditions = vmi.get('status', {}).get('conditions', [])
+        if isinstance(conditions, list):
+            for cond in conditions:
+                if cond.get('type') == 'Ready':
+                    ready = (cond.get('status') == 'True')
+                    break
+
+    return {
+        'vm_name': vm_name,
+        'namespace': namespace,
+        'spec_running': spec_running,
+        'vmi_phase': vmi_phase,
+        'node': node,
+        'ip_addresses': ip_addresses,
+        'primary_ip': primary_ip,
+        'ready': ready,
+    }
+
+def set_vm_running(namespace, name, running):
+    """
+    Start or stop a VM with a JSON merge patch that only touches
+    spec.running, so no prior GET is needed and concurrent controller
+    updates to the rest of the object are not overwritten
+    """
+    _, custom_api = get_kubernetes_client()
+    # patch_namespaced_custom_object sends application/merge-patch+json
+    custom_api.patch_namespaced_custom_object(
+        group=KUBEVIRT_API_GROUP,
+        version=KUBEVIRT_API_VERSION,
+        namespace=namespace,
+        plural=RESOURCE_VIRTUAL_MACHINES,
+        name=name,
+        body={'spec': {'running': running}}
+    )
+
+def find_vm_keys(label_selector, namespace=None):
+    """
+    Return (namespace, name) keys of the VMs matching label_selector, in the
+    given namespace or the configured namespaces (all when VM_NAMESPACES is empty)
+    """
+    _, custom_api = get_kubernetes_client()
+    scopes = [namespace] if namespace else _list_scopes()
+
+    def list_keys(scope):
+        vms = iter_items(_custom_lister(custom_api, RESOURCE_VIRTUAL_MACHINES, scope),
+                         Config.K8S_LIST_PAGE_SIZE, label_selector=label_selector)
+        return [(vm['metadata']['namespace'], vm['metadata']['name']) for vm in vms]
+
+    return [key for keys in _list_executor.map(list_keys, scopes) for key in keys]
+
+def power_vms(vm_keys, action):
+    """
+    Start or stop many VMs concurrently on the bounded power pool.
+    Returns one result dict per distinct (namespace, name) key, in order.
+    """
+    running = action == 'start'
+    futures = {
+        key: _power_executor.submit(set_vm_running, key[0], key[1], running)
+        for key in dict.fromkeys(vm_keys)
+    }
+
+    results = []
+    for (namespace, name), future in futures.items():
+        result = {'name': name, 'namespace': namespace, 'success': True}
+        try:
+            future.result()
+        except ApiException as e:
+            result.update(success=False, status=e.status, error=e.reason)
+        except Exception as e:
+            result.update(success=False, error=str(e))
+        if not result['success']:
+            logger.error(f"Error {action}ing VM {namespace}/{name}: {result['error']}")
+        results.append(result)
+    return results
+
+def _observed_phase(vmi):
+    """VMI phase, or PHASE_STOPPED when the VMI is gone or has shut down"""
+    if not vmi:
+        return PHASE_STOPPED
+    phase = vmi.get('status', {}).get('phase')
+    if phase in ('Succeeded', 'Failed'):
+        return PHASE_STOPPED
+    return phase or 'Pending'
+
+def _record_transition(from_phase, to_phase, duration_ms):
+    key = f"{from_phase}->{to_phase}"
+    with _transition_stats_lock:
+        stats = _transition_stats.setdefault(key, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        stats['count'] += 1
+        stats['total_ms'] += duration_ms
+        stats['max_ms'] = max(stats['max_ms'], duration_ms)
+
+def get_transition_stats():
+    """Count, average and maximum duration of the VMI phase transitions seen by waiters"""
+    with _transition_stats_lock:
+        return {
+            key: {
+                'count': stats['count'],
+                'avg_ms': round(stats['total_ms'] / stats['count'], 1),
+                'max_ms': round(stats['max_ms'], 1),
+            }
+            for key, stats in _transition_stats.items()
+        }
+
+def wait_for_vmi_phase(namespace, name, phase, timeout, require_ready=False, since=None):
+    """
+    Block until the VMI reaches phase (PHASE_STOPPED for a stopped VM, and
+    additionally Ready when require_ready is set) or timeout seconds pass.
+    With since (the phase the caller last saw) it also returns as soon as
+    the observed phase differs from it, so callers can show each step.
 
-    return client.CoreV1Api(), client.CustomObjectsApi()
+    Uses one LIST and a watch on the single VMI (field selector on
+    metadata.name) from the listed resourceVersion, so no polling is needed.
+    Returns the build_vmi_status payload plus whether the phase was reached,
+    the elapsed time and each phase transition observed on the way.
+    """
+    _, custom_api = get_kubernetes_client()
+
+    def list_func(**kwargs):
+        return custom_api.list_namespaced_custom_object(
+            KUBEVIRT_API_GROUP, KUBEVIRT_API_VERSION, namespace,
+            RESOURCE_VIRTUAL_MACHINE_INSTANCES, **kwargs
+        )
+    # Watch.stream inspects the docstring to pick the watch argument
+    list_func.__doc__ = client.CustomObjectsApi.list_namespaced_custom_object.__doc__
+    field_selector = f"metadata.name={name}"
+
+    start = time.monotonic()
+    deadline = start + timeout
+    transitions = []
+    state = {'vmi': None, 'phase': None, 'since': start}
+
+    def observe(vmi):
+        """Track phase changes; returns True once the target state is reached"""
+        now = time.monotonic()
+        current = _observed_phase(vmi)
+        if state['phase'] is not None and current != state['phase']:
+            duration_ms = (now - state['since']) * 1000
+            transitions.append({
+                'from': state['phase'],
+                'to': current,
+                'duration_ms': round(duration_ms, 1),
+                'elapsed_ms': round((now - start) * 1000, 1),
+            })
+            _record_transition(state['phase'], current, duration_ms)
+            state['since'] = now
+        state['vmi'] = vmi
+        state['phase'] = current
+        if current != phase:
+            return False
+        return not require_ready or build_vmi_status(name, namespace, None, vmi)['ready'] is True
+
+    def done():
+        return reached or (since is not None and state['phase'] not in (None, since))
+
+    reached = False
+    resource_version = None
+    while not done() and time.monotonic() < deadline:
+        remaining = deadline - time.monotonic()
+        if resource_version is None:
+            result = list_func(field_selector=field_selector, _request_timeout=(remaining, remaining))
+            items = result.get('items') or []
+            resource_version = result['metadata']['resourceVersion']
+            reached = observe(items[0] if items else None)
+            continue
+        if remaining < 1:
+            # Watch timeouts are whole seconds; don't overrun the deadline
+            break
+
+        stream = watch.Watch()
+        try:
+            for event in stream.stream(
+                list_func,
+                field_selector=field_selector,
+                resource_version=resource_version,
+                timeout_seconds=int(remaining),
+                _request_timeout=(remaining, remaining + 5),
+            ):
+                obj = event['object']
+                resource_version = obj.get('metadata', {}).get('resourceVersion') or resource_version
+                reached = observe(None if event['type'] == 'DELETED' else obj)
+                if done() or time.monotonic() >= deadline:
+                    stream.stop()
+        except ApiException as e:
+            if e.status != HTTP_STATUS_GONE:
+                raise
+            # resourceVersion expired: relist and watch again
+            resource_version = None
+
+    payload = build_vmi_status(name, namespace, None, state['vmi'])
+    payload.update({
+        'target_phase': phase,
+        'reached': reached,
+        'phase': state['phase'],
+        'elapsed_ms': round((time.monotonic() - start) * 1000, 1),
+        'transitions': transitions,
+    })
+    return payload
 
 def list_running_vms():
     """
-    List all VirtualMachine resources in the cluster
+    List all VirtualMachine resources in the configured namespaces (the
+    whole cluster when VM_NAMESPACES is empty)
     """
     try:
+        cache = get_cluster_cache()
+        if cache is not None:
+            return _process_vms(
+                cache.vms.list(),
+                cache.vmis.mapping(),
+                cache.services.mapping('vm')
+            )
+
         core_v1, custom_api = get_kubernetes_client()
+        page_size = Config.K8S_LIST_PAGE_SIZE
+        timeout = Config.K8S_LIST_TIMEOUT
+        # kubernetes-client only honours float timeouts as a (connect, read) pair
+        request_timeout = (timeout, timeout)
+        scopes = _list_scopes()
 
-        # Use CustomObjectsApi to fetch VirtualMachines and VMIs
-        group = 'kubevirt.io'
-        version = 'v1'
-        
-        # Fetch VMs across all namespaces
-        vms_list = custom_api.list_cluster_custom_object(group, version, 'virtualmachines')
-        
-        # Fetch VMIs across all namespaces
-        vmis_list = custom_api.list_cluster_custom_object(group, version, 'virtualmachineinstances')
-
-        # Fetch all services across all namespaces
-        services = core_v1.list_service_for_all_namespaces()
-        
-        # Create a mapping of VM name to service details
-        service_mapping = {}
-        for svc in services.items:
-            if svc.spec.selector and 'kubevirt.io/vm' in svc.spec.selector:
-                vm_name = svc.spec.selector['kubevirt.io/vm']
-                namespace = svc.metadata.namespace
-                service_mapping[f"{namespace}/{vm_name}"] = svc
-        
-        # Create a mapping of VM name to VMI details
-        vmi_mapping = {}
-        for vmi in vmis_list.get('items', []):
-            name = vmi['metadata']['name']
-            namespace = vmi['metadata']['namespace']
-            vmi_mapping[f"{namespace}/{name}"] = vmi
-
-        processed_vms = []
-        for vm in vms_list.get('items', []):
-            try:
-                vm_details = process_vm_details(vm, vmi_mapping, service_mapping)
-                processed_vms.append(vm_details)
-            except Exception as e:
-                logger.warning(f"Could not process VM {vm.get('metadata', {}).get('name')}: {str(e)}")
+        def build_service_mapping(label_selector, namespace):
+            # Fetch portal-labelled services page by page, keeping only the
+            # ones that select a VM
+            service_mapping = {}
+            services = _iter_services(core_v1, label_selector, page_size, request_timeout, namespace)
+            for svc in services:
+                vm_key = service_vm_key(svc)
+                if vm_key:
+                    service_mapping[vm_key] = svc
+            logger.info(f"Service lookup in {namespace or 'all namespaces'} (selector "
+                        f"{label_selector or 'none'}) transferred {services.transferred} Services, "
+                        f"{len(service_mapping)} matched VMs")
+            return service_mapping
+
+        def build_vmi_mapping(namespace):
+            # Create a mapping of VM name to VMI status; the VMI spec (a full
+            # copy of the VM template) is not needed and is dropped page by page
+            vmi_mapping = {}
+            vmis = iter_items(_custom_lister(custom_api, RESOURCE_VIRTUAL_MACHINE_INSTANCES, namespace),
+                              page_size, _request_timeout=request_timeout)
+            for vmi in vmis:
+                name = vmi['metadata']['name']
+                vmi_namespace = vmi['metadata']['namespace']
+                vmi_mapping[f"{vmi_namespace}/{name}"] = {'status': vmi.get('status', {})}
+            return vmi_mapping
+
+        def merged(futures):
+            mapping = {}
+            for future in futures:
+                mapping.update(future.result())
+            return mapping
+
+        # Issue the LISTs concurrently, one set per namespace: Services and
+        # VMIs in the background while the first VM page of each namespace
+        # is fetched
+        label_selector = Config.SERVICE_LABEL_SELECTOR
+        services_tasks = [
+            _StartedTask(_timed, f"services ({scope or 'all'})", build_service_mapping, label_selector, scope)
+            for scope in scopes
+        ]
+        services_futures = [_list_executor.submit(task) for task in services_tasks]
+        vmis_futures = [
+            _list_executor.submit(_timed, f"virtualmachineinstances ({scope or 'all'})",
+                                  build_vmi_mapping, scope)
+            for scope in scopes
+        ]
+        vm_pages = []
+        for scope in scopes:
+            pages = list_pages(_custom_lister(custom_api, RESOURCE_VIRTUAL_MACHINES, scope),
+                               page_size, _request_timeout=request_timeout)
+            first_page = _list_executor.submit(_timed, f"virtualmachines ({scope or 'all'}, first page)",
+                                               next, pages, None)
+            vm_pages.append((first_page, pages))
+
+        vmi_mapping = merged(vmis_futures)
+        try:
+            # Each Service LIST gets K8S_LIST_TIMEOUT from when it started
+            # running; time queued behind other LISTs does not count
+            service_mapping = {}
+            for task, future in zip(services_tasks, services_futures):
+                service_mapping.update(future.result(timeout=task.remaining(timeout)))
+            services_stale = False
+        except Exception as e:
+            # Render the VM table without service columns rather than failing
+            logger.warning(f"Service list unavailable, marking service details stale: {e}")
+            service_mapping = {}
+            services_stale = True
+
+        # Stream VMs through process_vm_details so only one page of raw VM
+        # objects per namespace is held in memory at a time
+        def iter_vms():
+            for first_page, pages in vm_pages:
+                page = first_page.result()
+                while page is not None:
+                    yield from (page.get('items') or [])
+                    page = next(pages, None)
+
+        processed_vms = _process_vms(iter_vms(), vmi_mapping, service_mapping, services_stale)
+
+        # Legacy Services created before the portal label was introduced are
+        # only found by a full scan. VMs without any Service are common, so
+        # the scan is memoized and reruns only for newly unmatched VMs or
+        # after K8S_WATCH_TIMEOUT seconds
+        unmatched = [vm for vm in processed_vms if not vm.service]
+        if label_selector and Config.SERVICE_LEGACY_FALLBACK and unmatched and not services_stale:
+            vm_keys = frozenset(f"{vm.namespace}/{vm.name}" for vm in unmatched)
+            with _legacy_services_lock:
+                fresh = time.monotonic() - _legacy_services['scanned_at'] < Config.K8S_WATCH_TIMEOUT
+                legacy_mapping = _legacy_services['mapping'] if fresh and vm_keys <= _legacy_services['vm_keys'] else None
+            if legacy_mapping is None:
+                legacy_scopes = {vm.namespace for vm in unmatched} if Config.VM_NAMESPACES else [None]
+                legacy_mapping = merged([
+                    _list_executor.submit(_timed, f"services ({scope or 'all'}, legacy full scan)",
+                                          build_service_mapping, None, scope)
+                    for scope in legacy_scopes
+                ])
+                with _legacy_services_lock:
+                    _legacy_services.update(vm_keys=vm_keys, mapping=legacy_mapping, scanned_at=time.monotonic())
+            for vm in unmatched:
+                service = legacy_mapping.get(f"{vm.namespace}/{vm.name}")
+                if service:
+                    vm.service = service_details_for(service)
 
         return processed_vms
 
@@ -71,14 +690,247 @@ def list_running_vms():
         logger.error(f"Error listing VMs: {str(e)}")
         return []
 
+# Path from a VirtualMachine to its domain spec
+DOMAIN_PATH = ('spec', 'template', 'spec', 'domain')
+
+# Sort keys accepted by query_vms; a leading '-' sorts descending
+VM_SORT_KEYS = ('name', 'namespace', 'created', 'phase', 'node', 'cpu', 'memory')
+
+def query_vms(phase=None, node=None, label_selector=None, name_prefix=None,
+              sort='name', page=1, page_size=50):
+    """
+    Filter, sort and paginate the cluster VMs.
+
+    With the informer cache the filters are evaluated against its secondary
+    indexes (VM phase and labels, VMI node) and only the requested page is
+    turned into VMSummary records; otherwise the full list_running_vms()
+    result is filtered in memory. Returns (page of VMSummary, total matches).
+    Raises ValueError for an unsupported label selector or sort key.
+    """
+    requirements = parse_label_selector(label_selector)
+    descending = sort.startswith('-')
+    sort_key = sort.lstrip('-')
+    if sort_key not in VM_SORT_KEYS:
+        raise ValueError(f"Unsupported sort key: {sort}")
+    phase = phase.lower() if phase else None
+    start = (page - 1) * page_size
+
+    cache = get_cluster_cache()
+    if cache is None:
+        vms = [
+            vm for vm in list_running_vms()
+            if (not phase or vm.status.lower() == phase)
+            and (not node or vm.node == node)
+            and (not name_prefix or vm.name.startswith(name_prefix))
+            and labels_match(vm.labels, requirements)
+        ]
+        # Ties are broken by name, then namespace, as on the cache path
+        sort_fields = {
+            'name': lambda vm: (vm.name, vm.namespace),
+            'namespace': lambda vm: (vm.namespace, vm.name),
+            'created': lambda vm: (vm.created, vm.name, vm.namespace),
+            'phase': lambda vm: (vm.status.lower(), vm.name, vm.namespace),
+            'node': lambda vm: (vm.node or '', vm.name, vm.namespace),
+            'cpu': lambda vm: (try_parse_quantity(vm.cpu_cores), vm.name, vm.namespace),
+            'memory': lambda vm: (try_parse_quantity(vm.memory), vm.name, vm.namespace),
+        }
+        vms.sort(key=sort_fields[sort_key], reverse=descending)
+        return vms[start:start + page_size], len(vms)
+
+    # Intersect index lookups; '!=' and '!exists' subtract from the result
+    keys = cache.vms.keys()
+    if phase:
+        keys &= cache.vms.index_keys('phase', phase)
+    if node:
+        keys &= cache.vmis.index_keys('node', node)
+    for key, operator, value in requirements:
+        if operator == '=':
+            keys &= cache.vms.index_keys('label', f"{key}={value}")
+        elif operator == '!=':
+            keys -= cache.vms.index_keys('label', f"{key}={value}")
+        elif operator == 'exists':
+            keys &= cache.vms.index_keys('label', key)
+        else:
+            keys -= cache.vms.index_keys('label', key)
+    if name_prefix:
+        keys = {key for key in keys if key.partition('/')[2].startswith(name_prefix)}
+
+    def field(informer, key, *path):
+        obj = informer.get_by_key(key) or {}
+        for attr in path:
+            obj = obj.get(attr) or {}
+        return obj or ''
+
+    def by_name(key):
+        namespace, _, name = key.partition('/')
+        return name, namespace
+
+    sort_fields = {
+        'name': by_name,
+        'namespace': lambda key: key,
+        'created': lambda key: (field(cache.vms, key, 'metadata', 'creationTimestamp'), *by_name(key)),
+        'phase': lambda key: (field(cache.vms, key, 'status', 'printableStatus').lower(), *by_name(key)),
+        'node': lambda key: (field(cache.vmis, key, 'status', 'nodeName'), *by_name(key)),
+        'cpu': lambda key: (try_parse_quantity(field(cache.vms, key, *DOMAIN_PATH, 'cpu', 'cores')), *by_name(key)),
+        'memory': lambda key: (
+            try_parse_quantity(field(cache.vms, key, *DOMAIN_PATH, 'resources', 'requests', 'memory')), *by_name(key)
+        ),
+    }
+    ordered = sorted(keys, key=sort_fields[sort_key], reverse=descending)
+    page_vms = [vm for vm in map(cache.vms.get_by_key, ordered[start:start + page_size]) if vm]
+    return _process_vms(page_vms, cache.vmis.mapping(), cache.services.mapping('vm')), len(ordered)
+
+def fleet_resources(vms=None):
+    """
+    Total CPU cores and memory of the cluster VMs, overall and per node,
+    namespace and tag (label "key=value"). VMs without a VMI count under no
+    node. Defaults to list_running_vms().
+    """
+    if vms is None:
+        vms = list_running_vms()
+    table = ResourceTable(
+        [vm.cpu_cores for vm in vms],
+        [vm.memory for vm in vms],
+        groups={'node': [vm.node for vm in vms], 'namespace': [vm.namespace for vm in vms]},
+        multi_groups={'tag': [vm.labels.items() for vm in vms]}
+    )
+    totals = table.totals()
+    # Label pairs are grouped as (key, value) and formatted once per distinct label
+    totals['tag'] = {f"{key}={value}": group for (key, value), group in totals['tag'].items()}
+    return totals
+
+class _CountingIterator:
+    """Iterator wrapper that counts how many objects were consumed"""
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self.transferred = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._iterator)
+        self.transferred += 1
+        return item
+
+def _list_scopes():
+    """Namespaces to list from; [None] means one cluster-wide call"""
+    return Config.VM_NAMESPACES or [None]
+
+def _iter_services(core_v1, label_selector, page_size, request_timeout, namespace=None):
+    """
+    Iterate Services matching label_selector in namespace, or in all
+    namespaces when namespace is None
+    """
+    kwargs = {'_request_timeout': request_timeout}
+    if label_selector:
+        kwargs['label_selector'] = label_selector
+
+    if namespace:
+        list_func = functools.partial(core_v1.list_namespaced_service, namespace)
+    else:
+        list_func = core_v1.list_service_for_all_namespaces
+    if Config.K8S_RAW_SERVICES:
+        # Plain dicts skip kubernetes model deserialization entirely
+        list_func = raw_json(list_func)
+
+    return _CountingIterator(iter_items(list_func, page_size, **kwargs))
+
+def _custom_lister(custom_api, plural, namespace=None):
+    """Bind a namespaced (or, without namespace, cluster-wide) KubeVirt list call for use with iter_items"""
+    def list_func(**kwargs):
+        if namespace:
+            return custom_api.list_namespaced_custom_object(
+                KUBEVIRT_API_GROUP, KUBEVIRT_API_VERSION, namespace, plural, **kwargs
+            )
+        return custom_api.list_cluster_custom_object(
+            KUBEVIRT_API_GROUP, KUBEVIRT_API_VERSION, plural, **kwargs
+        )
+    return list_func
+
+def _timed(label, func, *args):
+    """Run func and log how long the call took"""
+    start = time.monotonic()
+    try:
+        return func(*args)
+    finally:
+        logger.info(f"Listing {label} took {(time.monotonic() - start) * 1000:.0f} ms")
+
+class _StartedTask:
+    """
+    A callable for the list executor that records when it starts running, so
+    a caller's timeout can exclude the time it spent queued behind other LISTs.
+    """
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+        self.started = threading.Event()
+        self.started_at = None
+
+    def __call__(self):
+        self.started_at = time.monotonic()
+        self.started.set()
+        return self.func(*self.args)
+
+    def remaining(self, timeout):
+        """Wait until the task has started; return what is left of timeout since then."""
+        self.started.wait()
+        return max(0.0, self.started_at + timeout - time.monotonic())
+
+def _process_vms(vms, vmi_mapping, service_mapping, services_stale=False):
+    """Run process_vm_details over VMs, skipping ones that fail to parse."""
+    processed_vms = []
+    for vm in vms:
+        try:
+            vm_summary = process_vm_details(vm, vmi_mapping, service_mapping)
+            vm_summary.service_stale = services_stale
+            processed_vms.append(vm_summary)
+        except Exception as e:
+            logger.warning(f"Could not process VM {vm.get('metadata', {}).get('name')}: {str(e)}")
+    return processed_vms
+
+def service_details_for(service):
+    """
+    Extract the fields shown in the cluster view from a Service, given as a
+    kubernetes model or as a plain dict (K8S_RAW_SERVICES)
+    """
+    external_ips = []
+    for ingress in get_field(service, 'status', 'loadBalancer', 'ingress') or []:
+        ip = get_field(ingress, 'ip')
+        if ip:
+            external_ips.append(ip)
+
+    ports = tuple(
+        PortSummary(
+            name=get_field(port, 'name'),
+            port=get_field(port, 'port'),
+            target_port=get_field(port, 'targetPort'),
+            protocol=get_field(port, 'protocol')
+        )
+        for port in get_field(service, 'spec', 'ports') or []
+    )
+
+    annotations = get_field(service, 'metadata', 'annotations') or {}
+    return ServiceSummary(
+        type=get_field(service, 'spec', 'type'),
+        cluster_ip=get_field(service, 'spec', 'clusterIP'),
+        external_ips=tuple(external_ips),
+        ports=ports,
+        hostname=annotations.get(ANNOTATION_EXTERNAL_DNS_HOSTNAME),
+        address_pool=annotations.get(ANNOTATION_METALLB_ALLOCATED_POOL)
+    )
+
 def process_vm_details(vm, vmi_mapping=None, service_mapping=None):
     """
-    Extract and process details from a VirtualMachine resource and its VMI
+    Build the cluster view summary of a VirtualMachine resource and its VMI.
+    Conditions and user data are left out; see vm_detail_fields.
     """
     metadata = vm.get('metadata', {})
     spec = vm.get('spec', {})
     status = vm.get('status', {})
-    
+
     name = metadata.get('name', 'Unknown')
     namespace = metadata.get('namespace', 'default')
     vm_key = f"{namespace}/{name}"
@@ -100,81 +952,62 @@ def process_vm_details(vm, vmi_mapping=None, service_mapping=None):
     creation_time = metadata.get('creationTimestamp')
     parsed_creation_time = datetime.strptime(creation_time, "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M") if creation_time else 'N/A'
 
+    summary = VMSummary(
+        name=name,
+        namespace=namespace,
+        running=is_running,
+        status=running_status,
+        cpu_cores=cpu_cores,
+        memory=memory,
+        created=parsed_creation_time,
+        labels=metadata.get('labels') or {}
+    )
+
     # Get VMI-specific details
-    vmi_details = {}
     if vmi:
         vmi_status = vmi.get('status', {})
-        
+
         # Get node name where VMI is running
-        node_name = vmi.get('status', {}).get('nodeName', 'N/A')
-        
+        summary.node = vmi_status.get('nodeName', 'N/A')
+
         # Get IP addresses
-        interfaces = vmi_status.get('interfaces', [])
         ip_addresses = []
-        for iface in interfaces:
+        for iface in vmi_status.get('interfaces', []):
             if 'ipAddress' in iface:
                 ip_addresses.append(iface['ipAddress'])
             if 'ipAddresses' in iface:
                 ip_addresses.extend(iface['ipAddresses'])
-        
-        # Get phase and conditions
-        phase = vmi_status.get('phase', 'N/A')
+        summary.ip_addresses = tuple(ip_addresses)
+
+        # Get phase and readiness
+        summary.phase = vmi_status.get('phase', 'N/A')
         conditions = vmi_status.get('conditions', [])
         ready_condition = next((c for c in conditions if c['type'] == 'Ready'), {})
-        is_ready = ready_condition.get('status') == 'True'
-
-        vmi_details = {
-            'node': node_name,
-            'ip_addresses': ip_addresses,
-            'phase': phase,
-            'ready': is_ready,
-            'conditions': conditions
-        }
+        summary.ready = ready_condition.get('status') == 'True'
 
     # Get service details if available
-    service_details = {}
     service = service_mapping.get(vm_key) if service_mapping else None
     if service:
-        external_ips = []
-        if service.status.load_balancer.ingress:
-            for ingress in service.status.load_balancer.ingress:
-                if hasattr(ingress, 'ip'):
-                    external_ips.append(ingress.ip)
-        
-        ports = []
-        for port in service.spec.ports:
-            ports.append({
-                'name': port.name,
-                'port': port.port,
-                'protocol': port.protocol,
-                'target_port': port.target_port
-            })
+        summary.service = service_details_for(service)
 
-        service_details = {
-            'external_ips': external_ips,
-            'cluster_ip': service.spec.cluster_ip,
-            'ports': ports,
-            'type': service.spec.type,
-            'annotations': service.metadata.annotations or {}
-        }
+    return summary
+
+def vm_detail_fields(vm, vmi):
+    """
+    Heavy per-VM fields left out of the list view: the VMI conditions and the
+    cloud-init user data. Either object may be None.
+    """
+    conditions = vmi.get('status', {}).get('conditions', []) if vmi else []
 
     # Extract user_data from the VM spec
-    volumes = spec.get('template', {}).get('spec', {}).get('volumes', [])
     user_data = None
+    volumes = vm.get('spec', {}).get('template', {}).get('spec', {}).get('volumes', []) if vm else []
     for volume in volumes:
         if 'cloudInitNoCloud' in volume:
             user_data = volume['cloudInitNoCloud'].get('userData', '')
             break
 
     return {
-        'name': name,
-        'namespace': namespace,
-        'running': is_running,
-        'cpu_cores': cpu_cores,
-        'memory': memory,
-        'labels': metadata.get('labels', {}),
-        'created': parsed_creation_time,
-        'vmi': vmi_details,
-        'service': service_details,
+        'conditions': conditions,
         'user_data': user_data
     }
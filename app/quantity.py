@@ -0,0 +1,162 @@
+"""Kubernetes resource quantities and fleet resource totals.
+
+Quantities such as ``8Gi``, ``8G``, ``512Mi`` or ``500m`` are parsed once
+into canonical base units (bytes, cores) and memoized, since a fleet reuses
+a handful of distinct values. ``ResourceTable`` keeps per-VM CPU and memory
+in ``array`` columns so totals per node, namespace and tag are computed with
+C-level counting instead of per-VM nested dict updates.
+"""
+
+import math
+from array import array
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+# Suffixes from k8s.io/apimachinery/pkg/api/resource
+BINARY_SUFFIXES = {
+    'Ki': 2 ** 10, 'Mi': 2 ** 20, 'Gi': 2 ** 30,
+    'Ti': 2 ** 40, 'Pi': 2 ** 50, 'Ei': 2 ** 60,
+}
+DECIMAL_SUFFIXES = {
+    'n': Decimal('1e-9'), 'u': Decimal('1e-6'), 'm': Decimal('1e-3'), '': Decimal(1),
+    'k': Decimal('1e3'), 'M': Decimal('1e6'), 'G': Decimal('1e9'),
+    'T': Decimal('1e12'), 'P': Decimal('1e15'), 'E': Decimal('1e18'),
+}
+
+Quantity = Union[str, int, float]
+
+
+@lru_cache(maxsize=4096)
+def _parse(value: str) -> Decimal:
+    number, suffix = value, ''
+    if value[-2:] in BINARY_SUFFIXES:
+        number, suffix = value[:-2], value[-2:]
+        multiplier = Decimal(BINARY_SUFFIXES[suffix])
+    elif value[-1:] in DECIMAL_SUFFIXES and not value[-1:].isdigit():
+        number, suffix = value[:-1], value[-1:]
+        multiplier = DECIMAL_SUFFIXES[suffix]
+    else:
+        # Plain number, possibly in exponent form (1e3, 2E6)
+        multiplier = Decimal(1)
+    try:
+        parsed = Decimal(number)
+    except InvalidOperation:
+        raise ValueError(f"Invalid quantity: {value!r}") from None
+    if not number or not parsed.is_finite() or (suffix and 'e' in number.lower()):
+        raise ValueError(f"Invalid quantity: {value!r}")
+    return parsed * multiplier
+
+
+def parse_quantity(value: Quantity) -> float:
+    """
+    Convert a Kubernetes quantity to its base unit (bytes for memory and
+    storage, cores for CPU).
+
+    Raises:
+        ValueError: If value is not a valid quantity
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid quantity: {value!r}")
+    if isinstance(value, (int, float)):
+        return float(value)
+    return float(_parse(str(value).strip()))
+
+
+def try_parse_quantity(value: Optional[Quantity], default: float = 0.0) -> float:
+    """parse_quantity that returns default for missing or unparseable values ('N/A')."""
+    if value is None:
+        return default
+    try:
+        return parse_quantity(value)
+    except ValueError:
+        return default
+
+
+def whole_gigabytes(value: Quantity, binary: bool = False) -> int:
+    """
+    Size in whole gigabytes for the create/edit forms, rounded up so a round
+    trip through the form never shrinks it.
+
+    The unit must match the one the template writes back: memory is written
+    as ``<n>G`` (so ``8Gi`` edits as 9), storage as ``<n>Gi`` (binary=True,
+    so ``8Gi`` edits as 8). Fractional sizes such as ``512Mi`` round up to 1.
+    """
+    unit = BINARY_SUFFIXES['Gi'] if binary else 10 ** 9
+    return max(1, math.ceil(parse_quantity(value) / unit - 1e-9))
+
+
+def format_bytes(value: float) -> str:
+    """Render a byte count with the largest binary unit that keeps it >= 1, e.g. '12.5Gi'."""
+    for suffix in ('Ei', 'Pi', 'Ti', 'Gi', 'Mi', 'Ki'):
+        if abs(value) >= BINARY_SUFFIXES[suffix]:
+            return f"{value / BINARY_SUFFIXES[suffix]:.4g}{suffix}"
+    return f"{value:.0f}"
+
+
+def quantity_column(values: Iterable[Optional[Quantity]]) -> array:
+    """Parse a column of quantities into an array of floats; invalid or missing values count as 0."""
+    values = values if isinstance(values, list) else list(values)
+    parsed = {value: try_parse_quantity(value) for value in set(values)}
+    return array('d', map(parsed.__getitem__, values))
+
+
+class ResourceTable:
+    """
+    Columnar CPU and memory figures for a set of VMs.
+
+    Group columns run parallel to the CPU and memory columns: ``groups``
+    holds one hashable group name (or None) per VM, e.g. its node;
+    ``multi_groups`` holds a sequence of names per VM, e.g. its label pairs. Fleets reuse a handful of sizes
+    and tag sets, so totals() tallies distinct (group, cpu, memory) rows with
+    Counter, in C, and only those are expanded per group in Python.
+    """
+
+    def __init__(self, cpu: Iterable[Optional[Quantity]], memory: Iterable[Optional[Quantity]],
+                 groups: Optional[Dict[str, Iterable[Optional[Hashable]]]] = None,
+                 multi_groups: Optional[Dict[str, Iterable[Iterable[Hashable]]]] = None):
+        self.cpu = quantity_column(cpu)
+        self.memory = quantity_column(memory)
+        if len(self.cpu) != len(self.memory):
+            raise ValueError("cpu and memory columns differ in length")
+        # dimension -> (column, whether each entry is a tuple of names)
+        self._groups: Dict[str, Tuple[List, bool]] = {}
+        for dimension, column in (groups or {}).items():
+            self._groups[dimension] = (list(column), False)
+        for dimension, column in (multi_groups or {}).items():
+            self._groups[dimension] = (list(map(tuple, column)), True)
+        for dimension, (column, _) in self._groups.items():
+            if len(column) != len(self.cpu):
+                raise ValueError(f"{dimension} column differs in length")
+
+    def __len__(self) -> int:
+        return len(self.cpu)
+
+    def group_totals(self, dimension: str) -> Dict[Hashable, Dict[str, float]]:
+        """Return {group: {'vms', 'cpu_cores', 'memory_bytes'}} for one dimension, sorted by group."""
+        column, multi = self._groups[dimension]
+        result: Dict[Hashable, Dict[str, float]] = {}
+        for (names, cpu, memory), count in Counter(zip(column, self.cpu, self.memory)).items():
+            for name in (names if multi else (names,)):
+                if name is None:
+                    continue
+                totals = result.get(name)
+                if totals is None:
+                    totals = result[name] = {'vms': 0, 'cpu_cores': 0.0, 'memory_bytes': 0.0}
+                totals['vms'] += count
+                totals['cpu_cores'] += cpu * count
+                totals['memory_bytes'] += memory * count
+        return dict(sorted(result.items()))
+
+    def totals(self) -> Dict[str, Dict]:
+        """
+        Return {'total': {...}, <dimension>: {<group>: {...}}} where each
+        leaf holds 'vms', 'cpu_cores' and 'memory_bytes'.
+        """
+        result: Dict[str, Dict] = {'total': {
+            'vms': len(self.cpu), 'cpu_cores': math.fsum(self.cpu), 'memory_bytes': math.fsum(self.memory)
+        }}
+        for dimension in self._groups:
+            result[dimension] = self.group_totals(dimension)
+        return result
@@ -1,32 +1,79 @@
 from flask import Blueprint, render_template, flash, redirect, url_for, request, Response
+import functools
 import json
 from flask_sock import Sock
-import paramiko
 import select
 import threading
+import time
 from app import sock
 from app.forms import VMForm
-from app.utils import (generate_yaml, commit_to_git, get_vm_list,
-                      get_vm_config, delete_vm_config, update_vm_config)
-from app.k8s_utils import list_running_vms, get_kubernetes_client
+from app.utils import (generate_yaml, commit_to_git, get_vm_list, get_git_manager, get_inventory,
+                      get_write_queue, get_vm_config, delete_vm_config, update_vm_config,
+                      keep_unchanged_quantities)
+from app.cache import LRUCache
 import yaml
 from config import Config
 import logging
-import git
-import ssl
-from kubernetes import client as k8s_client
-import websocket
+
+# kubernetes (app.k8s_utils, app.k8s_cache, app.status_stream), paramiko,
+# websocket, ssl and git are imported inside the views that use them, so a
+# worker only pays for them once that feature is first requested and never
+# imports kubernetes while CLUSTER_VMS_ENABLED is off.
 
 logger = logging.getLogger(__name__)
 main = Blueprint('main', __name__)
 
-@main.route('/', methods=['GET'])
+# Seconds between SSE keepalive comments when no status changes arrive
+STATUS_STREAM_HEARTBEAT = 15
+
+def cluster_vms_required(view):
+    """Answer 404 without loading the kubernetes client while CLUSTER_VMS_ENABLED is off"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.CLUSTER_VMS_ENABLED:
+            return "Cluster VMs feature is not enabled", 404
+        return view(*args, **kwargs)
+    return wrapper
+
+# Serialized YAML/JSON bodies keyed by object and resourceVersion
+_response_cache = LRUCache(Config.RESPONSE_CACHE_SIZE)
+
+def conditional_response(cache_key, resource_version, render, mimetype):
+    """
+    Build a response with a strong ETag derived from the resourceVersion.
+    Returns 304 when the client's If-None-Match matches; otherwise the body
+    from render() is memoized per (cache_key, resourceVersion) so unchanged
+    objects are serialized only once.
+    """
+    if not resource_version:
+        return Response(render(), mimetype=mimetype)
+
+    etag = f"rv-{resource_version}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        body = _response_cache.get_or_compute((cache_key, resource_version), render)
+        response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    # Let browsers cache but always revalidate, so fetch() gets cheap 304s
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@main.route('/', methods=['GET', 'POST'])
 def vm_list():
+    """List VMs from the local clone. POST (the refresh button) syncs with the remote first."""
+    if request.method == 'POST':
+        try:
+            get_git_manager(Config).sync(force=True)
+        except Exception as e:
+            flash(f"Could not sync with the Git repository, showing the local copy: {str(e)}", 'warning')
+        return redirect(url_for('main.vm_list'))
     try:
         logger.info("Fetching VM list")
         vms = get_vm_list(Config)
         version = get_git_version()
-        return render_template('vm_list.html', vms=vms, config=Config, version=version)
+        return render_template('vm_list.html', vms=vms, config=Config, version=version,
+                               sync=get_git_manager(Config).sync_status())
     except Exception as e:
         logger.error(f"Error getting VM list: {str(e)}")
         flash(f"Error getting VM list: {str(e)}", 'error')
@@ -171,6 +218,8 @@ def edit_vm(vm_name):
                 'service_ports': service_ports_data,
                 'service_type': service_type
             }
+            # Fields left at their rounded value keep the stored quantity
+            form_data = keep_unchanged_quantities(form_data, get_vm_config(Config, vm_name))
 
             if 'preview' in request.form:
                 yaml_content = generate_yaml(form_data, Config)
@@ -198,32 +247,67 @@ def delete_vm(vm_name):
 
 @main.route('/cluster-vms', methods=['GET'])
 def cluster_vms():
-    """List VMs running in the Kubernetes cluster"""
+    """List VMs running in the Kubernetes cluster.
+    Query params: phase, node, label (label selector), name (prefix),
+    sort (name, namespace, created, phase, node, cpu or memory; '-' for descending),
+    page and page_size. Only the requested page is rendered.
+    """
     if not Config.CLUSTER_VMS_ENABLED:
         flash('Cluster VMs feature is not enabled', 'warning')
         return redirect(url_for('main.vm_list'))
+    from app.k8s_utils import query_vms
+    query = {
+        'phase': request.args.get('phase', '').strip(),
+        'node': request.args.get('node', '').strip(),
+        'label': request.args.get('label', '').strip(),
+        'name': request.args.get('name', '').strip(),
+        'sort': request.args.get('sort', 'name').strip() or 'name',
+    }
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+        page_size = int(request.args.get('page_size', Config.CLUSTER_VMS_PAGE_SIZE))
+    except ValueError:
+        page, page_size = 1, Config.CLUSTER_VMS_PAGE_SIZE
+    page_size = max(1, min(page_size, Config.CLUSTER_VMS_MAX_PAGE_SIZE))
+    # Non-empty filters carried over by the pagination links
+    link_args = {key: value for key, value in query.items() if value}
+    pagination = {'page': page, 'page_size': page_size, 'total': 0, 'pages': 1, 'args': link_args}
     try:
-        vms = list_running_vms()
+        vms, total = query_vms(
+            phase=query['phase'],
+            node=query['node'],
+            label_selector=query['label'],
+            name_prefix=query['name'],
+            sort=query['sort'],
+            page=page,
+            page_size=page_size
+        )
+        pagination.update(total=total, pages=max(1, -(-total // page_size)))
         version = get_git_version()
-        return render_template('cluster_vms.html', vms=vms, version=version)
+        return render_template('cluster_vms.html', vms=vms, version=version,
+                               query=query, pagination=pagination)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return render_template('cluster_vms.html', vms=[], query=query, pagination=pagination)
     except Exception as e:
         logger.error(f"Error getting cluster VM list: {str(e)}")
         flash(f"Error getting cluster VM list: {str(e)}", 'error')
-        return render_template('cluster_vms.html', vms=[])
+        return render_template('cluster_vms.html', vms=[], query=query, pagination=pagination)
 
 @main.route('/api/vm/<vm_name>/yaml', methods=['GET'])
+@cluster_vms_required
 def get_vm_yaml(vm_name):
-    """Get raw YAML for a VM"""
+    """Get raw YAML for a VM. Optional query param: namespace (default DEFAULT_VM_NAMESPACE)."""
+    from app.k8s_utils import get_kubevirt_object
     try:
-        core_v1, custom_api = get_kubernetes_client()
-        vm = custom_api.get_namespaced_custom_object(
-            group="kubevirt.io",
-            version="v1",
-            namespace="virtualmachines",  # You might want to make this configurable
-            plural="virtualmachines",
-            name=vm_name
+        namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
+        vm = get_kubevirt_object("virtualmachines", namespace, vm_name, full=True)
+        return conditional_response(
+            ('vm-yaml', namespace, vm_name),
+            vm.get('metadata', {}).get('resourceVersion'),
+            lambda: yaml.dump(vm, default_flow_style=False),
+            mimetype='text/html'
         )
-        return yaml.dump(vm, default_flow_style=False)
     except Exception as e:
         logger.error(f"Error getting VM YAML: {str(e)}")
         return str(e), 500
@@ -242,13 +326,14 @@ def terminal(vm_name):
 @main.route('/console/<vm_name>')
 def console(vm_name):
     """Web-based KubeVirt serial console (proxied via API)"""
-    namespace = request.args.get('namespace', 'virtualmachines')
+    namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
     embedded = request.args.get('embedded', '0') == '1'
     return render_template('console.html', vm_name=vm_name, namespace=namespace, embedded=embedded)
 
 
 def init_ssh_client():
     """Initialize SSH client with password authentication only"""
+    import paramiko
     client = paramiko.SSHClient()
     client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     return client
@@ -345,22 +430,27 @@ def ssh_websocket(ws):
 @sock.route('/console/ws')
 def console_websocket(ws):
     """WebSocket proxy to KubeVirt VM serial console subresource"""
+    if not Config.CLUSTER_VMS_ENABLED:
+        ws.send("Error: Cluster VMs feature is not enabled")
+        return
+    import ssl
+    import websocket
+    from app.k8s_utils import get_kubernetes_client, get_api_client
     vm_name = request.args.get('vm_name')
-    namespace = request.args.get('namespace', 'virtualmachines')
+    namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
 
     if not vm_name:
         ws.send("Error: vm_name is required")
         return
 
-    # Ensure Kubernetes config is loaded
+    # Reuse the shared Kubernetes client configuration
     try:
-        get_kubernetes_client()
+        api = get_api_client()
     except Exception as e:
         ws.send(f"Error loading Kubernetes config: {str(e)}")
         return
 
     # Prepare upstream KubeVirt console websocket URL
-    api = k8s_client.ApiClient()
     cfg = api.configuration
     host = cfg.host  # e.g., https://10.96.0.1
     scheme = 'wss' if host.startswith('https') else 'ws'
@@ -510,7 +600,7 @@ def console_websocket(ws):
 @main.route('/vnc/<vm_name>')
 def vnc(vm_name):
     """Web-based VNC viewer for KubeVirt VMI"""
-    namespace = request.args.get('namespace', 'virtualmachines')
+    namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
     embedded = request.args.get('embedded', '0') == '1'
     return render_template('vnc.html', vm_name=vm_name, namespace=namespace, embedded=embedded)
 
@@ -518,22 +608,27 @@ def vnc(vm_name):
 @sock.route('/vnc/ws')
 def vnc_websocket(ws):
     """WebSocket proxy to KubeVirt VNC subresource"""
+    if not Config.CLUSTER_VMS_ENABLED:
+        ws.send("Error: Cluster VMs feature is not enabled")
+        return
+    import ssl
+    import websocket
+    from app.k8s_utils import get_kubernetes_client, get_api_client
     vm_name = request.args.get('vm_name')
-    namespace = request.args.get('namespace', 'virtualmachines')
+    namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
 
     if not vm_name:
         ws.send("VNC error: vm_name is required")
         return
 
-    # Ensure Kubernetes config is loaded
+    # Reuse the shared Kubernetes client configuration
     try:
-        get_kubernetes_client()
+        api = get_api_client()
     except Exception as e:
         ws.send(f"VNC error: Kubernetes config not loaded: {str(e)}")
         return
 
     # Build upstream VNC URL
-    api = k8s_client.ApiClient()
     cfg = api.configuration
     host = cfg.host
     scheme = 'wss' if host.startswith('https') else 'ws'
@@ -670,150 +765,371 @@ def vnc_websocket(ws):
             pass
 
 @main.route('/api/vm/<vm_name>/power/<action>', methods=['POST'])
+@cluster_vms_required
 def vm_power(vm_name, action):
-    """Power on/off a VM"""
+    """Power on/off a VM. Optional query param: namespace (default DEFAULT_VM_NAMESPACE)."""
     try:
         if action not in ['start', 'stop']:
             return "Invalid action", 400
-            
-        power_vm(vm_name, action)
+
+        namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
+        power_vm(vm_name, action, namespace)
         return "Success", 200
     except Exception as e:
         logger.error(f"Error controlling VM power: {str(e)}")
         return str(e), 500
 
+@main.route('/api/vms/power', methods=['POST'])
+@cluster_vms_required
+def vms_power_bulk():
+    """Start or stop many VMs at once.
+    Body: {"action": "start"|"stop", "vms": [{"name": "...", "namespace": "..."}, ...]}
+    or {"action": ..., "label_selector": "...", "namespace": "..."} to target
+    every matching VM. Namespaces default to DEFAULT_VM_NAMESPACE for listed VMs
+    and to the configured namespaces for selectors. Returns per-VM results.
+    """
+    from app.k8s_utils import find_vm_keys, power_vms
+    body = request.get_json(silent=True) or {}
+    action = body.get('action')
+    if action not in ['start', 'stop']:
+        return "Invalid action", 400
+
+    requested = body.get('vms')
+    label_selector = body.get('label_selector')
+    if (requested is None) == (not label_selector):
+        return "Provide either a 'vms' list or a 'label_selector'", 400
+    try:
+        if label_selector:
+            keys = find_vm_keys(label_selector, body.get('namespace'))
+        else:
+            if not isinstance(requested, list):
+                return "'vms' must be a list", 400
+            keys = []
+            for item in requested:
+                if not isinstance(item, dict) or not item.get('name'):
+                    return "Each entry in 'vms' needs a 'name'", 400
+                keys.append((item.get('namespace') or Config.DEFAULT_VM_NAMESPACE, item['name']))
+
+        results = power_vms(keys, action)
+        failed = sum(1 for result in results if not result['success'])
+        payload = {
+            'action': action,
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'results': results,
+        }
+        return Response(json.dumps(payload), mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error in bulk power {action}: {str(e)}")
+        return str(e), 500
+
+@main.route('/api/vms/import', methods=['POST'])
+def vms_import():
+    """Create many VM configurations in one commit.
+    Body: a CSV or multi-document YAML file, either as the request body or
+    as the 'file' field of a form upload. Query params: format (csv|yaml,
+    default from the file name or content type), dry_run=1, partial=1 to
+    commit the valid rows despite errors, overwrite=1 to replace existing
+    VMs. Returns the imported VM names, the commit SHA and per-row errors.
+    """
+    from app.bulk_import import detect_format, import_vms
+    upload = request.files.get('file')
+    if upload is not None:
+        try:
+            text = upload.read().decode('utf-8')
+        except UnicodeDecodeError:
+            return "The uploaded file is not valid UTF-8", 400
+        fmt = request.args.get('format') or detect_format(upload.filename, upload.content_type)
+    else:
+        text = request.get_data(as_text=True)
+        fmt = request.args.get('format') or detect_format(content_type=request.content_type)
+    if not text.strip():
+        return "Provide a CSV or YAML file", 400
+
+    try:
+        result = import_vms(
+            text, Config, fmt,
+            dry_run=request.args.get('dry_run') == '1',
+            partial=request.args.get('partial') == '1',
+            overwrite=request.args.get('overwrite') == '1'
+        )
+    except ValueError as e:
+        return str(e), 400
+    except Exception as e:
+        logger.error(f"Error importing VMs: {str(e)}", exc_info=True)
+        return str(e), 502
+    # Nothing is committed when rows failed without partial=1
+    status = 422 if result.errors and not result.imported else 200
+    return Response(json.dumps(result.to_dict()), status=status, mimetype='application/json')
+
+@main.route('/api/git/sync', methods=['GET', 'POST'])
+def git_sync():
+    """Report the repository sync, VM inventory and write queue state; POST forces a sync with the remote first.
+    GET only reports and never touches the network."""
+    git_mgr = get_git_manager(Config)
+    try:
+        if request.method == 'POST':
+            git_mgr.sync(force=True)
+        return Response(json.dumps(dict(git_mgr.sync_status(), inventory=get_inventory(Config).status(),
+                                         writes=get_write_queue(Config).status())),
+                        mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error syncing repository: {str(e)}")
+        return Response(json.dumps(dict(git_mgr.sync_status(), error=str(e))),
+                        status=502, mimetype='application/json')
+
+@main.route('/api/k8s/stats', methods=['GET'])
+@cluster_vms_required
+def k8s_client_stats():
+    """Report Kubernetes client pool hits, connection reuse and VMI
+    phase transition timings for this worker"""
+    from app.k8s_utils import get_client_manager, get_transition_stats
+    stats = get_client_manager().stats()
+    stats['vmi_transitions'] = get_transition_stats()
+    return Response(json.dumps(stats), mimetype='application/json')
+
+@main.route('/api/cluster/resources', methods=['GET'])
+@cluster_vms_required
+def cluster_resources():
+    """CPU cores and memory bytes of the cluster VMs, in total and per node, namespace and tag"""
+    from app.k8s_utils import fleet_resources
+    try:
+        return Response(json.dumps(fleet_resources()), mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error aggregating cluster resources: {str(e)}")
+        return str(e), 500
+
 @main.route('/api/service/<service_name>/yaml', methods=['GET'])
+@cluster_vms_required
 def get_service_yaml(service_name):
-    """Get raw YAML for a Service. Optional query param: namespace (default 'virtualmachines')."""
+    """Get raw YAML for a Service. Optional query param: namespace (default DEFAULT_VM_NAMESPACE)."""
+    from app.k8s_utils import get_service_manifest
     try:
-        namespace = request.args.get('namespace', 'virtualmachines')
-        core_v1, _ = get_kubernetes_client()
-        service = core_v1.read_namespaced_service(
-            name=service_name,
-            namespace=namespace
+        namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
+        # Plain dict with canonical JSON keys (camelCase), not python
+        # attribute names (snake_case)
+        service = get_service_manifest(namespace, service_name)
+        return conditional_response(
+            ('service-yaml', namespace, service_name),
+            service.get('metadata', {}).get('resourceVersion'),
+            lambda: yaml.safe_dump(service, default_flow_style=False, sort_keys=False),
+            mimetype='text/yaml'
         )
-        # Use ApiClient.sanitize_for_serialization to produce canonical JSON keys
-        # (camelCase) rather than python attribute names (snake_case).
-        serialized = core_v1.api_client.sanitize_for_serialization(service)
-        yaml_body = yaml.safe_dump(serialized, default_flow_style=False, sort_keys=False)
-        return Response(yaml_body, mimetype='text/yaml')
     except Exception as e:
         logger.error(f"Error getting Service YAML: {str(e)}")
         return str(e), 500
 
 @main.route('/api/vmi/<vm_name>/status', methods=['GET'], endpoint='vmi_status_api')
+@cluster_vms_required
 def vmi_status_api(vm_name):
     """Return lightweight status for VM/VMI to drive UI polling.
     Includes VM spec.running, VMI phase, node, and IPs if available.
-    Namespace defaults to 'virtualmachines'.
+    Namespace defaults to DEFAULT_VM_NAMESPACE.
     """
-    namespace = request.args.get('namespace', 'virtualmachines')
+    from app.k8s_utils import get_kubevirt_object, build_vmi_status
+    namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
     try:
-        core_v1, custom_api = get_kubernetes_client()
-        # VM spec.running
-        spec_running = None
         try:
-            vm = custom_api.get_namespaced_custom_object(
-                group="kubevirt.io",
-                version="v1",
-                namespace=namespace,
-                plural="virtualmachines",
-                name=vm_name
-            )
-            spec_running = bool(vm.get('spec', {}).get('running'))
+            vm = get_kubevirt_object("virtualmachines", namespace, vm_name)
         except Exception:
             # VM may not exist or be inaccessible
-            spec_running = None
-
-        # VMI phase and details
-        vmi_phase = None
-        node = None
-        ip_addresses = []
-        ready = None
-        primary_ip = None
+            vm = None
         try:
-            vmi = custom_api.get_namespaced_custom_object(
-                group="kubevirt.io",
-                version="v1",
-                namespace=namespace,
-                plural="virtualmachineinstances",
-                name=vm_name
-            )
-            vmi_phase = vmi.get('status', {}).get('phase')
-            node = vmi.get('status', {}).get('nodeName')
-            interfaces = vmi.get('status', {}).get('interfaces', [])
-            if isinstance(ip_addresses, list):
-                # Collect IP + IPs fields from interfaces
-                ips = []
-                for itf in interfaces:
-                    if 'ip' in itf and itf['ip']:
-                        ips.append(itf['ip'])
-                        if not primary_ip:
-                            primary_ip = itf['ip']
-                    if 'ips' in itf and isinstance(itf['ips'], list):
-                        ips.extend([ip for ip in itf['ips'] if ip])
-                ip_addresses = ips
-            else:
-                ip_addresses = []
-            # Ready condition
-            conditions = vmi.get('status', {}).get('conditions', [])
-            if isinstance(conditions, list):
-                for cond in conditions:
-                    if cond.get('type') == 'Ready':
-                        ready = (cond.get('status') == 'True')
-                        break
+            vmi = get_kubevirt_object("virtualmachineinstances", namespace, vm_name)
         except Exception:
             # VMI may not exist during scheduling/stop
-            vmi_phase = None
-            node = None
-            ip_addresses = []
-            ready = None
-            primary_ip = None
+            vmi = None
 
-        payload = {
-            'vm_name': vm_name,
-            'namespace': namespace,
-            'spec_running': spec_running,
-            'vmi_phase': vmi_phase,
-            'node': node,
-            'ip_addresses': ip_addresses,
-            'primary_ip': primary_ip,
-            'ready': ready,
-        }
-        return Response(json.dumps(payload), mimetype='application/json')
+        # The status depends on both objects; missing ones count as version 0
+        version = '.'.join(
+            (obj or {}).get('metadata', {}).get('resourceVersion') or '0' for obj in (vm, vmi)
+        )
+        return conditional_response(
+            ('vmi-status', namespace, vm_name),
+            version,
+            lambda: json.dumps(build_vmi_status(vm_name, namespace, vm, vmi)),
+            mimetype='application/json'
+        )
     except Exception as e:
         logger.error(f"Error getting VMI status for {vm_name}: {str(e)}")
         return str(e), 500
 
+@main.route('/api/vm/<vm_name>/details', methods=['GET'])
+@cluster_vms_required
+def vm_details_api(vm_name):
+    """Return the heavy per-VM fields left out of the cluster list view:
+    VMI conditions and cloud-init user data. Namespace defaults to
+    DEFAULT_VM_NAMESPACE.
+    """
+    from app.k8s_utils import get_kubevirt_object, vm_detail_fields
+    namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
+    try:
+        try:
+            # The cache does not keep the cloud-init volumes
+            vm = get_kubevirt_object("virtualmachines", namespace, vm_name, full=True)
+        except Exception as e:
+            # ApiException from the API or the informer cache
+            if getattr(e, 'status', None) == 404:
+                return f"VM {namespace}/{vm_name} not found", 404
+            raise
+        try:
+            vmi = get_kubevirt_object("virtualmachineinstances", namespace, vm_name)
+        except Exception:
+            # VMI does not exist while the VM is stopped
+            vmi = None
+        payload = {'name': vm_name, 'namespace': namespace}
+        payload.update(vm_detail_fields(vm, vmi))
+        return Response(json.dumps(payload), mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error getting details for VM {vm_name}: {str(e)}")
+        return str(e), 500
+
+@main.route('/api/vmi/<vm_name>/wait', methods=['GET'])
+@cluster_vms_required
+def vmi_wait(vm_name):
+    """Long-poll until the VMI reaches a phase.
+    Query params: phase (a VMI phase, or 'Stopped' for no running VMI),
+    ready ('true' to also wait for the Ready condition), since (return early
+    once the phase differs from this one), timeout in seconds (capped at
+    VMI_WAIT_MAX_SECONDS) and namespace (default DEFAULT_VM_NAMESPACE).
+    Returns the status payload with 'reached', 'elapsed_ms' and 'transitions'.
+    Off unless VMI_WAIT_ENABLED (by default only with threaded or async
+    workers, since the request holds a worker thread while it waits).
+    """
+    if not Config.VMI_WAIT_ENABLED:
+        return "Long-poll is disabled; poll /api/vmi/<name>/status", 503
+    from app.k8s_utils import wait_for_vmi_phase
+    namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
+    phase = request.args.get('phase')
+    if not phase:
+        return "Missing 'phase' query parameter", 400
+    try:
+        timeout = float(request.args.get('timeout', Config.VMI_WAIT_MAX_SECONDS))
+    except ValueError:
+        return "Invalid 'timeout' query parameter", 400
+    timeout = max(0.0, min(timeout, Config.VMI_WAIT_MAX_SECONDS))
+    require_ready = request.args.get('ready', '').lower() == 'true'
+    try:
+        payload = wait_for_vmi_phase(namespace, vm_name, phase, timeout, require_ready,
+                                     since=request.args.get('since') or None)
+        return Response(json.dumps(payload), mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error waiting for VMI {vm_name} to reach {phase}: {str(e)}")
+        return str(e), 500
+
+@main.route('/api/vmi/status:batch', methods=['POST'])
+@cluster_vms_required
+def vmi_status_batch():
+    """Return lightweight status for many VMs in one response.
+    Body: {"vms": [{"name": "...", "namespace": "..."}, ...]}; namespace
+    defaults to DEFAULT_VM_NAMESPACE. Served from the informer cache or one
+    VM and one VMI LIST per namespace instead of two GETs per VM.
+    """
+    from app.k8s_utils import get_vm_status_objects, build_vmi_status
+    body = request.get_json(silent=True) or {}
+    requested = body.get('vms')
+    if not isinstance(requested, list):
+        return "Request body must contain a 'vms' list", 400
+    try:
+        keys = []
+        for item in requested:
+            if not isinstance(item, dict) or not item.get('name'):
+                return "Each entry in 'vms' needs a 'name'", 400
+            keys.append((item.get('namespace') or Config.DEFAULT_VM_NAMESPACE, item['name']))
+
+        objects = get_vm_status_objects(keys)
+        statuses = [
+            build_vmi_status(name, namespace, *objects.get((namespace, name), (None, None)))
+            for namespace, name in keys
+        ]
+        return Response(json.dumps({'statuses': statuses}), mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error getting batch VMI status: {str(e)}")
+        return str(e), 500
+
+@main.route('/api/vmi/events', methods=['GET'])
+@cluster_vms_required
+def vmi_status_events():
+    """Server-Sent Events stream of VM/VMI status changes.
+    Query param vms: comma-separated namespace/name keys, or names in
+    DEFAULT_VM_NAMESPACE (all VMs if omitted).
+    Sends a 'status' snapshot per VM, then only changed fields, and 'deleted'
+    when a VM is gone; a 'resync' event asks the client to re-fetch everything after a buffer overflow.
+    The stream closes after STATUS_STREAM_MAX_SECONDS and the browser
+    reconnects. Off unless STATUS_STREAM_ENABLED (by default only with
+    threaded or async workers, since each open stream holds a worker thread);
+    the cluster view polls the batch endpoint instead.
+    """
+    if not Config.STATUS_STREAM_ENABLED:
+        return "Status stream is disabled; poll /api/vmi/status:batch", 503
+    from app.k8s_utils import get_cluster_cache
+    from app.k8s_cache import object_key
+    from app.status_stream import get_status_broadcaster
+    cache = get_cluster_cache()
+    if cache is None:
+        return "Status stream requires the Kubernetes informer cache", 503
+
+    vms_arg = request.args.get('vms')
+    keys = None
+    if vms_arg:
+        keys = [k if '/' in k else f"{Config.DEFAULT_VM_NAMESPACE}/{k}" for k in vms_arg.split(',') if k]
+        # The stream is fed by the informers only; a VM they do not watch
+        # would report null statuses forever
+        uncovered = sorted({k.split('/', 1)[0] for k in keys if not cache.covers(k.split('/', 1)[0])})
+        if uncovered:
+            return f"Namespaces not watched by the informer cache: {', '.join(uncovered)}", 400
+
+    broadcaster = get_status_broadcaster(cache, Config.STATUS_STREAM_BUFFER)
+    subscription = broadcaster.subscribe(keys)
+
+    def sse(event, data):
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def stream():
+        try:
+            yield "retry: 2000\n\n"
+            snapshot_keys = keys if keys is not None else [object_key(vm) for vm in cache.vms.list()]
+            for key in snapshot_keys:
+                namespace, name = key.split('/', 1)
+                yield sse('status', {'vm_name': name, 'namespace': namespace, **broadcaster.status(key)})
+
+            deadline = time.monotonic() + Config.STATUS_STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                resync, changes = subscription.get(timeout=STATUS_STREAM_HEARTBEAT)
+                if resync:
+                    yield sse('resync', {})
+                for key, fields in changes:
+                    namespace, name = key.split('/', 1)
+                    if fields.get('deleted'):
+                        yield sse('deleted', {'vm_name': name, 'namespace': namespace})
+                    else:
+                        yield sse('status', {'vm_name': name, 'namespace': namespace, **fields})
+                if not resync and not changes:
+                    yield ": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @main.route('/api/vmi/<vm_name>/status', methods=['GET'])
+@cluster_vms_required
 def get_vmi_status(vm_name):
     """Return minimal status info for the VMI associated with a VM.
-    Defaults to namespace 'virtualmachines'.
+    Defaults to namespace DEFAULT_VM_NAMESPACE.
     """
+    from app.k8s_utils import get_kubevirt_object
     try:
-        namespace = request.args.get('namespace', 'virtualmachines')
-        core_v1, custom_api = get_kubernetes_client()
+        namespace = request.args.get('namespace', Config.DEFAULT_VM_NAMESPACE)
         # Try to read the VMI; it exists only when VM is (or was) running
         try:
-            vmi = custom_api.get_namespaced_custom_object(
-                group="kubevirt.io",
-                version="v1",
-                namespace=namespace,
-                plural="virtualmachineinstances",
-                name=vm_name
-            )
+            vmi = get_kubevirt_object("virtualmachineinstances", namespace, vm_name)
         except Exception:
             vmi = None
 
         # Also get the VM to read spec.running quickly
         try:
-            vm = custom_api.get_namespaced_custom_object(
-                group="kubevirt.io",
-                version="v1",
-                namespace=namespace,
-                plural="virtualmachines",
-                name=vm_name
-            )
+            vm = get_kubevirt_object("virtualmachines", namespace, vm_name)
         except Exception:
             vm = None
 
@@ -845,8 +1161,9 @@ def get_vmi_status(vm_name):
 
 def get_git_version():
     """Get the current git version (tag or commit hash)"""
+    from app.git_manager import _git
     try:
-        repo = git.Repo(search_parent_directories=True)
+        repo = _git().Repo(search_parent_directories=True)
         # First try to get the latest tag pointing to HEAD
         tags = [tag for tag in repo.tags if tag.commit == repo.head.commit]
         if tags:
@@ -858,33 +1175,11 @@ def get_git_version():
         logger.error(f"Error getting git version: {str(e)}")
         return "unknown"
 
-def power_vm(vm_name, action):
+def power_vm(vm_name, action, namespace=None):
     """Power on/off a VM"""
+    from app.k8s_utils import set_vm_running
     try:
-        _, custom_api = get_kubernetes_client()
-        
-        # Get current VM state
-        vm = custom_api.get_namespaced_custom_object(
-            group="kubevirt.io",
-            version="v1",
-            namespace="virtualmachines",
-            plural="virtualmachines",
-            name=vm_name
-        )
-        
-        # Update running state based on action
-        vm['spec']['running'] = action == 'start'
-        
-        # Apply the update
-        custom_api.patch_namespaced_custom_object(
-            group="kubevirt.io",
-            version="v1",
-            namespace="virtualmachines",
-            plural="virtualmachines",
-            name=vm_name,
-            body=vm
-        )
-        
+        set_vm_running(namespace or Config.DEFAULT_VM_NAMESPACE, vm_name, action == 'start')
         return True
     except Exception as e:
         logger.error(f"Error {action}ing VM {vm_name}: {str(e)}")
@@ -3,6 +3,7 @@
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field, field_validator, model_validator
 import re
+from app.quantity import parse_quantity
 from app.constants import (
     VM_NAME_PATTERN, DNS_NAME_PATTERN, TAG_KEY_PATTERN,
     MAX_CPU_CORES, MIN_CPU_CORES, MAX_MEMORY_GB, MIN_MEMORY_GB,
@@ -113,6 +114,10 @@ class VMConfigSchema(BaseModel):
     cpu_cores: int = Field(..., ge=MIN_CPU_CORES, le=MAX_CPU_CORES)
     memory: int = Field(..., ge=MIN_MEMORY_GB, le=MAX_MEMORY_GB)
     storage_size: int = Field(..., ge=MIN_STORAGE_GB, le=MAX_STORAGE_GB)
+    # Stored quantities (e.g. 8Gi, 512Mi) written instead of memory and
+    # storage_size when an edit left those fields unchanged
+    memory_quantity: Optional[str] = None
+    storage_quantity: Optional[str] = None
     storage_class: str = Field(default=DEFAULT_STORAGE_CLASS)
     storage_access_mode: str = Field(default=DEFAULT_STORAGE_ACCESS_MODE)
     image_url: str = Field(..., min_length=1)
@@ -152,6 +157,14 @@ class VMConfigSchema(BaseModel):
             )
         return v
 
+    @field_validator('memory_quantity', 'storage_quantity')
+    @classmethod
+    def validate_quantity(cls, v):
+        """Validate a Kubernetes quantity kept from the stored manifest."""
+        if v is not None:
+            parse_quantity(v)
+        return v
+
     @field_validator('storage_access_mode')
     @classmethod
     def validate_storage_access_mode(cls, v):
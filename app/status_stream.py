@@ -0,0 +1,154 @@
+"""Fan-out of VM/VMI status changes from the informer cache to subscribers."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.k8s_cache import ClusterCache, object_key
+from app.k8s_utils import build_vmi_status
+
+logger = logging.getLogger(__name__)
+
+# Fields pushed to clients; everything else in the status payload is static
+STATUS_FIELDS = ('spec_running', 'vmi_phase', 'node', 'ip_addresses', 'primary_ip', 'ready')
+
+
+class StatusSubscription:
+    """
+    Bounded, coalescing buffer of status deltas for one client.
+
+    Pending changes are merged per VM, so a slow consumer only ever holds the
+    latest value of each field. If more than ``max_pending`` VMs have pending
+    changes the buffer is dropped and the client is told to resynchronise.
+    """
+
+    def __init__(self, keys: Optional[Iterable[str]], max_pending: int):
+        """
+        Initialize the subscription.
+
+        Args:
+            keys: ``namespace/name`` keys to follow, or None for all VMs
+            max_pending: Maximum number of VMs with undelivered changes
+        """
+        self.keys = set(keys) if keys is not None else None
+        self.max_pending = max_pending
+        self._pending: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._resync = False
+        self._cond = threading.Condition()
+
+    def wants(self, key: str) -> bool:
+        return self.keys is None or key in self.keys
+
+    def push(self, key: str, changes: Dict[str, Any]):
+        with self._cond:
+            if key in self._pending:
+                self._pending[key].update(changes)
+            elif len(self._pending) >= self.max_pending:
+                self._pending.clear()
+                self._resync = True
+            else:
+                self._pending[key] = dict(changes)
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Tuple[bool, List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Wait up to ``timeout`` seconds for changes.
+
+        Returns:
+            (resync, [(key, changed_fields), ...])
+        """
+        with self._cond:
+            if not self._pending and not self._resync:
+                self._cond.wait(timeout)
+            resync, self._resync = self._resync, False
+            changes = list(self._pending.items())
+            self._pending.clear()
+            return resync, changes
+
+
+class StatusBroadcaster:
+    """
+    Turns informer events into per-VM status deltas for all subscribers.
+
+    One broadcaster per worker process shares the informer watches, so the
+    number of upstream watches does not grow with the number of browsers.
+    """
+
+    def __init__(self, cache: ClusterCache, max_pending: int = 1000):
+        """
+        Initialize the broadcaster and hook it into the informer cache.
+
+        Args:
+            cache: Synced informer cache
+            max_pending: Per-subscriber buffer bound (see StatusSubscription)
+        """
+        self.cache = cache
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscribers: List[StatusSubscription] = []
+        self._last: Dict[str, Dict[str, Any]] = {}
+        # Seed the last-sent state so the first event per VM is a true delta
+        for vm in cache.vms.list():
+            key = object_key(vm)
+            self._last[key] = self.status(key)
+        cache.vms.add_handler(self._on_event)
+        cache.vmis.add_handler(self._on_event)
+
+    def status(self, key: str) -> Dict[str, Any]:
+        """Return the current status fields for ``namespace/name``."""
+        namespace, name = key.split('/', 1)
+        payload = build_vmi_status(
+            name, namespace, self.cache.vms.get_by_key(key), self.cache.vmis.get_by_key(key)
+        )
+        return {field: payload[field] for field in STATUS_FIELDS}
+
+    def subscribe(self, keys: Optional[Iterable[str]] = None) -> StatusSubscription:
+        subscription = StatusSubscription(keys, self.max_pending)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: StatusSubscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def _on_event(self, event_type: str, obj: Any):
+        key = object_key(obj)
+        # The VM and VMI watch threads both land here; computing, recording
+        # and pushing under one lock keeps a status read before the other
+        # thread's update from overwriting (or overtaking) the newer one
+        with self._lock:
+            current = self.status(key)
+            previous = self._last.get(key)
+            if self.cache.vms.get_by_key(key) is None:
+                # The VM is gone: deleted, or dropped by a relist after the
+                # watch missed its deletion
+                self._last.pop(key, None)
+                changes = {'deleted': True} if previous is not None else {}
+            else:
+                self._last[key] = current
+                if previous is None:
+                    changes = dict(current, deleted=False)
+                else:
+                    changes = {f: v for f, v in current.items() if previous.get(f) != v}
+            if not changes:
+                return
+            for subscription in self._subscribers:
+                if subscription.wants(key):
+                    subscription.push(key, changes)
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_status_broadcaster(cache: ClusterCache, max_pending: int = 1000) -> StatusBroadcaster:
+    """Return the process-wide broadcaster, creating it on first use."""
+    global _broadcaster
+    with _broadcaster_lock:
+        if _broadcaster is None:
+            _broadcaster = StatusBroadcaster(cache, max_pending)
+            logger.info("Started VM status broadcaster")
+        return _broadcaster
@@ -9,6 +9,10 @@ from app.constants import PROFILE_DEFAULT
 
 logger = logging.getLogger(__name__)
 
+# libyaml's safe loader when PyYAML was built with it; same results, several
+# times faster than the pure-Python SafeLoader
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 class TemplateManager:
     """Manages Jinja2 templates with profile support and YAML validation."""
@@ -234,7 +238,7 @@ class TemplateManager:
             yaml.YAMLError: If YAML is invalid
         """
         try:
-            yaml.safe_load(yaml_content)
+            yaml.load(yaml_content, Loader=YAML_LOADER)
         except yaml.YAMLError as e:
             logger.error(f"Invalid YAML generated: {e}")
             raise
@@ -2,14 +2,20 @@
 
 import yaml
 import logging
-from typing import Dict, Any, List
+import copy
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
 from pathlib import Path
 from pydantic import ValidationError
 
 from config import Config
+from app.cache import LRUCache
 from app.schemas import VMConfigSchema, NetworkConfigSchema
-from app.template_manager import TemplateManager
-from app.git_manager import GitOperationManager, GitOperationError
+from app.template_manager import TemplateManager, YAML_LOADER
+from app.git_manager import GitOperationManager, GitOperationError, RepositorySnapshot
+from app.inventory import VMInventory
+from app.write_queue import GitWriteQueue
+from app.quantity import whole_gigabytes
 from app.constants import (
     GIT_COMMIT_MESSAGE_CREATE,
     GIT_COMMIT_MESSAGE_UPDATE, 
@@ -23,6 +29,12 @@ logger = logging.getLogger(__name__)
 # Initialize managers as singletons
 _template_manager = None
 _git_manager = None
+_inventory = None
+_write_queue = None
+
+# Parsed manifests keyed by (purpose, git blob SHA). A blob SHA names the
+# exact file content, so entries never go stale; LRU eviction bounds memory.
+_manifest_cache = LRUCache(Config.VM_MANIFEST_CACHE_SIZE)
 
 
 def get_template_manager() -> TemplateManager:
@@ -40,9 +52,53 @@ def get_git_manager(config: Config = None) -> GitOperationManager:
         if config is None:
             config = Config()
         _git_manager = GitOperationManager(config)
+        # Index new commits as soon as they are fetched, not on the next page load
+        _git_manager.add_sync_listener(lambda: get_inventory(config).refresh(_git_manager.snapshot()))
     return _git_manager
 
 
+def get_write_queue(config: Config = None) -> GitWriteQueue:
+    """Get or create the Git write queue singleton."""
+    global _write_queue
+    if _write_queue is None:
+        if config is None:
+            config = Config()
+        _write_queue = GitWriteQueue(
+            get_git_manager(config),
+            window=config.GIT_WRITE_BATCH_WINDOW,
+            max_batch=config.GIT_WRITE_BATCH_MAX
+        )
+    return _write_queue
+
+
+def _queue_write(config: Config, subdirectory: Optional[str], vm_name: str,
+                 content: Optional[str], commit_message: str) -> str:
+    """
+    Commit one manifest change (content None deletes it) through the write
+    queue, which may batch it with concurrent changes, and wait for its SHA.
+    """
+    file_name = f"{vm_name}{YAML_EXTENSION}"
+    path = str(Path(subdirectory) / file_name) if subdirectory else file_name
+    timeout = (config or Config).GIT_WRITE_TIMEOUT
+    future = get_write_queue(config).submit(path, content, commit_message)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        # Dropped if the writer has not picked it up yet
+        future.cancel()
+        raise GitOperationError(f"Timed out after {timeout:g}s waiting for the commit of {file_name}")
+
+
+def get_inventory(config: Config = None) -> VMInventory:
+    """Get or create the VM inventory singleton."""
+    global _inventory
+    if _inventory is None:
+        if config is None:
+            config = Config()
+        _inventory = VMInventory(config.YAML_SUBDIRECTORY, YAML_EXTENSION, _load_vm_info)
+    return _inventory
+
+
 def validate_and_prepare_config(form_data: Dict[str, Any]) -> VMConfigSchema:
     """
     Validate form data and return validated schema.
@@ -70,6 +126,20 @@ def validate_and_prepare_config(form_data: Dict[str, Any]) -> VMConfigSchema:
         raise
 
 
+def render_vm_config(
+    vm_config: VMConfigSchema,
+    config: Config,
+    profile_name: str = PROFILE_DEFAULT
+) -> str:
+    """Render an already validated configuration to YAML (VM + Service)."""
+    # Convert to template-friendly dict
+    context = vm_config.to_template_dict()
+    context['config'] = config
+    
+    # Get template manager and render
+    return get_template_manager().render_complete_config(context, profile_name)
+
+
 def generate_yaml(
     form_data: Dict[str, Any], 
     config: Config,
@@ -95,14 +165,7 @@ def generate_yaml(
     try:
         # Validate input
         vm_config = validate_and_prepare_config(form_data)
-        
-        # Convert to template-friendly dict
-        context = vm_config.to_template_dict()
-        context['config'] = config
-        
-        # Get template manager and render
-        template_mgr = get_template_manager()
-        yaml_content = template_mgr.render_complete_config(context, profile_name)
+        yaml_content = render_vm_config(vm_config, config, profile_name)
         
         logger.info(f"Successfully generated YAML for VM: {vm_config.vm_name}")
         return yaml_content
@@ -139,17 +202,8 @@ def commit_to_git(
     logger.info(f"Committing configuration for VM: {vm_name}")
     
     try:
-        git_mgr = get_git_manager()
-        
-        file_name = f"{vm_name}{YAML_EXTENSION}"
         commit_message = GIT_COMMIT_MESSAGE_CREATE.format(vm_name=vm_name)
-        
-        commit_sha = git_mgr.commit_file(
-            file_path=file_name,
-            content=yaml_content,
-            commit_message=commit_message,
-            subdirectory=subdirectory
-        )
+        commit_sha = _queue_write(None, subdirectory, vm_name, yaml_content, commit_message)
         
         logger.info(f"Successfully committed VM configuration: {commit_sha}")
         return commit_sha
@@ -162,6 +216,36 @@ def commit_to_git(
         raise GitOperationError(f"Failed to commit: {e}")
 
 
+def _parse_manifest(content: str, file_name: str, extract: Callable[[Dict, Dict], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Parse a VM manifest (VirtualMachine + Service documents) and apply extract.
+
+    Returns:
+        The extracted information, or None if the file is not a valid manifest
+    """
+    docs = list(yaml.load_all(content, Loader=YAML_LOADER))
+    if len(docs) < 2:
+        logger.warning(f"Skipping {file_name}: Invalid document count")
+        return None
+
+    vm_config = docs[0]
+    service_config = docs[1]
+
+    if not isinstance(vm_config, dict) or not isinstance(service_config, dict):
+        logger.error(f"Invalid YAML structure in {file_name}")
+        return None
+
+    return extract(vm_config, service_config)
+
+
+def _load_vm_info(file_name: str, blob_sha: str, snapshot: RepositorySnapshot) -> Optional[Dict[str, Any]]:
+    """VM list entry for one manifest blob; unchanged content is not re-read or re-parsed."""
+    return _manifest_cache.get_or_compute(
+        ('list', blob_sha),
+        lambda: _parse_manifest(snapshot.read_blob(blob_sha), file_name, _extract_vm_info)
+    )
+
+
 def get_vm_list(config: Config) -> List[Dict[str, Any]]:
     """
     Get list of VMs from Git repository.
@@ -175,40 +259,9 @@ def get_vm_list(config: Config) -> List[Dict[str, Any]]:
     logger.info("Fetching VM list from repository")
     
     try:
-        git_mgr = get_git_manager(config)
-        files = git_mgr.list_files(
-            subdirectory=config.YAML_SUBDIRECTORY,
-            extension=YAML_EXTENSION
-        )
-        
-        vms = []
-        for file_name in files:
-            try:
-                content = git_mgr.read_file(
-                    file_path=file_name,
-                    subdirectory=config.YAML_SUBDIRECTORY
-                )
-                
-                # Parse YAML documents
-                docs = list(yaml.safe_load_all(content))
-                if len(docs) < 2:
-                    logger.warning(f"Skipping {file_name}: Invalid document count")
-                    continue
-                
-                vm_config = docs[0]
-                service_config = docs[1]
-                
-                if not isinstance(vm_config, dict) or not isinstance(service_config, dict):
-                    logger.error(f"Invalid YAML structure in {file_name}")
-                    continue
-                
-                # Extract VM information
-                vm_info = _extract_vm_info(vm_config, service_config)
-                vms.append(vm_info)
-                
-            except Exception as e:
-                logger.error(f"Error processing {file_name}: {e}")
-                continue
+        # The inventory applies only the manifests changed since the commit
+        # it last indexed; the snapshot pins the commit without locking
+        vms = get_inventory(config).vms(get_git_manager(config).snapshot())
         
         logger.info(f"Found {len(vms)} VMs")
         return vms
@@ -285,24 +338,27 @@ def get_vm_config(config: Config, vm_name: str) -> Dict[str, Any]:
     logger.info(f"Fetching configuration for VM: {vm_name}")
     
     try:
-        git_mgr = get_git_manager(config)
+        snapshot = get_git_manager(config).snapshot()
         file_name = f"{vm_name}{YAML_EXTENSION}"
-        
-        content = git_mgr.read_file(
+        blob_sha = snapshot.blob_sha(
             file_path=file_name,
             subdirectory=config.YAML_SUBDIRECTORY
         )
         
-        # Parse YAML documents
-        docs = list(yaml.safe_load_all(content))
-        if len(docs) < 2:
-            raise ValueError(f"Invalid YAML structure in {file_name}")
-        
-        vm_config = docs[0]
-        service_config = docs[1]
-        
-        # Extract configuration for editing
-        return _parse_vm_config_for_edit(vm_config, service_config)
+        def parse():
+            # Parse YAML documents
+            docs = list(yaml.load_all(snapshot.read_blob(blob_sha), Loader=YAML_LOADER))
+            if len(docs) < 2:
+                raise ValueError(f"Invalid YAML structure in {file_name}")
+            
+            vm_config = docs[0]
+            service_config = docs[1]
+            
+            # Extract configuration for editing
+            return _parse_vm_config_for_edit(vm_config, service_config)
+        
+        # Copied so the caller can modify the form data without touching the cache
+        return copy.deepcopy(_manifest_cache.get_or_compute(('edit', blob_sha), parse))
         
     except GitOperationError:
         raise
@@ -324,9 +380,9 @@ def _parse_vm_config_for_edit(vm_config: Dict, service_config: Dict) -> Dict[str
         if key != 'kubevirt.io/vm':
             tags.append({'key': key, 'value': value})
     
-    # Get memory value
+    # Get memory value in whole GB as the template writes it (<n>G; accepts 8G, 8Gi, 8192Mi, ...)
     memory_str = domain.get('resources', {}).get('requests', {}).get('memory', '1G')
-    memory = int(memory_str.rstrip('G'))
+    memory = whole_gigabytes(memory_str)
     
     # Get storage
     data_volume = spec.get('dataVolumeTemplates', [{}])[0]
@@ -335,7 +391,7 @@ def _parse_vm_config_for_edit(vm_config: Dict, service_config: Dict) -> Dict[str
                    .get('resources', {})
                    .get('requests', {})
                    .get('storage', '10Gi'))
-    storage_size = int(storage_str.rstrip('Gi'))
+    storage_size = whole_gigabytes(storage_str, binary=True)
     
     storage_access_mode = (data_volume.get('spec', {})
                            .get('storage', {})
@@ -368,6 +424,8 @@ def _parse_vm_config_for_edit(vm_config: Dict, service_config: Dict) -> Dict[str
         'cpu_cores': domain.get('cpu', {}).get('cores', 1),
         'memory': memory,
         'storage_size': storage_size,
+        'memory_quantity': str(memory_str),
+        'storage_quantity': str(storage_str),
         'storage_class': data_volume.get('spec', {}).get('storage', {}).get('storageClassName', 'longhorn-rwx'),
         'storage_access_mode': storage_access_mode,
         'image_url': data_volume.get('spec', {}).get('source', {}).get('http', {}).get('url', ''),
@@ -379,6 +437,22 @@ def _parse_vm_config_for_edit(vm_config: Dict, service_config: Dict) -> Dict[str
     }
 
 
+def keep_unchanged_quantities(form_data: Dict[str, Any], vm_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Carry the stored memory and storage quantities into edited form data.
+
+    The edit form shows them rounded to whole gigabytes; when the user left
+    a field at that value the stored quantity (e.g. 8Gi or 512Mi) is written
+    back unchanged rather than the rounded one.
+    """
+    form_data = dict(form_data)
+    if form_data.get('memory') == vm_config.get('memory'):
+        form_data['memory_quantity'] = vm_config.get('memory_quantity')
+    if form_data.get('storage_size') == vm_config.get('storage_size'):
+        form_data['storage_quantity'] = vm_config.get('storage_quantity')
+    return form_data
+
+
 def update_vm_config(config: Config, vm_name: str, form_data: Dict[str, Any]) -> str:
     """
     Update VM configuration in Git repository.
@@ -398,16 +472,8 @@ def update_vm_config(config: Config, vm_name: str, form_data: Dict[str, Any]) ->
         yaml_content = generate_yaml(form_data, config)
         
         # Commit changes
-        git_mgr = get_git_manager(config)
-        file_name = f"{vm_name}{YAML_EXTENSION}"
         commit_message = GIT_COMMIT_MESSAGE_UPDATE.format(vm_name=vm_name)
-        
-        commit_sha = git_mgr.commit_file(
-            file_path=file_name,
-            content=yaml_content,
-            commit_message=commit_message,
-            subdirectory=config.YAML_SUBDIRECTORY
-        )
+        commit_sha = _queue_write(config, config.YAML_SUBDIRECTORY, vm_name, yaml_content, commit_message)
         
         logger.info(f"Successfully updated VM configuration: {commit_sha}")
         return commit_sha
@@ -431,15 +497,8 @@ def delete_vm_config(config: Config, vm_name: str) -> str:
     logger.info(f"Deleting configuration for VM: {vm_name}")
     
     try:
-        git_mgr = get_git_manager(config)
-        file_name = f"{vm_name}{YAML_EXTENSION}"
         commit_message = GIT_COMMIT_MESSAGE_DELETE.format(vm_name=vm_name)
-        
-        commit_sha = git_mgr.delete_file(
-            file_path=file_name,
-            commit_message=commit_message,
-            subdirectory=config.YAML_SUBDIRECTORY
-        )
+        commit_sha = _queue_write(config, config.YAML_SUBDIRECTORY, vm_name, None, commit_message)
         
         logger.info(f"Successfully deleted VM configuration: {commit_sha}")
         return commit_sha
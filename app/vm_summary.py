@@ -0,0 +1,52 @@
+"""Compact records for the cluster VM list view.
+
+Only the fields rendered by ``cluster_vms.html`` are kept; heavy fields such
+as VMI conditions and cloud-init user data are served on demand by
+``/api/vm/<name>/details``.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Union
+
+# Annotation set by MetalLB on Services it assigned an address to
+ANNOTATION_METALLB_ALLOCATED_POOL = "metallb.io/ip-allocated-from-pool"
+
+
+@dataclass(slots=True)
+class PortSummary:
+    """One Service port as shown in the list view."""
+    name: Optional[str]
+    port: int
+    target_port: Union[int, str, None]
+    protocol: Optional[str]
+
+
+@dataclass(slots=True)
+class ServiceSummary:
+    """The parts of a VM's Service shown in the list view."""
+    type: Optional[str]
+    cluster_ip: Optional[str]
+    external_ips: Tuple[str, ...] = ()
+    ports: Tuple[PortSummary, ...] = ()
+    hostname: Optional[str] = None
+    address_pool: Optional[str] = None
+
+
+@dataclass(slots=True)
+class VMSummary:
+    """A VirtualMachine row in the cluster view."""
+    name: str
+    namespace: str
+    running: bool
+    status: str
+    cpu_cores: Union[int, str]
+    memory: str
+    created: str
+    labels: Dict[str, str] = field(default_factory=dict)
+    # VMI details; phase is None when no VMI exists
+    phase: Optional[str] = None
+    node: Optional[str] = None
+    ready: Optional[bool] = None
+    ip_addresses: Tuple[str, ...] = ()
+    service: Optional[ServiceSummary] = None
+    service_stale: bool = False
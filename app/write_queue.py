@@ -0,0 +1,151 @@
+"""Group commit for Git writes.
+
+Every create, edit and delete used to run its own transaction: a sync, a
+commit and a synchronous push, one request at a time. ``GitWriteQueue``
+hands changes to a single writer thread instead, which gathers whatever
+arrives within a short window (and everything queued while the previous
+push was in flight) into one commit and one push. Each submitter gets a
+``Future`` that resolves to the SHA of the commit holding its change.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from app.git_manager import GitChangeError, GitOperationError, GitOperationManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriteRequest:
+    """One queued change: content None deletes path."""
+    path: str
+    content: Optional[str]
+    message: str
+    future: Future = field(default_factory=Future)
+
+
+class GitWriteQueue:
+    """
+    Write-behind queue that coalesces changes into batched commits.
+
+    If a batched commit fails because of one change (GitChangeError, e.g.
+    a request deletes a file that does not exist), its requests are retried
+    one commit each so a bad change only fails its own submitter. Any other
+    failure (sync, push, network, authentication) fails the whole batch at
+    once rather than repeating it per change.
+    """
+
+    def __init__(self, git_manager: GitOperationManager, window: float = 0.05, max_batch: int = 100):
+        """
+        Args:
+            git_manager: Manager whose transactions apply the batches
+            window: Seconds to wait for more changes after the first one
+            max_batch: Most changes per commit
+        """
+        self.git_manager = git_manager
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._pending: Deque[WriteRequest] = deque()
+        self._cond = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self.batches = 0
+        self.changes = 0
+        self.failed = 0
+        self.last_batch: Dict[str, Any] = {}
+
+    def submit(self, path: str, content: Optional[str], message: str) -> Future:
+        """
+        Queue a change to path (relative to the repository root) and return
+        a Future for its commit SHA; it raises GitOperationError on failure.
+        """
+        request = WriteRequest(path, content, message)
+        with self._cond:
+            self._pending.append(request)
+            self._start_writer()
+            self._cond.notify()
+        return request.future
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._pending),
+            'batches': self.batches,
+            'changes': self.changes,
+            'failed': self.failed,
+            'last_batch': self.last_batch,
+        }
+
+    def _start_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name='git-writer', daemon=True)
+            self._writer.start()
+
+    def _next_batch(self) -> List[WriteRequest]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+        # Submitters that timed out cancel their pending futures; skip those
+        return [request for request in batch if request.future.set_running_or_notify_cancel()]
+
+    def _write_loop(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._apply(batch)
+            except Exception as e:
+                logger.error(f"Unexpected error in Git writer: {e}", exc_info=True)
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(GitOperationError(f"Write failed: {e}"))
+
+    def _apply(self, batch: List[WriteRequest]):
+        start = time.monotonic()
+        try:
+            sha = self.git_manager.apply_changes(
+                [(request.path, request.content) for request in batch], self._commit_message(batch)
+            )
+        except GitChangeError as e:
+            if len(batch) == 1:
+                self.failed += 1
+                batch[0].future.set_exception(e)
+                return
+            logger.warning(f"Batch of {len(batch)} changes failed ({e}), committing them one by one")
+            for request in batch:
+                self._apply([request])
+            return
+        except GitOperationError as e:
+            # Not caused by a particular change; retrying each would only
+            # repeat the failing sync or push once per request
+            self.failed += len(batch)
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        self.batches += 1
+        self.changes += len(batch)
+        self.last_batch = {
+            'changes': len(batch),
+            'commit': sha,
+            'duration_ms': round((time.monotonic() - start) * 1000, 1),
+        }
+        for request in batch:
+            request.future.set_result(sha)
+
+    @staticmethod
+    def _commit_message(batch: List[WriteRequest]) -> str:
+        if len(batch) == 1:
+            return batch[0].message
+        return f"Apply {len(batch)} VM changes\n\n" + '\n'.join(f"- {request.message}" for request in batch)
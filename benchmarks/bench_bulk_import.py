@@ -0,0 +1,71 @@
+"""Bulk VM import: one commit for the whole file vs one transaction per VM.
+
+Usage:
+    python benchmarks/bench_bulk_import.py [--vms 1000] [--sample 20]
+
+Against a local bare repository, imports a --vms row CSV through
+app.bulk_import.import_vms (validate every row, render, one commit and
+push) and times --sample VMs created one by one through commit_to_git, as
+the create form does, extrapolated to --vms.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import git_fixtures  # noqa: E402
+
+CSV_HEADER = "vm_name,cpu_cores,memory,storage_size,image_url,tags,service_ports,hostname\n"
+
+
+def csv_rows(prefix, count):
+    return ''.join(
+        f"{prefix}-{i:05d},2,4,20,https://example.invalid/images/debian-12.qcow2,"
+        f"team=bench;batch={prefix},ssh:22;http:80:8080,{prefix}-{i:05d}.example.com\n"
+        for i in range(count)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=1000)
+    parser.add_argument('--sample', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        origin = os.path.join(root, 'origin.git')
+        git_fixtures.bench_env(origin, os.path.join(root, 'clones'))
+        git_fixtures.make_origin(origin, 10)
+        os.chdir(root)  # create_app writes app.log to the working directory
+
+        from config import Config
+        from app import create_app, utils
+        from app.bulk_import import import_vms
+        create_app()
+        logging.disable(logging.ERROR)
+        utils.get_git_manager(Config).ensure_repository()
+
+        start = time.perf_counter()
+        result = import_vms(CSV_HEADER + csv_rows('bulk', args.vms), Config, 'csv')
+        bulk = time.perf_counter() - start
+        assert not result.errors and len(result.imported) == args.vms, result.errors[:3]
+
+        start = time.perf_counter()
+        for i in range(args.sample):
+            name = f"single-{i:05d}"
+            utils.commit_to_git(git_fixtures.render_manifest(name), name, Config.YAML_SUBDIRECTORY, {})
+        per_vm = (time.perf_counter() - start) / args.sample
+
+        print(f"Importing {args.vms} VMs")
+        print(f"  bulk import (1 commit):        {bulk:7.2f} s")
+        print(f"  one commit per VM (estimated): {per_vm * args.vms:7.2f} s   "
+              f"({per_vm * 1000:.0f} ms/VM over {args.sample} VMs)")
+
+
+if __name__ == '__main__':
+    main()
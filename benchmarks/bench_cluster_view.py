@@ -0,0 +1,90 @@
+"""First paint of the cluster VM view with server-side filtering and paging.
+
+Usage:
+    python benchmarks/bench_cluster_view.py [--vms 5000] [--runs 20]
+
+Serves a fleet from the fake API server with the informer cache enabled and
+compares rendering every VM into cluster_vms.html (the view before paging)
+against GET /cluster-vms for the default page and a few filtered queries,
+which are answered from the cache's secondary indexes.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_apiserver import FakeApiServer, build_fleet, make_clients  # noqa: E402
+
+QUERIES = [
+    ('default page', ''),
+    ('phase=stopped', 'phase=stopped'),
+    ('node + label', 'node=node-3&label=role%3Ddb'),
+    ('name prefix', 'name=vm-012'),
+    ('newest, page 40', 'sort=-created&page=40'),
+]
+
+
+def timed(func, runs):
+    """Run func ``runs`` times and return (median ms, last result)."""
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    resources = build_fleet(args.vms)
+    for i, vm in enumerate(resources['virtualmachines']):
+        if i % 4 == 0:
+            vm['status']['printableStatus'] = 'Stopped'
+        if i % 10 == 0:
+            vm['metadata']['labels']['role'] = 'db'
+        vm['metadata']['creationTimestamp'] = f"2025-01-{1 + i % 28:02d}T{i % 24:02d}:00:00Z"
+    server = FakeApiServer(resources).start()
+    clients = make_clients(server.url)
+
+    os.environ.setdefault('GIT_REPO_URL', 'https://example.invalid/vms.git')
+    os.environ.setdefault('GIT_USERNAME', 'bench')
+    os.environ.setdefault('GIT_TOKEN', 'bench')
+    os.environ['CLUSTER_VMS_ENABLED'] = 'true'
+    os.environ['K8S_CACHE_ENABLED'] = 'true'
+    from flask import render_template
+    from app import create_app, k8s_utils
+
+    k8s_utils.get_kubernetes_client = lambda: clients
+    app = create_app()
+    client = app.test_client()
+    client.get('/cluster-vms')  # start the informers and wait for the initial sync
+
+    print(f"Fleet: {args.vms} VMs, median of {args.runs} runs")
+
+    def render_all():
+        with app.test_request_context('/cluster-vms'):
+            return render_template('cluster_vms.html', vms=k8s_utils.list_running_vms(), version='bench')
+
+    elapsed, html = timed(render_all, args.runs)
+    print(f"  {'all VMs (before)':18} {elapsed:8.1f} ms   html: {len(html) / 1024:8.0f} KiB")
+
+    for label, query in QUERIES:
+        elapsed, response = timed(lambda: client.get(f"/cluster-vms?{query}"), args.runs)
+        print(f"  {label:18} {elapsed:8.1f} ms   html: {len(response.data) / 1024:8.0f} KiB   "
+              f"status: {response.status_code}")
+
+    k8s_utils.get_cluster_cache().stop()
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
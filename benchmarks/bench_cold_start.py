@@ -0,0 +1,140 @@
+"""First request after a restart with full, shallow, partial and sparse clones.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--vms 500] [--other-files 1000] [--history 100]
+
+Builds a local GitOps repository holding --vms manifests in
+YAML_SUBDIRECTORY next to --other-files unrelated files (8 KB each, as other
+apps' manifests and assets), rewritten in batches over --history commits.
+Each clone mode then starts in a fresh process with an empty clone
+directory; it times the first GET / (which clones the repository), checks
+every VM is listed and commits one edit, and reports the clone's size on
+disk. The origin is reached through a file:// URL, since git ignores
+--depth and --filter for plain local paths.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import git_fixtures  # noqa: E402
+
+MODES = [
+    ('full clone', {}),
+    ('depth 1', {'GIT_CLONE_DEPTH': '1'}),
+    ('blob:none + sparse', {'GIT_CLONE_FILTER': 'blob:none', 'GIT_SPARSE_CHECKOUT': 'true'}),
+    ('depth 1 + blob:none', {'GIT_CLONE_DEPTH': '1', 'GIT_CLONE_FILTER': 'blob:none'}),
+    ('depth 1 + blob:none + sparse', {'GIT_CLONE_DEPTH': '1', 'GIT_CLONE_FILTER': 'blob:none',
+                                      'GIT_SPARSE_CHECKOUT': 'true'}),
+]
+OTHER_FILE_SIZE = 8 * 1024
+
+
+def other_file(rng):
+    return base64.b64encode(rng.randbytes(OTHER_FILE_SIZE * 3 // 4)).decode()
+
+
+def make_history(origin, root, other_files, history):
+    """Add other_files unrelated files to origin and rewrite them over history commits."""
+    rng = random.Random(42)
+    work = os.path.join(root, 'history')
+    git_fixtures.git(root, 'clone', '-q', origin, work)
+    paths = [os.path.join('apps', f"app-{index % 50:02d}", f"file-{index:05d}.txt") for index in range(other_files)]
+    for path in paths:
+        os.makedirs(os.path.join(work, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(work, path), 'w') as f:
+            f.write(other_file(rng))
+    git_fixtures.git(work, 'add', '.')
+    git_fixtures.git(work, 'commit', '-q', '-m', f"Add {other_files} files")
+    per_commit = max(1, other_files // 10)
+    for commit in range(history):
+        for path in rng.sample(paths, per_commit):
+            with open(os.path.join(work, path), 'w') as f:
+                f.write(other_file(rng))
+        git_fixtures.git(work, 'commit', '-q', '-am', f"Update apps ({commit})")
+    git_fixtures.git(work, 'push', '-q', 'origin', 'main')
+    # Partial clones fetch missing blobs by object ID
+    git_fixtures.git(origin, 'config', 'uploadpack.allowFilter', 'true')
+    git_fixtures.git(origin, 'config', 'uploadpack.allowAnySHA1InWant', 'true')
+
+
+def disk_usage(path):
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def child(vms):
+    """Runs in a fresh process: first request, VM count and one write."""
+    import logging
+    from config import Config
+    from app import create_app, utils
+    app = create_app()
+    logging.disable(logging.CRITICAL)
+    client = app.test_client()
+
+    start = time.perf_counter()
+    response = client.get('/')
+    first_ms = (time.perf_counter() - start) * 1000
+    assert response.status_code == 200, response.status_code
+    listed = len(utils.get_vm_list(Config))
+
+    name = git_fixtures.vm_name(0)
+    start = time.perf_counter()
+    utils.get_git_manager(Config).apply_changes(
+        [(f"{git_fixtures.SUBDIRECTORY}{name}.yaml", git_fixtures.render_manifest(name, cpu_cores=8))],
+        f"Resize {name}"
+    )
+    write_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({'first_ms': first_ms, 'write_ms': write_ms, 'listed': listed, 'expected': vms}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=500)
+    parser.add_argument('--other-files', type=int, default=1000)
+    parser.add_argument('--history', type=int, default=100)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.vms)
+
+    with tempfile.TemporaryDirectory() as root:
+        origin = os.path.join(root, 'origin.git')
+        git_fixtures.bench_env(origin, os.path.join(root, 'clones'))
+        git_fixtures.make_origin(origin, args.vms)
+        make_history(origin, root, args.other_files, args.history)
+        print(f"{args.vms} VMs, {args.other_files} other files, {args.history + 2} commits; "
+              f"origin {disk_usage(origin) / 2**20:.1f} MiB")
+        print(f"  {'':30} {'first GET /':>12} {'clone size':>11} {'one write':>10}")
+
+        for label, overrides in MODES:
+            clone_dir = os.path.join(root, 'clones-' + label.replace(' ', '').replace('+', '-').replace(':', ''))
+            env = dict(os.environ, GIT_REPO_URL=f"file://{origin}", GIT_CLONE_DIR=clone_dir,
+                       GIT_SYNC_INTERVAL='0', **overrides)
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', '--vms', str(args.vms)],
+                                    env=env, cwd=root, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"  {label:30} failed:\n{result.stderr[-2000:]}")
+                continue
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            listed = '' if stats['listed'] == stats['expected'] else f"  ONLY {stats['listed']} VMs LISTED"
+            size = disk_usage(os.path.join(clone_dir, 'repo')) / 2**20
+            print(f"  {label:30} {stats['first_ms']:9.0f} ms {size:7.1f} MiB {stats['write_ms']:7.0f} ms{listed}")
+
+
+if __name__ == '__main__':
+    main()
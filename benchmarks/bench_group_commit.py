@@ -0,0 +1,92 @@
+"""Git write throughput: one transaction per change vs the group-commit queue.
+
+Usage:
+    python benchmarks/bench_group_commit.py [--writers 10] [--changes 100] [--window 0.05]
+
+Against a local bare repository, --writers threads (concurrent requests)
+commit --changes manifest edits in total, first each through its own
+transaction (sync, commit, push, as create/edit/delete used to) and then
+through GitWriteQueue, which coalesces concurrent edits into one commit and
+push. Reports changes per second, commits pushed and per-request latency.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import git_fixtures  # noqa: E402
+
+
+def commit_count(origin):
+    import subprocess
+    result = subprocess.run(['git', 'rev-list', '--count', 'main'], cwd=origin,
+                            capture_output=True, text=True, check=True)
+    return int(result.stdout)
+
+
+def run(writers, changes, write):
+    """Run write(index) for every change from writers threads; return (seconds, latencies ms)."""
+    def timed(index):
+        start = time.perf_counter()
+        write(index)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        latencies = list(pool.map(timed, range(changes)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=10)
+    parser.add_argument('--changes', type=int, default=100)
+    parser.add_argument('--window', type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        origin = os.path.join(root, 'origin.git')
+        git_fixtures.bench_env(origin, os.path.join(root, 'clones'))
+        git_fixtures.make_origin(origin, args.changes)
+        os.chdir(root)  # create_app writes app.log to the working directory
+
+        from config import Config
+        from app import create_app, utils
+        from app.write_queue import GitWriteQueue
+        create_app()
+        logging.disable(logging.ERROR)
+        git_mgr = utils.get_git_manager(Config)
+        git_mgr.ensure_repository()
+
+        def edit(index, revision):
+            name = git_fixtures.vm_name(index)
+            return f"{git_fixtures.SUBDIRECTORY}{name}.yaml", git_fixtures.render_manifest(name, cpu_cores=revision)
+
+        def direct(index):
+            path, content = edit(index, 3)
+            git_mgr.apply_changes([(path, content)], f"Update VM {index}")
+
+        queue = GitWriteQueue(git_mgr, window=args.window)
+
+        def queued(index):
+            path, content = edit(index, 4)
+            queue.submit(path, content, f"Update VM {index}").result()
+
+        print(f"{args.changes} VM edits from {args.writers} concurrent writers")
+        for label, write in (('transaction per change', direct), ('group-commit queue', queued)):
+            commits = commit_count(origin)
+            seconds, latencies = run(args.writers, args.changes, write)
+            commits = commit_count(origin) - commits
+            print(f"  {label:24} {args.changes / seconds:7.1f} changes/s  {commits:4d} commits  "
+                  f"latency median {statistics.median(latencies):7.0f} ms, max {max(latencies):7.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
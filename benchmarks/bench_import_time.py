@@ -0,0 +1,90 @@
+"""Worker boot cost: importing the app and building it with create_app().
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--top 15]
+
+Runs ``python -X importtime`` in fresh interpreters (as every gunicorn
+worker does) with CLUSTER_VMS_ENABLED off and on, then reports the median
+cumulative import time up to the blueprint, the slowest imports two levels deep
+and which heavy dependencies are loaded at boot and after a first
+/cluster-vms request. kubernetes, paramiko, websocket, git and cryptography
+should only appear once their feature is used, and kubernetes never while
+the cluster view is disabled.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('kubernetes', 'paramiko', 'websocket', 'git', 'cryptography')
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+BOOT_SCRIPT = """
+import sys
+from app import create_app
+app = create_app()
+print('heavy:' + ','.join(m for m in {heavy!r} if m in sys.modules))
+app.test_client().get('/cluster-vms')
+print('heavy:' + ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def boot(cluster_vms_enabled, workdir):
+    """
+    Boot the app once and request /cluster-vms. Returns (import ms to boot,
+    [(cumulative us, module)] for imports up to two levels deep, heavy
+    modules loaded at boot, heavy modules loaded after the request).
+    """
+    env = dict(os.environ, GIT_REPO_URL='https://example.invalid/vms.git', GIT_USERNAME='bench',
+               GIT_TOKEN='bench', CLUSTER_VMS_ENABLED=str(cluster_vms_enabled).lower(),
+               K8S_CACHE_ENABLED='false', KUBECONFIG=os.devnull, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT.format(heavy=HEAVY_MODULES)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    imports = []
+    boot_us = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        cumulative, depth, module = int(match.group(2)), (len(match.group(3)) + 1) // 2, match.group(4)
+        if depth == 1:
+            boot_us += cumulative
+        if depth <= 2 and module != 'app':
+            imports.append((cumulative, module))
+        if module == 'app.routes':
+            # Anything imported after the blueprint is request-time work
+            break
+    # create_app() logs to stdout as well; only the marked lines are ours
+    reports = [line[len('heavy:'):] for line in result.stdout.splitlines() if line.startswith('heavy:')]
+    at_boot, after_request = ([m for m in report.split(',') if m] for report in reports)
+    return boot_us / 1000, imports, at_boot, after_request
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    # Run from a scratch directory so create_app's app.log lands there
+    with tempfile.TemporaryDirectory() as workdir:
+        for enabled in (False, True):
+            samples = [boot(enabled, workdir) for _ in range(args.runs)]
+            _, imports, at_boot, after_request = samples[-1]
+            print(f"CLUSTER_VMS_ENABLED={str(enabled).lower()}: import time "
+                  f"{statistics.median(sample[0] for sample in samples):7.1f} ms (median of {args.runs})")
+            print(f"  heavy modules at boot:          {', '.join(at_boot) or 'none'}")
+            print(f"  after first /cluster-vms:       {', '.join(after_request) or 'none'}")
+            for cumulative, module in sorted(imports, reverse=True)[:args.top]:
+                print(f"    {cumulative / 1000:7.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
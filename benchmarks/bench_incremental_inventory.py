@@ -0,0 +1,99 @@
+"""VM inventory refresh after a commit: incremental diff vs full rescan.
+
+Usage:
+    python benchmarks/bench_incremental_inventory.py [--vms 20000] [--changes 1,10,100] [--runs 3]
+
+Commits --vms rendered manifests to a local bare repository, indexes them
+once, then pushes commits that modify (and add/delete) --changes manifests
+and times bringing the inventory up to the new HEAD: applying the
+``git diff-tree`` between the indexed and new commits, against re-listing
+and re-checking every file. Parsed manifests stay cached in both cases, so
+the difference is the cost of looking at unchanged files.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import git_fixtures  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=20000)
+    parser.add_argument('--changes', default='1,10,100')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    change_sizes = [int(size) for size in args.changes.split(',')]
+
+    with tempfile.TemporaryDirectory() as root:
+        origin = os.path.join(root, 'origin.git')
+        # Room for every parsed manifest, so a full rescan parses nothing again
+        git_fixtures.bench_env(origin, os.path.join(root, 'clones'), VM_MANIFEST_CACHE_SIZE=2 * args.vms + 1000)
+        git_fixtures.make_origin(origin, args.vms)
+        os.chdir(root)  # create_app writes app.log to the working directory
+
+        from config import Config
+        from app import create_app, utils
+        create_app()
+        logging.disable(logging.ERROR)
+        git_mgr = utils.get_git_manager(Config)
+        git_mgr.ensure_repository()
+        inventory = utils.get_inventory(Config)
+
+        start = time.perf_counter()
+        count = len(utils.get_vm_list(Config))
+        print(f"Inventory of {count} manifests, first index (parse all): "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+        next_vm = args.vms
+        revision = 2
+        print(f"Refresh to a new commit, median of {args.runs}:")
+        print(f"  {'files changed':>13}  {'incremental':>12}  {'full rescan':>12}")
+        for size in change_sizes:
+            incremental, full = [], []
+            for _ in range(args.runs):
+                # Modify size - 2 manifests, add one and delete one (or just
+                # modify one); every commit resizes to a new CPU count
+                revision += 1
+                modified = size - 2 if size >= 3 else size
+                changes = {
+                    f"{git_fixtures.SUBDIRECTORY}{git_fixtures.vm_name(i)}.yaml":
+                        git_fixtures.render_manifest(git_fixtures.vm_name(i), cpu_cores=revision)
+                    for i in range(modified)
+                }
+                if modified < size:
+                    name = git_fixtures.vm_name(next_vm)
+                    changes[f"{git_fixtures.SUBDIRECTORY}{name}.yaml"] = git_fixtures.render_manifest(name)
+                    changes[f"{git_fixtures.SUBDIRECTORY}{git_fixtures.vm_name(next_vm - 1)}.yaml"] = None
+                    next_vm += 1
+                git_fixtures.push_changes(origin, changes, f"Change {size} VMs")
+                # Fetch without the sync listener indexing the commit for us
+                listeners, git_mgr._sync_listeners = git_mgr._sync_listeners, []
+                git_mgr.sync(force=True)
+                git_mgr._sync_listeners = listeners
+                snapshot = git_mgr.snapshot()
+
+                start = time.perf_counter()
+                inventory.refresh(snapshot)
+                incremental.append((time.perf_counter() - start) * 1000)
+                assert inventory.last_refresh['mode'] == 'incremental'
+                assert inventory.last_refresh['changed'] + inventory.last_refresh['deleted'] == size
+                expected = inventory.vms(snapshot)
+
+                inventory.reset()
+                start = time.perf_counter()
+                inventory.refresh(snapshot)
+                full.append((time.perf_counter() - start) * 1000)
+                assert inventory.vms(snapshot) == expected
+            print(f"  {size:>13}  {statistics.median(incremental):9.1f} ms  {statistics.median(full):9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Cluster view latency: direct LIST calls vs. the informer cache.
+
+Usage:
+    python benchmarks/bench_informer_cache.py [--vms 2000] [--rounds 5]
+
+Runs ``list_running_vms`` and a single-VM status lookup against a local fake
+API server, first with ``K8S_CACHE_ENABLED=false`` (three cluster-wide LISTs
+or two GETs per request) and then with the informer cache warm.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_apiserver import FakeApiServer, build_fleet, make_clients  # noqa: E402
+
+
+def timed(func, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return min(samples) * 1000, sum(samples) / len(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    server = FakeApiServer(build_fleet(args.vms)).start()
+    clients = make_clients(server.url)
+
+    from config import Config
+    from app import k8s_utils
+
+    k8s_utils.get_kubernetes_client = lambda: clients
+
+    def status_lookup():
+        k8s_utils.get_kubevirt_object('virtualmachines', 'virtualmachines', 'vm-00042')
+        k8s_utils.get_kubevirt_object('virtualmachineinstances', 'virtualmachines', 'vm-00042')
+
+    print(f"Fleet: {args.vms} VMs, {args.rounds} rounds (best / mean, ms)")
+    for enabled in (False, True):
+        Config.K8S_CACHE_ENABLED = enabled
+        if enabled:
+            start = time.perf_counter()
+            k8s_utils.get_cluster_cache()
+            print(f"  informer initial sync: {(time.perf_counter() - start) * 1000:.1f} ms")
+        label = 'cache' if enabled else 'direct'
+        server.reset_counters()
+        best, mean = timed(k8s_utils.list_running_vms, args.rounds)
+        print(f"  [{label:6}] list_running_vms: {best:8.1f} / {mean:8.1f}   API requests: {server.requests}")
+        server.reset_counters()
+        best, mean = timed(status_lookup, args.rounds * 20)
+        print(f"  [{label:6}] status lookup:    {best:8.3f} / {mean:8.3f}   API requests: {server.requests}")
+
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Index page with the blob-SHA-keyed manifest cache, cold vs warm.
+
+Usage:
+    python benchmarks/bench_inventory_cache.py [--vms 5000] [--runs 5]
+
+Commits --vms rendered manifests to a local bare repository and times
+GET / through the Flask test client, and get_vm_list alone (the page also
+renders every VM): cold (empty cache, every manifest parsed), warm (nothing
+changed) and after one VM was changed upstream (only that manifest is
+re-parsed).
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import git_fixtures  # noqa: E402
+
+
+def timed_get(client, path='/'):
+    start = time.perf_counter()
+    response = client.get(path)
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        origin = os.path.join(root, 'origin.git')
+        git_fixtures.bench_env(origin, os.path.join(root, 'clones'))
+        git_fixtures.make_origin(origin, args.vms)
+        os.chdir(root)  # create_app writes app.log to the working directory
+
+        from config import Config
+        from app import create_app, utils
+        app = create_app()
+        logging.disable(logging.ERROR)
+        client = app.test_client()
+        utils.get_git_manager(Config).ensure_repository()  # clone outside the timings
+
+        def list_ms():
+            start = time.perf_counter()
+            utils.get_vm_list(Config)
+            return (time.perf_counter() - start) * 1000
+
+        cold, cold_list = [], []
+        for _ in range(args.runs):
+            utils._manifest_cache.clear()
+            cold.append(timed_get(client))
+            utils._manifest_cache.clear()
+            cold_list.append(list_ms())
+        warm = [timed_get(client) for _ in range(args.runs)]
+        warm_list = [list_ms() for _ in range(args.runs)]
+
+        git_fixtures.push_change(
+            origin, f"{git_fixtures.SUBDIRECTORY}{git_fixtures.vm_name(1)}.yaml",
+            git_fixtures.render_manifest(git_fixtures.vm_name(1), cpu_cores=4), "Resize one VM"
+        )
+        utils.get_git_manager(Config).sync(force=True)
+        misses = utils._manifest_cache.misses
+        changed = timed_get(client)
+        reparsed = utils._manifest_cache.misses - misses
+
+        print(f"Index page, {args.vms} manifests (median of {args.runs})")
+        print(f"  {'':26}  {'GET /':>10}  {'get_vm_list':>12}")
+        print(f"  cold (parse everything):  {statistics.median(cold):8.1f} ms  {statistics.median(cold_list):9.1f} ms")
+        print(f"  warm (nothing changed):   {statistics.median(warm):8.1f} ms  {statistics.median(warm_list):9.1f} ms")
+        print(f"  one VM changed upstream:  {changed:8.1f} ms   ({reparsed} manifest re-parsed)")
+        print(f"  cache entries: {len(utils._manifest_cache)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Writes while another actor keeps pushing to the same branch.
+
+Usage:
+    python benchmarks/bench_push_contention.py [--writes 40] [--ci-interval 0.2] [--overlap 0.5]
+
+Against a local bare repository, a "CI" thread pushes a commit every
+--ci-interval seconds from its own clone while the portal commits --writes
+VM edits through apply_changes. --overlap is the share of CI commits that
+touch the very file the portal is editing (so the rebase conflicts and the
+change is re-applied). Runs once with GIT_PUSH_RETRIES=0 (the old
+behaviour: a rejected push rolls back and the edit is lost) and once with
+the default retries, reporting lost edits and the push counters.
+"""
+
+import argparse
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import git_fixtures  # noqa: E402
+
+
+class CIPusher(threading.Thread):
+    """Pushes small commits to origin from its own clone until stopped."""
+
+    def __init__(self, origin, work, interval, overlap, target):
+        super().__init__(daemon=True)
+        self.origin, self.work, self.interval, self.overlap = origin, work, interval, overlap
+        self.target = target  # callable returning the path the portal is editing
+        self.stop = threading.Event()
+        self.pushed = 0
+        self.rng = random.Random(7)
+
+    def run(self):
+        git_fixtures.git(os.path.dirname(self.work), 'clone', '-q', self.origin, self.work)
+        counter = 0
+        while not self.stop.wait(self.interval):
+            counter += 1
+            if self.rng.random() < self.overlap:
+                path = self.target()
+            else:
+                path = f"{git_fixtures.SUBDIRECTORY}ci-{counter % 10}.yaml"
+            try:
+                git_fixtures.git(self.work, 'fetch', '-q', 'origin')
+                git_fixtures.git(self.work, 'reset', '-q', '--hard', 'origin/main')
+                full_path = os.path.join(self.work, path)
+                with open(full_path, 'a') as f:
+                    f.write(f"# ci {counter}\n")
+                git_fixtures.git(self.work, 'add', '-A')
+                git_fixtures.git(self.work, 'commit', '-q', '-m', f"CI {counter}")
+                git_fixtures.git(self.work, 'push', '-q', 'origin', 'HEAD:main')
+                self.pushed += 1
+            except subprocess.CalledProcessError:
+                pass  # lost the race to the portal; try again next tick
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writes', type=int, default=40)
+    parser.add_argument('--ci-interval', type=float, default=0.2)
+    parser.add_argument('--overlap', type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        origin = os.path.join(root, 'origin.git')
+        git_fixtures.bench_env(origin, os.path.join(root, 'clones'))
+        git_fixtures.make_origin(origin, 20)
+        os.chdir(root)  # create_app writes app.log to the working directory
+
+        from config import Config
+        from app import create_app, utils
+        from app.git_manager import GitOperationError
+        create_app()
+        logging.disable(logging.CRITICAL)
+        git_mgr = utils.get_git_manager(Config)
+        git_mgr.ensure_repository()
+        default_retries = Config.GIT_PUSH_RETRIES
+
+        print(f"{args.writes} portal edits while CI pushes every {args.ci_interval * 1000:.0f} ms "
+              f"({args.overlap:.0%} of CI commits touch the file being edited)")
+        for label, retries in (('no retries (rollback)', 0), (f"{default_retries} retries", default_retries)):
+            Config.GIT_PUSH_RETRIES = retries
+            git_mgr._push_stats = dict.fromkeys(git_mgr._push_stats, 0)
+            current = {'path': f"{git_fixtures.SUBDIRECTORY}{git_fixtures.vm_name(0)}.yaml"}
+            ci = CIPusher(origin, os.path.join(root, f"ci-{retries}"), args.ci_interval, args.overlap,
+                          lambda: current['path'])
+            ci.start()
+            time.sleep(0.5)
+
+            lost = 0
+            start = time.perf_counter()
+            for i in range(args.writes):
+                name = git_fixtures.vm_name(i % 20)
+                current['path'] = f"{git_fixtures.SUBDIRECTORY}{name}.yaml"
+                content = git_fixtures.render_manifest(name, cpu_cores=(i % 8) + 1)
+                try:
+                    git_mgr.apply_changes([(current['path'], content)], f"Update {name} ({i})")
+                except GitOperationError:
+                    lost += 1
+            elapsed = time.perf_counter() - start
+            ci.stop.set()
+            ci.join()
+
+            stats = git_mgr._push_stats
+            print(f"  {label:22} lost {lost:3d}/{args.writes}  {elapsed:6.1f} s  CI pushes {ci.pushed:4d}  "
+                  f"rejected {stats['rejected']:3d}  rebased {stats['rebased']:3d}  "
+                  f"conflicts {stats['conflicts']:3d}  reapplied {stats['reapplied']:3d}  "
+                  f"retries {stats['retries']:3d}")
+
+
+if __name__ == '__main__':
+    main()
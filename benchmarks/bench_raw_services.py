@@ -0,0 +1,68 @@
+"""Service LIST decode cost: kubernetes models vs raw JSON dicts.
+
+Usage:
+    python benchmarks/bench_raw_services.py [--services 10000] [--rounds 3]
+
+Lists a 10k-Service fixture from the fake API server through
+``list_service_for_all_namespaces`` with model deserialization (the
+K8S_RAW_SERVICES=false path) and with ``raw_json``, then builds the
+VM -> Service mapping and the cluster view summaries from each. Reports the
+best wall time and the peak heap measured with tracemalloc.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_apiserver import FakeApiServer, build_fleet, make_clients  # noqa: E402
+
+
+def run(label, list_func, rounds, k8s_utils, k8s_cache):
+    def once():
+        services = list_func()
+        items = services['items'] if isinstance(services, dict) else services.items
+        mapping = {}
+        for svc in items:
+            vm_key = k8s_cache.service_vm_key(svc)
+            if vm_key:
+                mapping[vm_key] = svc
+        return [k8s_utils.service_details_for(svc) for svc in mapping.values()]
+
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        summaries = once()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:22} best: {min(times):8.1f} ms   peak heap: {peak / 2**20:6.1f} MiB   "
+          f"summaries: {len(summaries)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--services', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    server = FakeApiServer(build_fleet(args.services)).start()
+    core_v1, _ = make_clients(server.url)
+
+    from app import k8s_cache, k8s_utils
+
+    print(f"Fleet: {args.services} Services")
+    run('models (before)', core_v1.list_service_for_all_namespaces, args.rounds, k8s_utils, k8s_cache)
+    run('raw JSON (after)', k8s_cache.raw_json(core_v1.list_service_for_all_namespaces),
+        args.rounds, k8s_utils, k8s_cache)
+
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Per-VM memory and render time of the cluster view records.
+
+Usage:
+    python benchmarks/bench_vm_summary.py [--vms 5000]
+
+Builds the cluster view records the pre-VMSummary way (nested dicts that keep
+the VMI conditions and cloud-init user data) and as slotted VMSummary
+objects, decoding each VM and VMI from JSON as a LIST page would so only what
+a record retains stays alive. Retained heap is measured with tracemalloc;
+the VMSummary list is then rendered through cluster_vms.html.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_apiserver import FakeApiServer, build_fleet, make_clients  # noqa: E402
+
+CONDITIONS = [
+    {'type': 'Ready', 'status': 'True', 'lastProbeTime': None, 'lastTransitionTime': '2025-01-01T00:00:00Z'},
+    {'type': 'LiveMigratable', 'status': 'False', 'reason': 'DisksNotLiveMigratable',
+     'message': 'cannot migrate VMI: PVC rootdisk is not shared, live migration requires that all PVCs '
+                'must be shared (using ReadWriteMany access mode)'},
+    {'type': 'AgentConnected', 'status': 'True', 'lastTransitionTime': '2025-01-01T00:01:00Z'},
+    {'type': 'StorageLiveMigratable', 'status': 'True', 'lastTransitionTime': '2025-01-01T00:00:00Z'},
+]
+
+
+def legacy_record(vm, vmi_mapping, service_mapping, k8s_utils):
+    """The nested dict process_vm_details returned before VMSummary."""
+    metadata = vm.get('metadata', {})
+    spec = vm.get('spec', {})
+    key = f"{metadata['namespace']}/{metadata['name']}"
+    vmi = vmi_mapping.get(key)
+    vmi_details = {}
+    if vmi:
+        status = vmi['status']
+        ips = []
+        for iface in status.get('interfaces', []):
+            ips.append(iface['ipAddress'])
+            ips.extend(iface['ipAddresses'])
+        conditions = status.get('conditions', [])
+        vmi_details = {
+            'node': status.get('nodeName'), 'ip_addresses': ips, 'phase': status.get('phase'),
+            'ready': any(c['type'] == 'Ready' and c['status'] == 'True' for c in conditions),
+            'conditions': conditions,
+        }
+    service = service_mapping.get(key)
+    service_details = {}
+    if service:
+        summary = k8s_utils.service_details_for(service)
+        service_details = {
+            'external_ips': list(summary.external_ips), 'cluster_ip': summary.cluster_ip,
+            'ports': [{'name': p.name, 'port': p.port, 'protocol': p.protocol, 'target_port': p.target_port}
+                      for p in summary.ports],
+            'type': summary.type, 'annotations': service.metadata.annotations or {},
+        }
+    user_data = None
+    for volume in spec.get('template', {}).get('spec', {}).get('volumes', []):
+        if 'cloudInitNoCloud' in volume:
+            user_data = volume['cloudInitNoCloud'].get('userData', '')
+    domain = spec['template']['spec']['domain']
+    return {
+        'name': metadata['name'], 'namespace': metadata['namespace'],
+        'running': vm['status']['printableStatus'].lower() == 'running',
+        'cpu_cores': domain['cpu']['cores'], 'memory': domain['resources']['requests']['memory'],
+        'labels': metadata.get('labels', {}),
+        'created': datetime.strptime(metadata['creationTimestamp'], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M"),
+        'vmi': vmi_details, 'service': service_details, 'user_data': user_data,
+    }
+
+
+def measure(label, build, count):
+    """Build records from freshly decoded objects and report what they retain."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = build()
+    elapsed = (time.perf_counter() - start) * 1000
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:24} retained: {retained / 2**20:6.1f} MiB ({retained / count:6.0f} B/VM)   "
+          f"peak: {peak / 2**20:6.1f} MiB   build: {elapsed:7.1f} ms")
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=5000)
+    args = parser.parse_args()
+
+    resources = build_fleet(args.vms)
+    for vmi in resources['virtualmachineinstances']:
+        vmi['status']['conditions'] = CONDITIONS
+    server = FakeApiServer(resources).start()
+    core_v1, _ = make_clients(server.url)
+
+    os.environ.setdefault('GIT_REPO_URL', 'https://example.invalid/vms.git')
+    os.environ.setdefault('GIT_USERNAME', 'bench')
+    os.environ.setdefault('GIT_TOKEN', 'bench')
+    from flask import render_template
+    from app import create_app, k8s_utils
+
+    # Services stay as API models for both variants, as in list_running_vms
+    service_mapping = {
+        f"{svc.metadata.namespace}/{svc.spec.selector['kubevirt.io/vm']}": svc
+        for svc in core_v1.list_service_for_all_namespaces().items
+    }
+    server.stop()
+    vm_payloads = [json.dumps(vm) for vm in resources['virtualmachines']]
+    vmi_payloads = [json.dumps(vmi) for vmi in resources['virtualmachineinstances']]
+    del resources
+
+    def decoded_vmi_mapping():
+        mapping = {}
+        for payload in vmi_payloads:
+            vmi = json.loads(payload)
+            mapping[f"{vmi['metadata']['namespace']}/{vmi['metadata']['name']}"] = {'status': vmi['status']}
+        return mapping
+
+    def build_legacy():
+        vmi_mapping = decoded_vmi_mapping()
+        return [legacy_record(json.loads(p), vmi_mapping, service_mapping, k8s_utils) for p in vm_payloads]
+
+    def build_summaries():
+        vmi_mapping = decoded_vmi_mapping()
+        return [k8s_utils.process_vm_details(json.loads(p), vmi_mapping, service_mapping) for p in vm_payloads]
+
+    print(f"Fleet: {args.vms} VMs")
+    legacy = measure('nested dicts (before)', build_legacy, args.vms)
+    del legacy
+    summaries = measure('VMSummary (after)', build_summaries, args.vms)
+
+    app = create_app()
+    with app.test_request_context('/cluster-vms'):
+        render_template('cluster_vms.html', vms=summaries[:10], version='bench')
+        tracemalloc.start()
+        start = time.perf_counter()
+        html = render_template('cluster_vms.html', vms=summaries, version='bench')
+        elapsed = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"  render cluster_vms.html: {elapsed:7.1f} ms   peak: {peak / 2**20:6.1f} MiB   "
+          f"html: {len(html) / 2**20:5.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+"""Minimal in-process fake Kubernetes API server for benchmarks.
+
+Serves VirtualMachines, VirtualMachineInstances and Services from in-memory
+fixtures. Supports the subset of the API the portal uses: cluster-wide and
+namespaced LIST (with limit/continue, labelSelector and fieldSelector on
+metadata.name), single-object GET, JSON merge-patch PATCH, and watches that
+stream the events passed to ``emit`` (or produced by PATCH) until
+timeoutSeconds expires.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+KUBEVIRT_PREFIX = '/apis/kubevirt.io/v1'
+CORE_PREFIX = '/api/v1'
+
+
+def make_vm(namespace, name, running=True):
+    return {
+        'apiVersion': 'kubevirt.io/v1',
+        'kind': 'VirtualMachine',
+        'metadata': {
+            'name': name,
+            'namespace': namespace,
+            'resourceVersion': '1',
+            'creationTimestamp': '2025-01-01T00:00:00Z',
+            'labels': {'app': name, 'tier': 'bench'},
+        },
+        'spec': {
+            'running': running,
+            'template': {
+                'metadata': {'labels': {'kubevirt.io/vm': name}},
+                'spec': {
+                    'domain': {
+                        'cpu': {'cores': 2},
+                        'resources': {'requests': {'memory': '4Gi'}},
+                    },
+                    'volumes': [
+                        {'name': 'cloudinit', 'cloudInitNoCloud': {'userData': '#cloud-config\n' + 'x' * 2048}},
+                    ],
+                },
+            },
+        },
+        'status': {'printableStatus': 'Running' if running else 'Stopped'},
+    }
+
+
+def make_vmi(namespace, name, node='node-1'):
+    return {
+        'apiVersion': 'kubevirt.io/v1',
+        'kind': 'VirtualMachineInstance',
+        'metadata': {'name': name, 'namespace': namespace, 'resourceVersion': '1'},
+        'status': {
+            'phase': 'Running',
+            'nodeName': node,
+            'interfaces': [{'ipAddress': '10.0.0.1', 'ipAddresses': ['10.0.0.1']}],
+            'conditions': [{'type': 'Ready', 'status': 'True'}],
+        },
+    }
+
+
+def make_service(namespace, name, vm_name=None, labels=None):
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Service',
+        'metadata': {
+            'name': name,
+            'namespace': namespace,
+            'resourceVersion': '1',
+            'labels': labels or {},
+            'annotations': {},
+        },
+        'spec': {
+            'selector': {'kubevirt.io/vm': vm_name} if vm_name else {'app': name},
+            'type': 'LoadBalancer',
+            'clusterIP': '10.96.0.10',
+            'ports': [{'name': 'ssh', 'port': 22, 'protocol': 'TCP', 'targetPort': 22}],
+        },
+        'status': {'loadBalancer': {'ingress': [{'ip': '192.168.1.10'}]}},
+    }
+
+
+def build_fleet(vm_count, extra_services=0, namespaces=('virtualmachines',), service_labels=None):
+    """Return fixtures for ``vm_count`` VMs spread over ``namespaces``."""
+    resources = {'virtualmachines': [], 'virtualmachineinstances': [], 'services': []}
+    for i in range(vm_count):
+        namespace = namespaces[i % len(namespaces)]
+        name = f"vm-{i:05d}"
+        resources['virtualmachines'].append(make_vm(namespace, name))
+        resources['virtualmachineinstances'].append(make_vmi(namespace, name, node=f"node-{i % 16}"))
+        resources['services'].append(make_service(namespace, name, name, service_labels))
+    for i in range(extra_services):
+        resources['services'].append(make_service(f"tenant-{i % 50}", f"other-{i:05d}"))
+    return resources
+
+
+def _match_labels(obj, selector):
+    if not selector:
+        return True
+    labels = obj['metadata'].get('labels') or {}
+    for term in selector.split(','):
+        if term.startswith('!'):
+            if term[1:] in labels:
+                return False
+        elif '!=' in term:
+            key, value = term.split('!=', 1)
+            if labels.get(key) == value:
+                return False
+        elif '=' in term:
+            key, value = term.split('=', 1)
+            if labels.get(key.rstrip('=')) != value:
+                return False
+        elif labels.get(term) is None:
+            return False
+    return True
+
+
+def _match_fields(obj, selector):
+    if not selector:
+        return True
+    for term in selector.split(','):
+        key, value = term.split('=', 1)
+        if key == 'metadata.name' and obj['metadata']['name'] != value:
+            return False
+        if key == 'metadata.namespace' and obj['metadata']['namespace'] != value:
+            return False
+    return True
+
+
+def _merge_patch(target, patch):
+    """Apply an RFC 7386 JSON merge patch to target in place."""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge_patch(target[key], value)
+        else:
+            target[key] = value
+
+
+class FakeApiServer:
+    """Threaded HTTP server exposing fixtures as a Kubernetes API."""
+
+    def __init__(self, resources, latency=0.0):
+        """
+        Args:
+            resources: Dict of plural -> list of objects
+            latency: Artificial per-request delay in seconds
+        """
+        self.resources = resources
+        self.latency = latency
+        self.requests = 0
+        self.objects_sent = 0
+        self.resource_version = 1
+        self._lock = threading.Lock()
+        self._events = []
+        self._events_changed = threading.Condition(self._lock)
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = 0
+            self.objects_sent = 0
+
+    def emit(self, plural, event_type, obj):
+        """Apply an ADDED/MODIFIED/DELETED change to the fixtures and send it to open watches."""
+        with self._lock:
+            self.resource_version += 1
+            obj['metadata']['resourceVersion'] = str(self.resource_version)
+            items = self.resources.setdefault(plural, [])
+            key = (obj['metadata']['namespace'], obj['metadata']['name'])
+            items[:] = [o for o in items if (o['metadata']['namespace'], o['metadata']['name']) != key]
+            if event_type != 'DELETED':
+                items.append(obj)
+            self._events.append((plural, {'type': event_type, 'object': obj}))
+            self._events_changed.notify_all()
+
+    def _record(self, objects):
+        with self._lock:
+            self.requests += 1
+            self.objects_sent += objects
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _resolve(self):
+                """Split the request path into (query, namespace, segments, items)."""
+                if server.latency:
+                    time.sleep(server.latency)
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                parts = parsed.path
+                if parts.startswith(KUBEVIRT_PREFIX):
+                    parts = parts[len(KUBEVIRT_PREFIX):]
+                elif parts.startswith(CORE_PREFIX):
+                    parts = parts[len(CORE_PREFIX):]
+                segments = [s for s in parts.split('/') if s]
+                namespace = None
+                if len(segments) >= 3 and segments[0] == 'namespaces':
+                    namespace = segments[1]
+                    segments = segments[2:]
+                plural = segments[0] if segments else ''
+                return query, namespace, segments, server.resources.get(plural)
+
+            def _watch(self, plural, namespace, query):
+                """Stream events emitted after the watch opened until the timeout."""
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                deadline = time.monotonic() + min(float(query.get('timeoutSeconds', 5)), 5)
+                with server._lock:
+                    position = len(server._events)
+                while True:
+                    with server._lock:
+                        remaining = deadline - time.monotonic()
+                        if position == len(server._events) and remaining > 0:
+                            server._events_changed.wait(remaining)
+                        pending = server._events[position:]
+                        position = len(server._events)
+                    for event_plural, event in pending:
+                        obj = event['object']
+                        if (event_plural == plural
+                                and (namespace is None or obj['metadata']['namespace'] == namespace)
+                                and _match_labels(obj, query.get('labelSelector'))
+                                and _match_fields(obj, query.get('fieldSelector'))):
+                            data = json.dumps(event).encode() + b'\n'
+                            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+                            self.wfile.flush()
+                    if time.monotonic() >= deadline:
+                        break
+                self.wfile.write(b'0\r\n\r\n')
+
+            def do_PATCH(self):
+                query, namespace, segments, items = self._resolve()
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                if items is not None and len(segments) == 2:
+                    for obj in items:
+                        if obj['metadata']['name'] == segments[1] and obj['metadata']['namespace'] == namespace:
+                            _merge_patch(obj, body)
+                            server.emit(segments[0], 'MODIFIED', obj)
+                            server._record(1)
+                            return self._send_json(200, obj)
+                return self._send_json(404, {'kind': 'Status', 'code': 404, 'reason': 'NotFound'})
+
+            def do_GET(self):
+                query, namespace, segments, items = self._resolve()
+                plural = segments[0] if segments else ''
+                if items is None:
+                    return self._send_json(404, {'kind': 'Status', 'code': 404, 'reason': 'NotFound'})
+
+                if len(segments) == 2:
+                    name = segments[1]
+                    for obj in items:
+                        if obj['metadata']['name'] == name and obj['metadata']['namespace'] == namespace:
+                            server._record(1)
+                            return self._send_json(200, obj)
+                    return self._send_json(404, {'kind': 'Status', 'code': 404, 'reason': 'NotFound',
+                                                 'message': f"{plural} {name} not found"})
+
+                if query.get('watch') in ('true', '1', 'True'):
+                    return self._watch(plural, namespace, query)
+
+                selected = [
+                    obj for obj in items
+                    if (namespace is None or obj['metadata']['namespace'] == namespace)
+                    and _match_labels(obj, query.get('labelSelector'))
+                    and _match_fields(obj, query.get('fieldSelector'))
+                ]
+                start = int(query.get('continue') or 0)
+                limit = int(query.get('limit') or 0)
+                end = start + limit if limit else len(selected)
+                page = selected[start:end]
+                metadata = {'resourceVersion': str(server.resource_version)}
+                if end < len(selected):
+                    metadata['continue'] = str(end)
+                server._record(len(page))
+                self._send_json(200, {'kind': 'List', 'apiVersion': 'v1', 'metadata': metadata, 'items': page})
+
+        return Handler
+
+
+def make_clients(url):
+    """Return (CoreV1Api, CustomObjectsApi) bound to the fake server."""
+    from kubernetes import client
+
+    configuration = client.Configuration()
+    configuration.host = url
+    api_client = client.ApiClient(configuration)
+    return client.CoreV1Api(api_client), client.CustomObjectsApi(api_client)
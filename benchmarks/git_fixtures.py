@@ -0,0 +1,105 @@
+"""Local Git repositories of rendered VM manifests for the Git benchmarks.
+
+The manifests are rendered once through the portal's own templates
+(app.utils.generate_yaml) and copied per VM, then committed to a local bare
+repository that GIT_REPO_URL can point at (local paths are used as-is).
+"""
+
+import os
+import subprocess
+
+TEMPLATE_VM_NAME = 'bench-vm-00000'
+SUBDIRECTORY = 'virtualmachines/'
+
+
+def bench_env(origin, clone_dir, **overrides):
+    """Set the environment for an app that clones origin into clone_dir."""
+    os.environ.update({
+        'GIT_REPO_URL': origin,
+        'GIT_USERNAME': 'bench',
+        'GIT_TOKEN': 'bench',
+        'GIT_CLONE_DIR': clone_dir,
+        'GIT_SYNC_INTERVAL': '0',
+        'YAML_SUBDIRECTORY': SUBDIRECTORY,
+    })
+    os.environ.update({key: str(value) for key, value in overrides.items()})
+
+
+def vm_name(index):
+    return f"bench-vm-{index:05d}"
+
+
+def vm_form(name, cpu_cores=2, memory=4):
+    """Form data as the create and edit forms submit it."""
+    return {
+        'vm_name': name,
+        'cpu_cores': cpu_cores,
+        'memory': memory,
+        'storage_size': 20,
+        'image_url': 'https://example.invalid/images/debian-12.qcow2',
+        'tags': [{'key': 'team', 'value': 'bench'}],
+        'service_ports': [{'port_name': 'ssh', 'port': 22, 'protocol': 'TCP', 'targetPort': 22}],
+        'hostname': f"{name}.example.com",
+        'user_data': '#cloud-config\npackage_update: true\n',
+    }
+
+
+def render_manifest(name, cpu_cores=2, memory=4):
+    """Render the VM + Service manifest the create form would commit."""
+    from config import Config
+    from app.utils import generate_yaml
+    return generate_yaml(vm_form(name, cpu_cores, memory), Config)
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=bench', '-c', 'user.email=bench@example.invalid', *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+def make_origin(origin, count):
+    """
+    Create a bare repository at origin holding count manifests in
+    SUBDIRECTORY on branch main. Call bench_env first: config.Config reads
+    the environment once, when the templates are first rendered.
+    """
+    root = os.path.dirname(origin)
+    template = render_manifest(TEMPLATE_VM_NAME)
+    seed = os.path.join(root, 'seed')
+    git(root, 'init', '-q', '--bare', '-b', 'main', origin)
+    git(root, 'init', '-q', '-b', 'main', seed)
+    directory = os.path.join(seed, SUBDIRECTORY)
+    os.makedirs(directory)
+    for index in range(count):
+        name = vm_name(index)
+        with open(os.path.join(directory, f"{name}.yaml"), 'w') as f:
+            f.write(template.replace(TEMPLATE_VM_NAME, name))
+    git(seed, 'add', '.')
+    git(seed, 'commit', '-q', '-m', f"Add {count} VMs")
+    git(seed, 'push', '-q', origin, 'main')
+
+
+def push_change(origin, path, content, message):
+    """Commit one file change (content None deletes it) to origin from a scratch clone."""
+    push_changes(origin, {path: content}, message)
+
+
+def push_changes(origin, changes, message):
+    """Commit {path: content or None to delete} to origin from a scratch clone."""
+    root = os.path.dirname(origin)
+    work = os.path.join(root, 'pusher')
+    if not os.path.isdir(work):
+        git(root, 'clone', '-q', origin, work)
+    else:
+        git(work, 'pull', '-q', '--ff-only')
+    for path, content in changes.items():
+        full_path = os.path.join(work, path)
+        if content is None:
+            os.remove(full_path)
+        else:
+            with open(full_path, 'w') as f:
+                f.write(content)
+    git(work, 'add', '-A')
+    git(work, 'commit', '-q', '-m', message)
+    git(work, 'push', '-q', 'origin', 'HEAD:main')
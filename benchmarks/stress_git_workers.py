@@ -0,0 +1,141 @@
+"""Stress the shared Git clone from several worker processes at once.
+
+Usage:
+    python benchmarks/stress_git_workers.py [--workers 4] [--ops 25]
+
+Starts --workers processes on one GIT_CLONE_DIR, like gunicorn workers,
+against a local bare repository. Each creates --ops VMs, edits each one,
+deletes every fifth and lists the inventory after every write (checking it
+sees its own writes), while a reader thread per process lists continuously.
+Afterwards the origin must hold exactly the surviving VMs with their edits
+and both repositories must pass ``git fsck``. Exits non-zero on any error.
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import git_fixtures  # noqa: E402
+
+EDITED_CPU_CORES = 4
+
+
+def worker(index, ops, results):
+    import logging
+    logging.disable(logging.CRITICAL)
+    from config import Config
+    from app import utils
+
+    names, errors, list_ms = [], [], []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                utils.get_vm_list(Config)
+            except Exception as e:
+                errors.append(f"reader: {e}")
+            list_ms.append((time.perf_counter() - start) * 1000)
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+    start = time.perf_counter()
+    for i in range(ops):
+        name = f"w{index}-vm{i:03d}"
+        try:
+            utils.commit_to_git(git_fixtures.render_manifest(name), name, Config.YAML_SUBDIRECTORY, {})
+            utils.update_vm_config(Config, name, git_fixtures.vm_form(name, cpu_cores=EDITED_CPU_CORES))
+            names.append(name)
+            if i % 5 == 4:
+                utils.delete_vm_config(Config, name)
+                names.remove(name)
+            listed = {vm['name'] for vm in utils.get_vm_list(Config)}
+            missing = [n for n in names if n not in listed]
+            if missing or (i % 5 == 4 and name in listed):
+                errors.append(f"{name}: listing does not reflect own writes (missing {missing})")
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+    elapsed = time.perf_counter() - start
+    stop.set()
+    reader_thread.join()
+    results.put({'worker': index, 'names': names, 'errors': errors,
+                 'list_ms': list_ms, 'elapsed': elapsed})
+
+
+def fsck(path):
+    result = subprocess.run(['git', 'fsck', '--strict', '--no-dangling'], cwd=path,
+                            capture_output=True, text=True)
+    return result.returncode == 0, result.stdout + result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--ops', type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        origin = os.path.join(root, 'origin.git')
+        clone_dir = os.path.join(root, 'clones')
+        git_fixtures.bench_env(origin, clone_dir, GIT_SYNC_INTERVAL=1)
+        git_fixtures.make_origin(origin, 10)
+
+        # Fresh interpreters, as gunicorn workers are separate processes
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        processes = [context.Process(target=worker, args=(index, args.ops, results))
+                     for index in range(args.workers)]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        errors = [error for report in reports for error in report['errors']]
+        expected = {git_fixtures.vm_name(i) for i in range(10)}
+        expected.update(name for report in reports for name in report['names'])
+
+        check = os.path.join(root, 'check')
+        git_fixtures.git(root, 'clone', '-q', origin, check)
+        directory = os.path.join(check, git_fixtures.SUBDIRECTORY)
+        found = {name[:-len('.yaml')] for name in os.listdir(directory) if name.endswith('.yaml')}
+        if found != expected:
+            errors.append(f"origin: missing {sorted(expected - found)[:5]}, unexpected {sorted(found - expected)[:5]}")
+        for name in found - {git_fixtures.vm_name(i) for i in range(10)}:
+            with open(os.path.join(directory, f"{name}.yaml")) as f:
+                if f"cores: {EDITED_CPU_CORES}" not in f.read():
+                    errors.append(f"origin: {name} lost its edit")
+        for path in (origin, os.path.join(clone_dir, 'repo')):
+            ok, output = fsck(path)
+            if not ok:
+                errors.append(f"git fsck {path}: {output.strip()[:200]}")
+
+        writes = args.workers * args.ops * 2 + args.workers * (args.ops // 5)
+        elapsed = max(report['elapsed'] for report in reports)
+        list_ms = [ms for report in reports for ms in report['list_ms']]
+        commits = int(subprocess.run(['git', 'rev-list', '--count', 'main'], cwd=origin,
+                                     capture_output=True, text=True, check=True).stdout)
+        print(f"{args.workers} worker processes, {writes} writes in {elapsed:.1f} s "
+              f"({writes / elapsed:.1f} writes/s, {commits - 1} commits pushed)")
+        print(f"  concurrent listings: {len(list_ms)}, median {statistics.median(list_ms):.1f} ms, "
+              f"p99 {sorted(list_ms)[int(len(list_ms) * 0.99)]:.1f} ms, max {max(list_ms):.1f} ms")
+        print(f"  origin holds {len(found)} VMs (expected {len(expected)})")
+        if errors:
+            print(f"  {len(errors)} errors:")
+            for error in errors[:20]:
+                print(f"    {error}")
+            sys.exit(1)
+        print("  no errors; origin and shared clone pass git fsck")
+
+
+if __name__ == '__main__':
+    main()
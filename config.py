@@ -1,4 +1,5 @@
 import os
+import re
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,6 +18,27 @@ class Config:
     
     # Git clone directory - use /tmp for local dev, /app for Docker
     GIT_CLONE_DIR = os.getenv('GIT_CLONE_DIR', '/tmp/kubevirt-portal/clones')
+
+    # Shape of a new clone: GIT_CLONE_DEPTH commits of history (0 = all),
+    # a partial-clone filter such as 'blob:none' (empty = none), and with
+    # GIT_SPARSE_CHECKOUT only YAML_SUBDIRECTORY in the working tree
+    GIT_CLONE_DEPTH = int(os.getenv('GIT_CLONE_DEPTH', '0'))
+    GIT_CLONE_FILTER = os.getenv('GIT_CLONE_FILTER', '')
+    GIT_SPARSE_CHECKOUT = os.getenv('GIT_SPARSE_CHECKOUT', 'false').lower() == 'true'
+
+    # Seconds between background fetches of the Git repository; reads are
+    # served from the local clone. 0 disables the background syncer.
+    GIT_SYNC_INTERVAL = int(os.getenv('GIT_SYNC_INTERVAL', '30'))
+
+    # Pushes rejected because the remote moved on are rebased and retried
+    # up to GIT_PUSH_RETRIES times, backing off exponentially from
+    # GIT_PUSH_BACKOFF seconds (jittered, capped at GIT_PUSH_BACKOFF_MAX)
+    GIT_PUSH_RETRIES = int(os.getenv('GIT_PUSH_RETRIES', '5'))
+    GIT_PUSH_BACKOFF = float(os.getenv('GIT_PUSH_BACKOFF', '0.2'))
+    GIT_PUSH_BACKOFF_MAX = float(os.getenv('GIT_PUSH_BACKOFF_MAX', '5'))
+
+    # Parsed VM manifests cached by git blob SHA (list and edit views)
+    VM_MANIFEST_CACHE_SIZE = int(os.getenv('VM_MANIFEST_CACHE_SIZE', '10000'))
     
     # Feature flags
     EXTERNAL_DNS_ENABLED = os.getenv('EXTERNAL_DNS_ENABLED', 'false').lower() == 'true'
@@ -30,6 +52,90 @@ class Config:
     # MetalLB configuration
     METALLB_DEFAULT_POOL = os.getenv('METALLB_DEFAULT_POOL', 'default')
 
+    # Gunicorn worker model, exported by gunicorn.conf.py at startup. A sync
+    # worker serves one request at a time, so requests held open (the status
+    # stream, the power-transition long-poll) would block it; they are only
+    # on by default with threaded or async workers
+    GUNICORN_WORKER_CLASS = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+    GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '1'))
+    CONCURRENT_WORKERS = GUNICORN_THREADS > 1 or bool(
+        re.search(r'thread|gevent|eventlet|tornado', GUNICORN_WORKER_CLASS.lower())
+    )
+
+    # Group commit: writes arriving within this many seconds of each other
+    # (or while a push is in flight) share one commit and push, up to
+    # GIT_WRITE_BATCH_MAX changes. The write queue belongs to one process, so
+    # batching needs several requests in flight per worker (threaded or
+    # async workers); with sync workers each worker has at most one pending
+    # write and the window would only add latency, so it defaults to 0
+    GIT_WRITE_BATCH_WINDOW = float(os.getenv('GIT_WRITE_BATCH_WINDOW', '0.05' if CONCURRENT_WORKERS else '0'))
+    GIT_WRITE_BATCH_MAX = int(os.getenv('GIT_WRITE_BATCH_MAX', '100'))
+
+    # Seconds a request waits for its queued write (sync, commit and push,
+    # including push retries) before giving up with an error
+    GIT_WRITE_TIMEOUT = float(os.getenv('GIT_WRITE_TIMEOUT', '120'))
+
+    # Seconds between checks for rotated Kubernetes credentials
+    K8S_CREDENTIAL_CHECK_INTERVAL = float(os.getenv('K8S_CREDENTIAL_CHECK_INTERVAL', '30'))
+
+    # Objects per LIST page (limit/continue); 0 disables chunking
+    K8S_LIST_PAGE_SIZE = int(os.getenv('K8S_LIST_PAGE_SIZE', '500'))
+
+    # Concurrent LIST fan-out: worker threads and per-call timeout (seconds)
+    K8S_LIST_WORKERS = int(os.getenv('K8S_LIST_WORKERS', '4'))
+    K8S_LIST_TIMEOUT = float(os.getenv('K8S_LIST_TIMEOUT', '10'))
+
+    # Concurrent PATCH calls for bulk power operations
+    K8S_POWER_WORKERS = int(os.getenv('K8S_POWER_WORKERS', '8'))
+
+    # /api/vmi/<name>/wait long-poll: on/off (default: with concurrent
+    # workers only) and the longest one request may block (keep below the
+    # gunicorn worker timeout)
+    VMI_WAIT_ENABLED = os.getenv('VMI_WAIT_ENABLED', str(CONCURRENT_WORKERS)).lower() == 'true'
+    VMI_WAIT_MAX_SECONDS = int(os.getenv('VMI_WAIT_MAX_SECONDS', '60'))
+
+    # Memoized YAML/JSON response bodies (entries, keyed by resourceVersion)
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '1024'))
+
+    # Cluster VM view: default and maximum rows per page
+    CLUSTER_VMS_PAGE_SIZE = int(os.getenv('CLUSTER_VMS_PAGE_SIZE', '50'))
+    CLUSTER_VMS_MAX_PAGE_SIZE = int(os.getenv('CLUSTER_VMS_MAX_PAGE_SIZE', '500'))
+
+    # Server-Sent Events status stream: on/off (default: with concurrent
+    # workers only), per-client buffer bound (VMs with undelivered changes)
+    # and maximum connection lifetime in seconds
+    STATUS_STREAM_ENABLED = os.getenv('STATUS_STREAM_ENABLED', str(CONCURRENT_WORKERS)).lower() == 'true'
+    STATUS_STREAM_BUFFER = int(os.getenv('STATUS_STREAM_BUFFER', '1000'))
+    STATUS_STREAM_MAX_SECONDS = int(os.getenv('STATUS_STREAM_MAX_SECONDS', '100'))
+
+    # Namespaces holding portal VMs (comma separated); empty means all.
+    # Listing, the informer cache and bulk power stay inside these namespaces.
+    VM_NAMESPACES = [ns.strip() for ns in os.getenv('VM_NAMESPACES', '').split(',') if ns.strip()]
+    # Namespace used when a request does not name one
+    DEFAULT_VM_NAMESPACE = os.getenv('DEFAULT_VM_NAMESPACE', VM_NAMESPACES[0] if VM_NAMESPACES else 'virtualmachines')
+
+    # Kubernetes API client pool: one connection per request thread plus one
+    # per long-lived informer watch (VMs, VMIs and Services, per namespace
+    # shard) and one spare
+    K8S_CONNECTION_POOL_SIZE = int(os.getenv(
+        'K8S_CONNECTION_POOL_SIZE', str(GUNICORN_THREADS + 3 * max(1, len(VM_NAMESPACES)) + 1)
+    ))
+
+    # Server-side selector for portal-generated Services; empty disables it.
+    # The legacy fallback full-scans for Services created before the label;
+    # enable it only until those Services carry the label
+    SERVICE_LABEL_SELECTOR = os.getenv('SERVICE_LABEL_SELECTOR', 'app.kubernetes.io/managed-by=kubevirt-portal')
+    SERVICE_LEGACY_FALLBACK = os.getenv('SERVICE_LEGACY_FALLBACK', 'false').lower() == 'true'
+
+    # Decode Service LIST/GET responses straight into plain dicts instead of
+    # kubernetes model objects
+    K8S_RAW_SERVICES = os.getenv('K8S_RAW_SERVICES', 'true').lower() == 'true'
+
+    # Kubernetes informer cache (list once, then watch)
+    K8S_CACHE_ENABLED = os.getenv('K8S_CACHE_ENABLED', 'true').lower() == 'true'
+    K8S_CACHE_SYNC_TIMEOUT = float(os.getenv('K8S_CACHE_SYNC_TIMEOUT', '10'))
+    K8S_WATCH_TIMEOUT = int(os.getenv('K8S_WATCH_TIMEOUT', '300'))
+
     def __init__(self):
         # Validate immediately during initialization
         self.validate_config()
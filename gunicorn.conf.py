@@ -1,4 +1,5 @@
 import multiprocessing
+import os
 
 # Server socket
 bind = "0.0.0.0:5000"
@@ -6,7 +7,11 @@ backlog = 2048
 
 # Worker processes
 workers = 4  # Fixed number of workers
-worker_class = 'sync'
+# 'gthread' (or GUNICORN_THREADS > 1) lets a worker hold a live status
+# stream open while still serving other requests
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+# Kubernetes client pool size (K8S_CONNECTION_POOL_SIZE) defaults from this
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
 worker_connections = 1000
 timeout = 120
 keepalive = 2
@@ -35,6 +40,11 @@ certfile = None
 def on_starting(server):
     """Log when server starts"""
     server.log.info("Starting KubeVirt Portal")
+    # Export the effective worker model (command-line flags included) so
+    # config.Config in the forked workers can tell whether long-lived
+    # requests would block a sync worker
+    os.environ['GUNICORN_WORKER_CLASS'] = server.cfg.worker_class_str
+    os.environ['GUNICORN_THREADS'] = str(server.cfg.threads)
 
 def worker_abort(worker):
     """Log when a worker aborts"""
@@ -0,0 +1,57 @@
+"""Editing a VM through the form must not rewrite quantities it did not change."""
+
+import yaml
+
+from config import Config
+from app.template_manager import YAML_LOADER
+from app.utils import _parse_vm_config_for_edit, generate_yaml, keep_unchanged_quantities
+
+FORM_FIELDS = (
+    'vm_name', 'tags', 'cpu_cores', 'memory', 'storage_size', 'storage_class',
+    'storage_access_mode', 'image_url', 'user_data', 'hostname', 'address_pool',
+    'service_ports', 'service_type',
+)
+
+
+def manifest(memory, storage):
+    """A stored manifest whose memory and storage were written outside the portal."""
+    return generate_yaml({
+        'vm_name': 'web-01',
+        'tags': [{'key': 'team', 'value': 'blue'}],
+        'cpu_cores': 2,
+        'memory': 1,
+        'storage_size': 1,
+        'memory_quantity': memory,
+        'storage_quantity': storage,
+        'image_url': 'https://example.com/image.qcow2',
+        'service_ports': [{'port_name': 'ssh', 'port': 22, 'protocol': 'TCP', 'targetPort': 22}],
+    }, Config)
+
+
+def quantities(content):
+    vm = next(yaml.load_all(content, Loader=YAML_LOADER))
+    domain = vm['spec']['template']['spec']['domain']
+    storage = vm['spec']['dataVolumeTemplates'][0]['spec']['storage']['resources']['requests']['storage']
+    return domain['resources']['requests']['memory'], domain['resources']['limits']['memory'], storage
+
+
+def edit(content, **changes):
+    """Round-trip content through the edit form as routes.edit_vm does."""
+    vm, service = list(yaml.load_all(content, Loader=YAML_LOADER))[:2]
+    stored = _parse_vm_config_for_edit(vm, service)
+    form_data = {field: stored[field] for field in FORM_FIELDS}
+    form_data.update(changes)
+    return generate_yaml(keep_unchanged_quantities(form_data, stored), Config)
+
+
+def test_tags_only_edit_keeps_quantities():
+    for memory, storage in (('8Gi', '100G'), ('512Mi', '20Gi'), ('4G', '10Gi')):
+        original = manifest(memory, storage)
+        edited = edit(original, tags=[{'key': 'team', 'value': 'green'}])
+        assert quantities(edited) == (memory, memory, storage)
+        assert 'green' in edited
+
+
+def test_changed_size_is_written_in_form_units():
+    edited = edit(manifest('8Gi', '100G'), memory=16, storage_size=200)
+    assert quantities(edited) == ('16G', '16G', '200Gi')